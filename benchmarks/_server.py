@@ -0,0 +1,73 @@
+"""
+Local stand-in for the Zillow web service, used by the benchmark scripts.
+
+The server answers every GET request with one of the XML payloads from
+``test/xml_payloads``, chosen by the endpoint name in the request path, and
+speaks HTTP/1.1 so clients can keep connections alive.
+"""
+
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PAYLOAD_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.pardir, "test", "xml_payloads"
+)
+
+PAYLOADS = {
+    "GetDeepSearchResults.htm": "get_deep_search_200_ok.xml",
+    "GetUpdatedPropertyDetails.htm": "updated_property_details_200_ok.xml",
+}
+
+
+def load_payload(file_name):
+    with open(os.path.join(PAYLOAD_DIR, file_name), "rb") as payload:
+        return payload.read()
+
+
+class ZillowStandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately; avoid Nagle/delayed-ACK stalls
+    # on kept-alive connections
+    disable_nagle_algorithm = True
+    bodies = {endpoint: load_payload(name) for endpoint, name in PAYLOADS.items()}
+
+    def do_GET(self):
+        endpoint = self.path.split("?", 1)[0].rsplit("/", 1)[-1]
+        body = self.bodies.get(endpoint)
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/xml;charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServer(object):
+    """Runs the stand-in server on a free local port in a background thread.
+
+    >>> with StandInServer() as server:
+    ...     url = server.url("GetDeepSearchResults.htm")
+    """
+
+    def __init__(self):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), ZillowStandInHandler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def url(self, endpoint):
+        host, port = self.httpd.server_address[:2]
+        return "http://{}:{}/webservice/{}".format(host, port, endpoint)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.httpd.shutdown()
+        self.httpd.server_close()
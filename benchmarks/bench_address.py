@@ -0,0 +1,86 @@
+"""
+Throughput of address normalization and the share of duplicate lookups it finds.
+
+Generates synthetic addresses from a small set of streets, each spelled in
+several ways (case, whitespace, full or abbreviated suffixes and directions,
+unit designators, ZIP+4 codes), and normalizes them with
+``normalize_address``/``normalize_zipcode`` and, for comparison, with the
+whitespace collapsing that ``make_cache_key`` did before. The number of
+distinct keys shows how many requests a cache or single flight could save.
+
+Usage::
+
+    python benchmarks/bench_address.py [ADDRESSES]
+"""
+
+import random
+import sys
+import time
+
+from pyzillow.pyzillowaddress import normalize_address, normalize_zipcode
+
+STREETS = ["Bigelow", "Main", "Oak", "2nd", "Martin Luther King Jr", "Lake Washington"]
+SUFFIXES = [("Avenue", "Ave", "AVE."), ("Street", "St", "st"), ("Boulevard", "Blvd")]
+DIRECTIONS = [("North", "N", "N."), ("Southwest", "SW"), ("", "")]
+UNITS = [
+    ("Apartment {}", "Apt {}", "Apt. #{}", "APT#{}"),
+    ("Suite {}", "STE {}"),
+    ("",),
+]
+
+
+def make_addresses(count, seed=1):
+    rng = random.Random(seed)
+    addresses = []
+    for _ in range(count):
+        number = rng.randrange(1, 200)
+        street = rng.choice(STREETS)
+        suffix = rng.choice(rng.choice(SUFFIXES))
+        direction = rng.choice(rng.choice(DIRECTIONS))
+        unit = rng.choice(rng.choice(UNITS)).format(rng.randrange(1, 5))
+        address = " ".join(
+            part for part in (str(number), street, suffix, direction, unit) if part
+        )
+        if rng.random() < 0.5:
+            address = address.upper()
+        if rng.random() < 0.2:
+            address = "  " + address.replace(" ", "  ") + " "
+        zipcode = (
+            "98109"
+            if rng.random() < 0.7
+            else "98109-{:04d}".format(rng.randrange(10000))
+        )
+        addresses.append((address, zipcode))
+    return addresses
+
+
+def collapse(address, zipcode):
+    return " ".join(address.split()), " ".join(zipcode.split())
+
+
+def normalize(address, zipcode):
+    return normalize_address(address), normalize_zipcode(zipcode)
+
+
+def main():
+    n_addresses = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+    addresses = make_addresses(n_addresses)
+    print("{} synthetic addresses".format(n_addresses))
+    for name, func in (("collapse", collapse), ("normalize", normalize)):
+        start = time.perf_counter()
+        keys = [func(address, zipcode) for address, zipcode in addresses]
+        elapsed = time.perf_counter() - start
+        print(
+            "{:>10}: {:6.2f} us/address, {:9.0f} addresses/s, "
+            "{:7d} distinct keys".format(
+                name,
+                elapsed / n_addresses * 1e6,
+                n_addresses / elapsed,
+                len(set(keys)),
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Parsing API responses from ``Response.text`` vs. ``Response.content``.
+
+``Response.text`` decodes the body to a string before the XML parser encodes it
+again; without a charset in the ``Content-Type`` header, requests also runs
+charset detection on the body. ``Response.content`` hands the raw bytes to the
+parser. For every payload in ``test/xml_payloads``, this script reports the
+throughput in MB/s and the peak allocation of one parse.
+
+Usage::
+
+    python benchmarks/bench_body.py [REPEAT]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from xml.etree import ElementTree
+
+import requests
+
+from _server import PAYLOAD_DIR, load_payload
+
+
+def make_response(body, content_type):
+    response = requests.models.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = content_type
+    response._content = body
+    return response
+
+
+def measure(func, repeat):
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return time.perf_counter() - start, peak
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    for file_name in sorted(os.listdir(PAYLOAD_DIR)):
+        body = load_payload(file_name)
+        if not body:
+            continue
+        print("{} ({} bytes)".format(file_name, len(body)))
+        for content_type in ("text/xml;charset=utf-8", "text/xml"):
+            response = make_response(body, content_type)
+            variants = (
+                ("text", lambda: ElementTree.fromstring(response.text)),
+                ("content", lambda: ElementTree.fromstring(response.content)),
+            )
+            for name, func in variants:
+                seconds, peak = measure(func, repeat)
+                print(
+                    "  {:>7} [{:>22}]: {:7.1f} MB/s, peak {:6d} bytes".format(
+                        name, content_type, len(body) * repeat / seconds / 1e6, peak
+                    )
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Time and memory to build a DataFrame from many deep search results.
+
+"rows" builds typed result objects, collects their attributes row by row and
+creates the DataFrame from the list of rows, "columns" appends the results to a
+``ColumnCollector`` and exports it with ``to_pandas``. Both start from parsed
+XML responses, so parsing is not measured. Requires numpy and pandas.
+
+Usage::
+
+    python benchmarks/bench_columns.py [RESULTS]
+"""
+
+import sys
+import time
+import tracemalloc
+from xml.etree import ElementTree
+
+import pandas
+
+from _server import load_payload
+from pyzillow.pyzillow import GetDeepSearchResults
+from pyzillow.pyzillowcolumns import ColumnCollector
+
+
+def rows(responses):
+    attrs = list(GetDeepSearchResults.attribute_mapping)
+    table = []
+    for data in responses:
+        result = GetDeepSearchResults(data, typed=True)
+        table.append([getattr(result, attr) for attr in attrs])
+    return pandas.DataFrame(table, columns=attrs)
+
+
+def columns(responses):
+    collector = ColumnCollector(GetDeepSearchResults)
+    collector.extend(responses)
+    return collector.to_pandas()
+
+
+def main():
+    n_results = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    body = load_payload("get_deep_search_200_ok.xml")
+    responses = [
+        ElementTree.fromstring(body.replace(b"48749425", b"%08d" % (10000000 + i)))
+        for i in range(n_results)
+    ]
+    print("GetDeepSearchResults ({} results)".format(n_results))
+    for name, build in (("rows", rows), ("columns", columns)):
+        start = time.perf_counter()
+        build(responses)
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        df = build(responses)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(
+            "{:>8}: {:7.2f} us/result, peak {:6.0f} bytes/result, "
+            "DataFrame {:6.0f} bytes/result".format(
+                name,
+                elapsed / n_results * 1e6,
+                peak / n_results,
+                df.memory_usage(deep=True).sum() / n_results,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Parse time and peak memory of full vs. pruned (``stream_parse``) parsing.
+
+For each payload in ``test/xml_payloads`` with results, the body is parsed and a
+result object is built from it, either from the full tree
+(``ElementTree.fromstring``) or from the pruned tree that ``stream_parse`` keeps
+(``_parse_pruned``, fed in 8 KiB chunks as from the network). The "heavy" case
+adds 2000 image URLs to the GetUpdatedPropertyDetails payload, which the pruned
+parser discards.
+
+Usage::
+
+    python benchmarks/bench_parse.py [REPEAT]
+"""
+
+import io
+import sys
+import time
+import tracemalloc
+from xml.etree import ElementTree
+
+from _server import load_payload
+from pyzillow.pyzillow import (
+    GetDeepSearchResults,
+    GetUpdatedPropertyDetails,
+    _parse_pruned,
+)
+
+CHUNK_SIZE = 8192
+
+
+def heavy_payload():
+    body = load_payload("updated_property_details_200_ok.xml")
+    urls = b"".join(
+        b"<url>http://photos.zillowstatic.com/p_d/IS%d.jpg</url>" % i
+        for i in range(2000)
+    )
+    return body.replace(b"<images>", b"<images>" + urls, 1)
+
+
+CASES = (
+    (GetDeepSearchResults, "deep search", load_payload("get_deep_search_200_ok.xml")),
+    (
+        GetUpdatedPropertyDetails,
+        "property details",
+        load_payload("updated_property_details_200_ok.xml"),
+    ),
+    (GetUpdatedPropertyDetails, "heavy property details", heavy_payload()),
+)
+
+
+def chunked(body):
+    stream = io.BytesIO(body)
+    return iter(lambda: stream.read(CHUNK_SIZE), b"")
+
+
+def measure(func, repeat):
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6, peak
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    for result_class, name, body in CASES:
+        variants = (
+            ("full", lambda: result_class(ElementTree.fromstring(body))),
+            (
+                "pruned",
+                lambda: result_class(
+                    _parse_pruned(chunked(body), result_class._stream_trie)
+                ),
+            ),
+        )
+        print("{} ({} bytes)".format(name, len(body)))
+        for name, func in variants:
+            usec, peak = measure(func, repeat)
+            print(
+                "{:>10}: {:8.2f} us/response, peak {:7d} bytes".format(name, usec, peak)
+            )
+
+
+if __name__ == "__main__":
+    main()
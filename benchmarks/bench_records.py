@@ -0,0 +1,72 @@
+"""
+Memory per result held in a batch: result objects vs. compact records.
+
+Builds a batch of results from freshly parsed copies of the payloads in
+``test/xml_payloads``, as a batch job would, and reports the memory retained
+per result with ``tracemalloc``. "object" keeps the result objects (and with
+them the XML data), "object, lazy" the same without extracted attributes,
+"to_record" records converted from result objects and "record_from_xml"
+records extracted directly; for the records, the XML trees are freed. Times
+are measured with tracing enabled and only comparable with each other.
+
+Usage::
+
+    python benchmarks/bench_records.py [RESULTS]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from xml.etree import ElementTree
+
+from _server import load_payload
+from pyzillow.pyzillow import GetDeepSearchResults, GetUpdatedPropertyDetails
+
+CASES = (
+    (GetDeepSearchResults, "get_deep_search_200_ok.xml"),
+    (GetUpdatedPropertyDetails, "updated_property_details_200_ok.xml"),
+)
+
+
+def measure(build, bodies):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    batch = [build(ElementTree.fromstring(body)) for body in bodies]
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del batch
+    return size / len(bodies), elapsed / len(bodies) * 1e6
+
+
+def main():
+    n_results = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    for result_class, file_name in CASES:
+        body = load_payload(file_name)
+        # distinct ZPIDs, so that not all values are equal
+        bodies = [
+            body.replace(b"48749425", b"%08d" % (10000000 + i))
+            for i in range(n_results)
+        ]
+        variants = (
+            ("object", result_class),
+            ("object, lazy", lambda data: result_class(data, lazy=True)),
+            ("to_record", lambda data: result_class(data).to_record()),
+            ("record_from_xml", result_class.record_from_xml),
+        )
+        print("{} ({} results)".format(result_class.__name__, n_results))
+        for name, build in variants:
+            per_result, usec = measure(build, bodies)
+            print(
+                "{:>16}: {:8.0f} bytes/result, {:7.2f} us/result".format(
+                    name, per_result, usec
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
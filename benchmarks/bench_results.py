@@ -0,0 +1,63 @@
+"""
+Construction time of result objects, eager vs. lazy attribute extraction.
+
+Each variant builds result objects from pre-parsed copies of the payloads in
+``test/xml_payloads``, so only attribute extraction is measured. "eager" uses the
+single-pass extractor, "find" reads every attribute with its own
+``Element.find`` call. The "lazy + 2" variant reads ``zillow_id`` and
+``zestimate_amount`` (or ``price``) after construction, a typical access pattern
+in enrichment jobs.
+
+Usage::
+
+    python benchmarks/bench_results.py [PAYLOADS]
+"""
+
+import sys
+import time
+from xml.etree import ElementTree
+
+from _server import load_payload
+from pyzillow.pyzillow import GetDeepSearchResults, GetUpdatedPropertyDetails
+
+CASES = (
+    (GetDeepSearchResults, "get_deep_search_200_ok.xml", "zestimate_amount"),
+    (GetUpdatedPropertyDetails, "updated_property_details_200_ok.xml", "price"),
+)
+
+
+def measure(func, payloads):
+    start = time.perf_counter()
+    for data in payloads:
+        func(data)
+    return (time.perf_counter() - start) / len(payloads) * 1e6
+
+
+def main():
+    n_payloads = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    for result_class, file_name, second_attr in CASES:
+        body = load_payload(file_name)
+        payloads = [ElementTree.fromstring(body) for _ in range(n_payloads)]
+
+        def lazy_two(data):
+            result = result_class(data, lazy=True)
+            return result.zillow_id, getattr(result, second_attr)
+
+        def find(data):
+            result = result_class(data, lazy=True)
+            return [result.get_attr(attr) for attr in result_class.attribute_mapping]
+
+        variants = (
+            ("find", find),
+            ("eager", result_class),
+            ("lazy", lambda data: result_class(data, lazy=True)),
+            ("lazy + 2", lazy_two),
+        )
+        print("{} ({} payloads)".format(result_class.__name__, n_payloads))
+        for name, func in variants:
+            print("{:>10}: {:8.2f} us/object".format(name, measure(func, payloads)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Requests/sec of ``ZillowWrapper.get_data`` with and without the pooled session.
+
+The unpooled variant calls the module-level ``requests.get`` for every lookup,
+which is what ``get_data`` did before the wrapper owned a session.
+
+Usage::
+
+    python benchmarks/bench_session.py [REQUESTS] [THREADS]
+"""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from _server import StandInServer
+from pyzillow.pyzillow import ZillowWrapper
+
+PARAMS = {
+    "address": "2114 Bigelow Ave",
+    "citystatezip": "98109",
+    "rentzestimate": "false",
+    "zws-id": "BENCHMARK",
+}
+
+
+class UnpooledSession(object):
+    """Mimics the old behaviour: a fresh connection for every request."""
+
+    def get(self, **kwargs):
+        return requests.get(**kwargs)
+
+    def close(self):
+        pass
+
+
+def run(zillow_data, url, n_requests, n_threads):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n_threads) as executor:
+        list(
+            executor.map(lambda _: zillow_data.get_data(url, PARAMS), range(n_requests))
+        )
+    return n_requests / (time.perf_counter() - start)
+
+
+def main():
+    n_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    n_threads = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    with StandInServer() as server:
+        url = server.url("GetDeepSearchResults.htm")
+        unpooled = ZillowWrapper("BENCHMARK", session=UnpooledSession())
+        pooled = ZillowWrapper("BENCHMARK", pool_maxsize=n_threads)
+
+        print("{} requests, {} threads".format(n_requests, n_threads))
+        with pooled:
+            for name, zillow_data in (("unpooled", unpooled), ("pooled", pooled)):
+                rate = run(zillow_data, url, n_requests, n_threads)
+                print("{:>10}: {:8.1f} req/s".format(name, rate))
+
+
+if __name__ == "__main__":
+    main()
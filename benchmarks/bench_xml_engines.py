@@ -0,0 +1,62 @@
+"""
+Parse and extraction time of the XML engines in ``pyzillow.pyzillowxml``.
+
+For each payload in ``test/xml_payloads`` with results, the body is parsed with
+each installed engine and a result object is built from it. "parse" measures
+``engine.fromstring`` alone, "extract" building the result object from a parsed
+tree, and "total" both. Both engines use the same single-pass extractor; lxml
+elements are slower to traverse, so lxml wins on parsing and loses some of that
+on extraction.
+
+Usage::
+
+    python benchmarks/bench_xml_engines.py [REPEAT]
+"""
+
+import sys
+import time
+
+from _server import load_payload
+from pyzillow.pyzillow import GetDeepSearchResults, GetUpdatedPropertyDetails
+from pyzillow.pyzillowxml import ENGINES, get_engine
+
+CASES = (
+    (GetDeepSearchResults, "get_deep_search_200_ok.xml"),
+    (GetUpdatedPropertyDetails, "updated_property_details_200_ok.xml"),
+)
+
+
+def measure(func, repeat):
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    engines = []
+    for name in ENGINES:
+        try:
+            engines.append(get_engine(name))
+        except ImportError:
+            print("{} is not installed, skipped".format(name))
+
+    for result_class, file_name in CASES:
+        body = load_payload(file_name)
+        print("{} ({} bytes)".format(result_class.__name__, len(body)))
+        for engine in engines:
+            data = engine.fromstring(body)
+            parse = measure(lambda: engine.fromstring(body), repeat)
+            extract = measure(lambda: result_class(data), repeat)
+            total = measure(lambda: result_class(engine.fromstring(body)), repeat)
+            print(
+                "{:>8}: parse {:7.2f} us, extract {:7.2f} us, "
+                "total {:7.2f} us/response".format(engine.name, parse, extract, total)
+            )
+
+
+if __name__ == "__main__":
+    main()
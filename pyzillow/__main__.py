@@ -0,0 +1,5 @@
+import sys
+
+from .pyzillowcli import main
+
+sys.exit(main())
@@ -1,12 +1,341 @@
-import requests
+import logging
+import sys
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import closing
+from datetime import date, datetime
+from decimal import Decimal
 
-from xml.etree import cElementTree as ElementTree  # for zillow API
+import requests
+from requests.adapters import HTTPAdapter
 
-from .pyzillowerrors import ZillowError, ZillowFail, ZillowNoResults
+from .pyzillowcache import get_endpoint_name, make_cache_key
+from .pyzillowcoalesce import SingleFlight
+from .pyzillowerrors import ZillowError, ZillowFail, ZillowNoResults, ZillowTimeout
+from .pyzillowhooks import as_hook_list, emit, get_error_code
+from .pyzillowjournal import is_transient
+from .pyzillowratelimit import DAILY_LIMIT_EXCEEDED
+from .pyzillowretry import RetryStats
+from .pyzillowstats import Counters
+from .pyzillowxml import PathExtractor, get_engine
 from . import __version__
 
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "pyzillow/{} (Python)".format(__version__)
+
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (10.0, 30.0)
+
+# steps of a call yielded by BaseZillowWrapper._fetch_steps
+_SLEEP = "sleep"
+_SLOT = "slot"
+_REQUEST = "request"
+
+BulkResult = namedtuple("BulkResult", ["index", "item", "response", "error"])
+BulkResult.__doc__ = """Outcome of one lookup of a bulk request.
+
+``index`` is the position of ``item`` in the input. Either ``response`` holds the
+result from the API query or ``error`` holds the
+:class:`pyzillow.pyzillowerrors.ZillowError`,
+:class:`pyzillow.pyzillowerrors.ZillowNoResults` or
+:class:`pyzillow.pyzillowerrors.ZillowFail` raised by the lookup.
+"""
+
+
+class ResponseStats(Counters):
+    """Thread-safe counters of the API responses parsed by a
+    :class:`pyzillow.pyzillow.ZillowWrapper`: ``results`` (responses with
+    results), ``no_results``, ``parse_failures`` (bodies that are not valid XML)
+    and ``errors``, which maps Zillow error codes to the number of responses
+    with that code, e.g. ``{508: 12, 7: 1}``. Responses answered from the cache
+    are counted in ``cache_hits`` instead of ``results``.
+    """
+
+    counters = ("results", "no_results", "parse_failures", "cache_hits")
+    keyed_counters = ("errors",)
+
+    def record_error(self, code: int):
+        """Counts a response with a Zillow error code."""
+        self.incr("errors", key=code)
+
+
+class BaseZillowWrapper(object):
+    """Base class of :class:`pyzillow.pyzillow.ZillowWrapper` and
+    :class:`pyzillow.pyzillowasync.AsyncZillowWrapper`. It holds the options and
+    statistics of both wrappers and runs the parts of a call that do not depend on
+    how requests are sent: rate limiting, retries, caching, parsing, hooks and the
+    ZPID index. The subclasses send the requests and wait, the one blocking and
+    the other with :mod:`asyncio`.
+    """
+
+    _single_flight_class = SingleFlight
+
+    def __init__(
+        self,
+        api_key: str = None,
+        rate_limiter=None,
+        retry=None,
+        timeout=DEFAULT_TIMEOUT,
+        deadline: float = None,
+        cache=None,
+        stream_parse: bool = False,
+        xml_engine=None,
+        coalesce: bool = False,
+        zpid_index=None,
+        hooks=None,
+    ):
+        """Constructor method, see :class:`pyzillow.pyzillow.ZillowWrapper` for
+        the parameters
+        """
+        self.api_key = api_key
+        self.headers = {"User-Agent": USER_AGENT}
+        self.rate_limiter = rate_limiter
+        self.retry = retry
+        self.retry_stats = RetryStats()
+        self.response_stats = ResponseStats()
+        self.timeout = timeout
+        self.deadline = deadline
+        self.cache = cache
+        self.stream_parse = stream_parse
+        self.xml_engine = get_engine(xml_engine)
+        self.single_flight = self._single_flight_class() if coalesce else None
+        self.zpid_index = zpid_index
+        self.hooks = as_hook_list(hooks)
+
+    def _deep_search_query(self, address, zipcode, rentzestimate):
+        """Returns the URL and parameters of a GetDeepSearchResults query"""
+        url = "http://www.zillow.com/webservice/GetDeepSearchResults.htm"
+
+        params = {
+            "address": address,
+            "citystatezip": zipcode,
+            "rentzestimate": str(rentzestimate).lower(),
+            "zws-id": self.api_key,
+        }
+        return url, params
+
+    def _property_details_query(self, zpid):
+        """Returns the URL and parameters of a GetUpdatedPropertyDetails query"""
+        url = "http://www.zillow.com/webservice/GetUpdatedPropertyDetails.htm"
+
+        params = {"zpid": zpid, "zws-id": self.api_key}
+        return url, params
+
+    @staticmethod
+    def _merge_property_record(deep_search_record, response, typed):
+        """Merges a deep search record with the property details in ``response``,
+        or returns it alone if there are no details
+        """
+        if response is None:
+            return merge_records(deep_search_record)
+        return merge_records(
+            deep_search_record,
+            GetUpdatedPropertyDetails.record_from_xml(response, typed),
+        )
+
+    def _get_indexed_zpid(self, address, zipcode):
+        if self.zpid_index is None:
+            return None
+        return self.zpid_index.get(address, zipcode)
+
+    def _update_zpid_index(self, params, result_class, response):
+        """Adds the ZPIDs of a deep search response to the ZPID index"""
+        if self.zpid_index is not None and result_class is GetDeepSearchResults:
+            self.zpid_index.add_response(
+                params["address"], params["citystatezip"], response
+            )
+
+    def _emit(self, event, endpoint, params, attempt, **values):
+        if self.hooks:
+            emit(
+                self.hooks,
+                event,
+                endpoint=endpoint,
+                params=params,
+                attempt=attempt,
+                **values
+            )
+
+    def _get_cached(self, url, params, result_class=None):
+        """Returns the cache key of a query and the cached response, if any"""
+        if self.cache is None:
+            return None, None
+        key = make_cache_key(url, params)
+        body = self.cache.get(key)
+        if body is None:
+            return key, None
+        return key, self.parse_response(body, params, result_class, cached=True)
+
+    def _get_attempt_timeout(self, timeout, deadline, start):
+        """Shortens the timeout of an attempt to the time left until the deadline"""
+        if deadline is None:
+            return timeout
+        remaining = _get_remaining(deadline, start)
+        if remaining <= 0:
+            raise ZillowTimeout
+        if timeout is None:
+            return remaining
+        if isinstance(timeout, tuple):
+            return tuple(min(value, remaining) for value in timeout)
+        return min(timeout, remaining)
+
+    def _get_retry_delay(self, error, attempt, start, deadline):
+        if self.retry is None:
+            return None
+        elapsed = time.monotonic() - start
+        delay = self.retry.get_delay(error, attempt, elapsed)
+        if delay is not None and deadline is not None and elapsed + delay >= deadline:
+            return None
+        return delay
+
+    def _record_retries(self, attempt, backoff, error=None):
+        if error is not None:
+            error.retries = attempt - 1
+        self.retry_stats.record(attempt - 1, backoff)
 
-class ZillowWrapper(object):
+    def parse_response(
+        self, body, params: dict, result_class=None, cached: bool = False
+    ):
+        """This method parses the body of an API response and checks it for
+        Zillow error codes.
+
+        :param body: Body of the API response, or an iterable of chunks of it
+        :type body: bytes
+        :param params: Parameters of the API query
+        :type params: dict
+        :param result_class: Result class the response is parsed for. With
+            ``stream_parse``, only the XML elements it reads are kept.
+        :type result_class: type, optional
+        :param cached: The body was read from the cache, which counts the
+            response in ``response_stats.cache_hits`` instead of ``results``,
+            defaults to False
+        :type cached: bool, optional
+        :raises ZillowFail: The body is not valid XML
+        :raises ZillowError: The API endpoint responded with an error code
+        :raises ZillowNoResults: The request did not return any results
+        :return: Result from API query
+        :rtype: xml.etree.ElementTree.Element
+        """
+        engine = self.xml_engine
+        try:
+            if self.stream_parse and result_class is not None:
+                if isinstance(body, (str, bytes)):
+                    body = (body,)
+                response = _parse_pruned(body, result_class._stream_trie, engine)
+            else:
+                response = engine.fromstring(body)
+        except engine.ParseError:
+            self.response_stats.incr("parse_failures")
+            logger.info(
+                "Zillow response is not a valid XML (%s)", _describe_query(params)
+            )
+            raise ZillowFail
+
+        if response.findall("message/code")[0].text != "0":
+            code = int(str(response.findall("message/code")[0].text))
+            self.response_stats.record_error(code)
+            if code == DAILY_LIMIT_EXCEEDED and self.rate_limiter is not None:
+                self.rate_limiter.exhaust()
+            raise ZillowError(code)
+        else:
+            if not response.findall("response"):
+                self.response_stats.incr("no_results")
+                logger.debug(
+                    "Zillow returned no results for (%s)", _describe_query(params)
+                )
+                raise ZillowNoResults
+            self.response_stats.incr("cache_hits" if cached else "results")
+            return response
+
+    def _fetch_steps(
+        self, url, params, timeout, deadline, result_class, key, stream=False
+    ):
+        """Runs the attempts of a call without doing any I/O itself. The
+        generator yields ``(_SLEEP, seconds)`` to wait, ``(_SLOT, None)`` before
+        a request and ``(_REQUEST, timeout)`` to send one, which is answered with
+        the body of the response or with the exception of the request thrown in.
+        It returns the parsed response and caches its body under ``key``.
+        """
+        endpoint = get_endpoint_name(url)
+        start = time.monotonic()
+        attempt = 0
+        backoff = 0.0
+        while True:
+            attempt += 1
+            try:
+                yield from self._wait_for_rate_limiter(deadline, start)
+                yield _SLOT, None
+                attempt_timeout = self._get_attempt_timeout(timeout, deadline, start)
+                self._emit("before_request", endpoint, params, attempt)
+                sent = time.perf_counter()
+                body = yield _REQUEST, attempt_timeout
+                received = time.perf_counter()
+                self._emit(
+                    "after_response",
+                    endpoint,
+                    params,
+                    attempt,
+                    seconds=received - sent,
+                    size=None if stream else len(body),
+                )
+                if stream:
+                    # releases the connection also if the parser fails halfway
+                    with closing(body):
+                        response = self.parse_response(body, params, result_class)
+                else:
+                    response = self.parse_response(body, params, result_class)
+                self._emit(
+                    "after_parse",
+                    endpoint,
+                    params,
+                    attempt,
+                    seconds=time.perf_counter() - received,
+                )
+            except (ZillowError, ZillowFail, ZillowNoResults) as error:
+                self._emit(
+                    "on_error",
+                    endpoint,
+                    params,
+                    attempt,
+                    error=error,
+                    code=get_error_code(error),
+                )
+                delay = self._get_retry_delay(error, attempt, start, deadline)
+                if delay is None:
+                    self._record_retries(attempt, backoff, error)
+                    raise
+                backoff += delay
+                yield _SLEEP, delay
+            else:
+                self._record_retries(attempt, backoff)
+                if key is not None:
+                    self.cache.set(key, body)
+                # only fetched responses, so cache hits and waiters do not write
+                self._update_zpid_index(params, result_class, response)
+                return response
+
+    def _wait_for_rate_limiter(self, deadline, start):
+        """Yields the waits for the rate limiter, at most until the deadline"""
+        if self.rate_limiter is None:
+            return
+        remaining = _get_remaining(deadline, start)
+        # an expired call must not spend a token and a request of the daily budget
+        if remaining is not None and remaining <= 0:
+            raise ZillowTimeout
+        wait = self.rate_limiter.try_acquire()
+        while wait > 0:
+            remaining = _get_remaining(deadline, start)
+            # fail at once instead of sleeping past the deadline
+            if remaining is not None and wait > remaining:
+                raise ZillowTimeout
+            yield _SLEEP, wait
+            wait = self.rate_limiter.try_acquire()
+
+
+class ZillowWrapper(BaseZillowWrapper):
     """This class provides an interface into the Zillow API.
     An API key is required to create an instance of this class:
 
@@ -45,15 +374,188 @@ class ZillowWrapper(object):
             >>> updated_property_details_response = \
                 zillow_data.get_updated_property_details(zillow_id)
             >>> result = GetUpdatedPropertyDetails(updated_property_details_response)
+
+    All requests made by an instance share one :class:`requests.Session` with a
+    persistent connection pool, so consecutive lookups reuse open connections
+    instead of paying a new TCP/TLS handshake each time. Close the pool with
+    :meth:`close` or use the wrapper as a context manager:
+
+    >>> with ZillowWrapper(YOUR_ZILLOW_API_KEY, pool_maxsize=20) as zillow_data:
+    ...     deep_search_response = zillow_data.get_deep_search_results(address, zipcode)
+
+    To stay within the request limits of your API key, pass a rate limiter from
+    :mod:`pyzillow.pyzillowratelimit`. Requests then wait for the limiter before
+    they are sent. Transient errors are retried according to a
+    :class:`pyzillow.pyzillowretry.RetryPolicy`; ``retry_stats`` counts the retries
+    made by the instance, ``response_stats`` the responses without results, with
+    invalid XML and with each Zillow error code. Both can be read while requests
+    are running.
+
+    Requests time out after ``timeout`` seconds without a connection or response
+    from the API endpoint. ``deadline`` limits the total time of a call, including
+    retries. Both can be set for the instance and overridden for each call;
+    exceeding them raises :class:`pyzillow.pyzillowerrors.ZillowTimeout`, a
+    subclass of :class:`pyzillow.pyzillowerrors.ZillowFail`.
+
+    Successful responses can be cached in a cache from :mod:`pyzillow.pyzillowcache`,
+    so repeated queries for the same address or ZPID are answered without a request.
+    With ``coalesce=True``, concurrent identical queries, e.g. from several threads
+    looking up the same address, share one request in flight and its parsed
+    response (see :class:`pyzillow.pyzillowcoalesce.SingleFlight`);
+    ``single_flight.coalesced`` counts the calls that did not send a request.
+
+    A :class:`pyzillow.pyzillowindex.ZpidIndex` passed as ``zpid_index`` stores
+    the ZPIDs of all deep search results, so that
+    :meth:`get_updated_property_details_by_address` can skip the deep search for
+    addresses that were looked up before.
+
+    Hooks from :mod:`pyzillow.pyzillowhooks` passed as ``hooks`` are called before
+    each request, after its response has arrived and has been parsed, and when an
+    attempt fails, with timings and byte counts, e.g. to feed a metrics system.
+    :class:`pyzillow.pyzillowhooks.LatencyStats` reports latency percentiles per
+    endpoint.
+
+    With ``stream_parse=True``, responses of the GetDeepSearchResults and
+    GetUpdatedPropertyDetails endpoints are parsed incrementally while they are
+    downloaded, and only the elements read by the result classes are kept. This
+    bounds the memory used per response, as large parts of the XML data such as
+    images and local real estate links are discarded.
+
+    Responses are parsed with the XML engine from :mod:`pyzillow.pyzillowxml` set by
+    ``xml_engine``. By default, lxml is used if it is installed, as it parses
+    responses about twice as fast; otherwise ``xml.etree.ElementTree`` from the
+    standard library is used. The result classes accept elements of either
+    engine.
     """
 
-    def __init__(self, api_key: str = None):
+    def __init__(
+        self,
+        api_key: str = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        session: requests.Session = None,
+        rate_limiter=None,
+        retry=None,
+        timeout=DEFAULT_TIMEOUT,
+        deadline: float = None,
+        cache=None,
+        stream_parse: bool = False,
+        xml_engine=None,
+        coalesce: bool = False,
+        zpid_index=None,
+        hooks=None,
+    ):
         """Constructor method
+
+        :param api_key: Zillow Web Service Identifier (ZWSID)
+        :type api_key: str
+        :param pool_connections: Number of per-host connection pools to cache,
+            defaults to 10
+        :type pool_connections: int, optional
+        :param pool_maxsize: Maximum number of connections kept open per host,
+            defaults to 10
+        :type pool_maxsize: int, optional
+        :param pool_block: Block when all connections of a host are in use instead
+            of opening a throwaway connection, defaults to False
+        :type pool_block: bool, optional
+        :param keep_alive: Keep connections open between requests, defaults to True
+        :type keep_alive: bool, optional
+        :param session: Use an existing session instead of creating one. A session
+            passed in is not closed by :meth:`close`.
+        :type session: requests.Session, optional
+        :param rate_limiter: Throttle requests with this rate limiter, which can be
+            shared by several wrappers, defaults to None
+        :type rate_limiter: pyzillow.pyzillowratelimit.BaseRateLimiter, optional
+        :param retry: Retry transient errors according to this policy, defaults to
+            None (no retries)
+        :type retry: pyzillow.pyzillowretry.RetryPolicy, optional
+        :param timeout: Timeout in seconds for each attempt, either one value or a
+            ``(connect, read)`` tuple, defaults to ``(10.0, 30.0)``. ``None`` waits
+            forever.
+        :type timeout: float or tuple, optional
+        :param deadline: Maximum time in seconds of a call including all retries,
+            defaults to None
+        :type deadline: float, optional
+        :param cache: Cache successful responses in this cache, defaults to None
+        :type cache: pyzillow.pyzillowcache.BaseCache, optional
+        :param stream_parse: Parse responses incrementally and keep only the XML
+            elements used by the result classes, defaults to False
+        :type stream_parse: bool, optional
+        :param xml_engine: XML engine, ``"lxml"`` or ``"etree"``, defaults to None
+            (lxml if it is installed)
+        :type xml_engine: str, optional
+        :param coalesce: Let concurrent identical calls share one request,
+            defaults to False
+        :type coalesce: bool, optional
+        :param zpid_index: Store the ZPIDs of deep search results in this index,
+            defaults to None
+        :type zpid_index: pyzillow.pyzillowindex.ZpidIndex, optional
+        :param hooks: Report requests, parsing and errors to these hooks,
+            defaults to None
+        :type hooks: pyzillow.pyzillowhooks.Hooks or list, optional
         """
-        self.api_key = api_key
+        super().__init__(
+            api_key,
+            rate_limiter=rate_limiter,
+            retry=retry,
+            timeout=timeout,
+            deadline=deadline,
+            cache=cache,
+            stream_parse=stream_parse,
+            xml_engine=xml_engine,
+            coalesce=coalesce,
+            zpid_index=zpid_index,
+            hooks=hooks,
+        )
+        if not keep_alive:
+            self.headers["Connection"] = "close"
+        self._owns_session = session is None
+        self._session = session
+        self._session_lock = threading.Lock()
+        self._pool_args = dict(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+
+    @property
+    def session(self):
+        """The :class:`requests.Session` used for all requests of this instance.
+        It is created on first use, once even if several threads use it at once.
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(**self._pool_args)
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+        return self._session
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Closes the connection pool of this instance. Sessions passed in by
+        the caller are left open.
+        """
+        if self._owns_session and self._session is not None:
+            self._session.close()
+            self._session = None
 
     def get_deep_search_results(
-        self, address: str, zipcode: str, rentzestimate: bool = False
+        self,
+        address: str,
+        zipcode: str,
+        rentzestimate: bool = False,
+        timeout=None,
+        deadline: float = None,
     ):
         """This method provides results from the GetDeepSearchResults API endpoint as an XML object.
 
@@ -64,33 +566,322 @@ class ZillowWrapper(object):
         :param rentzestimate: Add Rent Zestimate information to result (True/False),
          defaults to False
         :type rentzestimate: bool, optional
+        :param timeout: Timeout of this call, defaults to the timeout of the instance
+        :type timeout: float or tuple, optional
+        :param deadline: Deadline of this call, defaults to the deadline of the
+            instance
+        :type deadline: float, optional
         :return: Result from API query
         :rtype: xml.etree.ElementTree.Element
         """
-        url = "http://www.zillow.com/webservice/GetDeepSearchResults.htm"
+        url, params = self._deep_search_query(address, zipcode, rentzestimate)
+        return self.get_data(url, params, timeout, deadline, GetDeepSearchResults)
 
-        params = {
-            "address": address,
-            "citystatezip": zipcode,
-            "rentzestimate": str(rentzestimate).lower(),
-            "zws-id": self.api_key,
-        }
-        return self.get_data(url, params)
+    def get_deep_search_results_bulk(
+        self,
+        addresses,
+        rentzestimate: bool = False,
+        max_workers: int = 8,
+        ordered: bool = True,
+        journal=None,
+    ):
+        """This method looks up many addresses from the GetDeepSearchResults API endpoint
+        concurrently on a pool of worker threads and yields a
+        :class:`pyzillow.pyzillow.BulkResult` for each of them:
+
+        >>> addresses = [("2114 Bigelow Ave", "98109"), ("1600 Pennsylvania Ave", "20500")]
+        >>> for outcome in zillow_data.get_deep_search_results_bulk(addresses):
+        ...     if outcome.error is None:
+        ...         result = GetDeepSearchResults(outcome.response)
+
+        Errors of single lookups do not stop the batch, they are returned in
+        ``BulkResult.error``. Addresses are read lazily from the iterable and at most
+        ``2 * max_workers`` lookups are pending at any time, so large inputs can be
+        streamed. Use a connection pool of at least ``max_workers`` connections
+        (``pool_maxsize``) to keep all workers busy.
+
+        With a :class:`pyzillow.pyzillowjournal.Journal`, addresses that are done
+        according to the journal are skipped, and the outcome of each address is
+        recorded once the caller asks for the next result. A rerun of an
+        interrupted job with the same journal only looks up the remaining
+        addresses. ``BulkResult.index`` stays the position in the input.
+
+        :param addresses: Iterable of ``(address, zipcode)`` tuples
+        :type addresses: iterable
+        :param rentzestimate: Add Rent Zestimate information to result (True/False),
+         defaults to False
+        :type rentzestimate: bool, optional
+        :param max_workers: Number of concurrent lookups, defaults to 8
+        :type max_workers: int, optional
+        :param ordered: Yield results in input order (True) or as they complete
+         (False), defaults to True. In ordered mode, results that complete early are
+         buffered until all previous results have been yielded.
+        :type ordered: bool, optional
+        :param journal: Skip addresses done according to this journal and record
+         the outcomes of the others, defaults to None
+        :type journal: pyzillow.pyzillowjournal.Journal, optional
+        :return: Generator of :class:`pyzillow.pyzillow.BulkResult`
+        :rtype: generator
+        """
+        outcomes = self.map_bulk(
+            lambda item: self.get_deep_search_results(
+                item[0], item[1], rentzestimate
+            ),
+            addresses,
+            max_workers,
+            ordered,
+            skip=None if journal is None else journal.__contains__,
+        )
+        if journal is None:
+            return outcomes
+        return self._record_outcomes(outcomes, journal)
+
+    def get_property_record(
+        self,
+        address: str,
+        zipcode: str,
+        rentzestimate: bool = False,
+        typed: bool = False,
+        timeout=None,
+        deadline: float = None,
+    ):
+        """This method looks up an address with the GetDeepSearchResults API
+        endpoint and the details of the property found with the
+        GetUpdatedPropertyDetails API endpoint, and merges the attributes of both
+        into a :class:`pyzillow.pyzillow.PropertyRecord`.
+
+        Details are not available for all properties. If the details request
+        fails with a Zillow error that is not transient (see
+        :func:`pyzillow.pyzillowjournal.is_transient`) or without results, the
+        record only holds the attributes of the deep search.
+
+        :param address: Street address to look up
+        :type address: str
+        :param zipcode: ZIP code to look up
+        :type zipcode: str
+        :param rentzestimate: Add Rent Zestimate information to result (True/False),
+         defaults to False
+        :type rentzestimate: bool, optional
+        :param typed: Convert values to the types of ``attribute_types`` of the
+            result classes, defaults to False
+        :type typed: bool, optional
+        :param timeout: Timeout of each request, defaults to the timeout of the
+            instance
+        :type timeout: float or tuple, optional
+        :param deadline: Deadline of each request, defaults to the deadline of the
+            instance
+        :type deadline: float, optional
+        :rtype: pyzillow.pyzillow.PropertyRecord
+        """
+        response = self.get_deep_search_results(
+            address, zipcode, rentzestimate, timeout, deadline
+        )
+        deep_search_record = GetDeepSearchResults.record_from_xml(response, typed)
+        try:
+            response = self.get_updated_property_details(
+                deep_search_record.zillow_id, timeout, deadline
+            )
+        except (ZillowError, ZillowNoResults) as error:
+            if is_transient(error):
+                raise
+            response = None
+        return self._merge_property_record(deep_search_record, response, typed)
+
+    def get_property_records_bulk(
+        self,
+        addresses,
+        rentzestimate: bool = False,
+        typed: bool = False,
+        max_workers: int = 8,
+        ordered: bool = True,
+        journal=None,
+    ):
+        """This method looks up many addresses like :meth:`get_property_record` and
+        yields a :class:`pyzillow.pyzillow.BulkResult` with a
+        :class:`pyzillow.pyzillow.PropertyRecord` as ``response`` for each of them:
+
+        >>> for outcome in zillow_data.get_property_records_bulk(addresses):
+        ...     if outcome.error is None:
+        ...         record = outcome.response
+        ...         print(record.zestimate_amount, record.heating_system)
+
+        Each worker requests the details of an address as soon as its deep search
+        has returned the ZPID, while the other workers run the deep searches of
+        the next addresses, so both stages overlap across addresses. Inputs are
+        streamed, ordered and journaled as with
+        :meth:`get_deep_search_results_bulk`.
+
+        :param addresses: Iterable of ``(address, zipcode)`` tuples
+        :type addresses: iterable
+        :param rentzestimate: Add Rent Zestimate information to result (True/False),
+         defaults to False
+        :type rentzestimate: bool, optional
+        :param typed: Convert values to the types of ``attribute_types`` of the
+            result classes, defaults to False
+        :type typed: bool, optional
+        :param max_workers: Number of concurrent lookups, defaults to 8
+        :type max_workers: int, optional
+        :param ordered: Yield results in input order (True) or as they complete
+         (False), defaults to True
+        :type ordered: bool, optional
+        :param journal: Skip addresses done according to this journal and record
+         the outcomes of the others, defaults to None
+        :type journal: pyzillow.pyzillowjournal.Journal, optional
+        :return: Generator of :class:`pyzillow.pyzillow.BulkResult`
+        :rtype: generator
+        """
+        outcomes = self.map_bulk(
+            lambda item: self.get_property_record(
+                item[0], item[1], rentzestimate, typed
+            ),
+            addresses,
+            max_workers,
+            ordered,
+            skip=None if journal is None else journal.__contains__,
+        )
+        if journal is None:
+            return outcomes
+        return self._record_outcomes(outcomes, journal)
+
+    @staticmethod
+    def _record_outcomes(outcomes, journal):
+        with closing(outcomes):
+            for outcome in outcomes:
+                yield outcome
+                # recorded after the caller has handled the result
+                journal.record(outcome.item, outcome.error)
+
+    def map_bulk(
+        self, func, items, max_workers: int = 8, ordered: bool = True, skip=None
+    ):
+        """This method calls ``func`` for many items concurrently on a pool of
+        worker threads and yields a :class:`pyzillow.pyzillow.BulkResult` with
+        its return value as ``response`` for each of them. It runs the lookups of
+        the other bulk methods and can run custom ones, e.g. a lookup that
+        extracts a record right away:
+
+        >>> def lookup(item):
+        ...     response = zillow_data.get_deep_search_results(*item)
+        ...     return GetDeepSearchResults.record_from_xml(response)
+        >>> for outcome in zillow_data.map_bulk(lookup, addresses):
+        ...     print(outcome.index, outcome.response, outcome.error)
+
+        Exceptions from :mod:`pyzillow.pyzillowerrors` raised by ``func`` are
+        returned in ``BulkResult.error``; other exceptions stop the batch. Items
+        are streamed as with :meth:`get_deep_search_results_bulk`.
 
-    def get_updated_property_details(self, zpid: str):
+        :param func: Function called with each item
+        :type func: callable
+        :param items: Iterable of items
+        :type items: iterable
+        :param max_workers: Number of concurrent calls, defaults to 8
+        :type max_workers: int, optional
+        :param ordered: Yield results in input order (True) or as they complete
+         (False), defaults to True
+        :type ordered: bool, optional
+        :param skip: Function called with each item, which skips the item if
+         it returns True, defaults to None. ``BulkResult.index`` stays the
+         position in the input.
+        :type skip: callable, optional
+        :return: Generator of :class:`pyzillow.pyzillow.BulkResult`
+        :rtype: generator
+        """
+        max_pending = 2 * max_workers
+        items = enumerate(items)
+        if skip is not None:
+            items = ((index, item) for index, item in items if not skip(item))
+        # sequence numbers of the items submitted, which order the results
+        items = enumerate(items)
+        exhausted = False
+        pending = {}
+        buffered = {}
+        next_seq = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while True:
+                # buffered results count against the window, so a slow lookup
+                # in ordered mode cannot make the buffer grow without bounds
+                while not exhausted and len(pending) + len(buffered) < max_pending:
+                    try:
+                        seq, (index, item) = next(items)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    pending[executor.submit(func, item)] = (seq, index, item)
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    seq, index, item = pending.pop(future)
+                    try:
+                        outcome = BulkResult(index, item, future.result(), None)
+                    except (ZillowError, ZillowNoResults, ZillowFail) as error:
+                        outcome = BulkResult(index, item, None, error)
+                    if ordered:
+                        buffered[seq] = outcome
+                    else:
+                        yield outcome
+                while next_seq in buffered:
+                    yield buffered.pop(next_seq)
+                    next_seq += 1
+
+    def get_updated_property_details(
+        self, zpid: str, timeout=None, deadline: float = None
+    ):
         """This method provides results from the GetUpdatedPropertyDetails API endpoint as an XML object.
 
         :param zpid: Zillow Web Service Identifier
         :type zpid: str
+        :param timeout: Timeout of this call, defaults to the timeout of the instance
+        :type timeout: float or tuple, optional
+        :param deadline: Deadline of this call, defaults to the deadline of the
+            instance
+        :type deadline: float, optional
         :return: Result from API query
         :rtype: xml.etree.ElementTree.Element
         """
-        url = "http://www.zillow.com/webservice/GetUpdatedPropertyDetails.htm"
+        url, params = self._property_details_query(zpid)
+        return self.get_data(
+            url, params, timeout, deadline, GetUpdatedPropertyDetails
+        )
 
-        params = {"zpid": zpid, "zws-id": self.api_key}
-        return self.get_data(url, params)
+    def get_updated_property_details_by_address(
+        self, address: str, zipcode: str, timeout=None, deadline: float = None
+    ):
+        """This method provides results from the GetUpdatedPropertyDetails API
+        endpoint for an address. If the ZPID of the address is in the ZPID index of
+        the instance, the details are requested directly; otherwise the ZPID is
+        looked up with the GetDeepSearchResults API endpoint first.
+
+        :param address: Street address to look up
+        :type address: str
+        :param zipcode: ZIP code to look up
+        :type zipcode: str
+        :param timeout: Timeout of each request, defaults to the timeout of the
+            instance
+        :type timeout: float or tuple, optional
+        :param deadline: Deadline of each request, defaults to the deadline of the
+            instance
+        :type deadline: float, optional
+        :return: Result from API query
+        :rtype: xml.etree.ElementTree.Element
+        """
+        zpid = self._get_indexed_zpid(address, zipcode)
+        if zpid is None:
+            response = self.get_deep_search_results(
+                address, zipcode, timeout=timeout, deadline=deadline
+            )
+            zpid = GetDeepSearchResults(response, lazy=True).zillow_id
+        return self.get_updated_property_details(zpid, timeout, deadline)
 
-    def get_data(self, url: str, params: dict):
+    def get_data(
+        self,
+        url: str,
+        params: dict,
+        timeout=None,
+        deadline: float = None,
+        result_class=None,
+    ):
         """This method requests data from the API endpoint specified in the url argument.
         It uses parameters from the params argument.
 
@@ -98,21 +889,80 @@ class ZillowWrapper(object):
         :type url: str
         :param params: Parameters for API query
         :type params: dict
+        :param timeout: Timeout of this call, defaults to the timeout of the instance
+        :type timeout: float or tuple, optional
+        :param deadline: Deadline of this call, defaults to the deadline of the
+            instance
+        :type deadline: float, optional
+        :param result_class: Result class the response is parsed for. With
+            ``stream_parse``, only the XML elements it reads are kept.
+        :type result_class: type, optional
+        :raises ZillowTimeout: The API endpoint did not respond in time or the
+            deadline was exceeded
         :raises ZillowFail: The API endpoint could not be reached or the request
             did not return valid XML
         :raises ZillowError: The API endpoint responded with an error code
         :raises ZillowNoResults: The request did not return any results
         :return: Result from API query
         :rtype: xml.etree.ElementTree.Element
+
+        If the instance has a retry policy, failed attempts are retried. The number
+        of retries of a call that finally failed is available as ``.retries`` of
+        the exception raised. With ``coalesce``, a call waits for an identical
+        call in flight and returns its response or raises its exception.
         """
+        key, response = self._get_cached(url, params, result_class)
+        if response is None:
+            timeout = self.timeout if timeout is None else timeout
+            deadline = self.deadline if deadline is None else deadline
+            if self.single_flight is None:
+                response = self._fetch(
+                    url, params, timeout, deadline, result_class, key
+                )
+            else:
+                response = self.single_flight.do(
+                    (key or make_cache_key(url, params), result_class),
+                    lambda: self._fetch(
+                        url, params, timeout, deadline, result_class, key
+                    ),
+                    deadline,
+                )
+        return response
+
+    def _fetch(self, url, params, timeout, deadline, result_class, key):
+        """Requests and parses a response with retries and caches it under
+        ``key``"""
+        # a streamed body cannot be cached, it is consumed by the parser
+        stream = self.stream_parse and result_class is not None and key is None
+        steps = self._fetch_steps(
+            url, params, timeout, deadline, result_class, key, stream
+        )
+        value = error = None
+        while True:
+            try:
+                step, arg = steps.send(value) if error is None else steps.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            value = error = None
+            if step == _SLEEP:
+                time.sleep(arg)
+            elif step == _REQUEST:
+                try:
+                    value = self._request(url, params, arg, stream)
+                except ZillowFail as request_error:
+                    error = request_error
+
+    def _request(self, url, params, timeout, stream=False):
         try:
-            request = requests.get(
+            request = self.session.get(
                 url=url,
                 params=params,
-                headers={
-                    "User-Agent": "".join(["pyzillow/", __version__, " (Python)"])
-                },
+                headers=self.headers,
+                timeout=timeout,
+                stream=stream,
             )
+        except requests.exceptions.Timeout:
+            raise ZillowTimeout
         except (
             requests.exceptions.ConnectionError,
             requests.exceptions.TooManyRedirects,
@@ -123,30 +973,256 @@ class ZillowWrapper(object):
         try:
             request.raise_for_status()
         except requests.exceptions.HTTPError:
+            request.close()
             raise ZillowFail
 
-        try:
-            response = ElementTree.fromstring(request.text)
-        except ElementTree.ParseError:
-            print("Zillow response is not a valid XML ({})".format(params["address"]))
-            raise ZillowFail
+        if stream:
+            return _iter_body(request)
+        # the raw bytes are parsed directly; decoding them to text first would
+        # add a charset detection and a copy of the body
+        return request.content
+
+
+def _get_remaining(deadline, start):
+    """Returns the time left until the deadline of a call, or None"""
+    if deadline is None:
+        return None
+    return deadline - (time.monotonic() - start)
+
+
+def _describe_query(params):
+    """Returns the address or ZPID of a query for log messages"""
+    return params.get("address", params.get("zpid"))
+
+
+def _iter_body(request, chunk_size=8192):
+    """Yields the body of a streamed response in chunks and releases the
+    connection afterwards"""
+    try:
+        for chunk in request.iter_content(chunk_size):
+            yield chunk
+    except requests.exceptions.Timeout:
+        raise ZillowTimeout
+    except requests.exceptions.RequestException:
+        raise ZillowFail
+    finally:
+        request.close()
+
+
+def _build_trie(paths):
+    """Builds a trie of tags, e.g. ``{"message": {"code": {}}}``, from paths"""
+    trie = {}
+    for path in paths:
+        node = trie
+        for tag in path.split("/"):
+            node = node.setdefault(tag, {})
+    return trie
+
+
+def _parse_pruned(chunks, keep, engine=None):
+    """Parses an XML document from chunks of bytes or text and drops all elements
+    that are not on one of the paths of the ``keep`` trie as soon as they are
+    complete, so the tree never holds more than the kept elements and the
+    subtree currently being parsed.
+    """
+    parser = get_engine(engine).pull_parser()
+    elements = []
+    nodes = []
+    root = None
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, element in parser.read_events():
+            if event == "start":
+                if root is None:
+                    root, node = element, keep
+                else:
+                    parent = nodes[-1]
+                    node = None if parent is None else parent.get(element.tag)
+                elements.append(element)
+                nodes.append(node)
+                continue
+
+            elements.pop()
+            if nodes.pop() is None:
+                element.clear()
+                # elements below a dropped element are discarded with it
+                if nodes and nodes[-1] is not None:
+                    elements[-1].remove(element)
+    parser.close()
+    return root
 
-        if response.findall("message/code")[0].text != "0":
-            raise ZillowError(int(str(response.findall("message/code")[0].text)))
-        else:
-            if not response.findall("response"):
-                print("Zillow returned no results for ({})".format(params["address"]))
-                raise ZillowNoResults
-            return response
+
+def _parse_date(text):
+    return datetime.strptime(text, "%m/%d/%Y").date()
+
+
+# converters for the types of attribute_types that do not parse text themselves
+TYPE_CONVERTERS = {date: _parse_date}
+
+
+class _LazyAttribute(object):
+    """Descriptor that reads a result attribute from the XML data on first access.
+    The value is then stored in the instance dictionary, which takes precedence
+    over the descriptor for later reads.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value = instance.get_attr(self.name)
+        if instance._typed:
+            value = instance._convert_value(self.name, value)
+        instance.__dict__[self.name] = value
+        return value
 
 
 class ZillowResults(object):
     """Base class for :class:`pyzillow.pyzillow.GetDeepSearchResults`
        and :class:`pyzillow.pyzillow.GetUpdatedPropertyDetails`.
+
+    Subclasses define ``attribute_mapping``, which maps attribute names to paths in
+    the XML data below ``data_path``. ``extra_paths`` lists further paths read by
+    properties, which have to be kept when responses are parsed with
+    ``stream_parse``. By default, all attributes are extracted when the object is
+    created. With ``lazy=True``, each attribute is extracted on first access
+    instead, so creating the object is cheap when only a few attributes are read.
+
+    To hold many results in memory, convert them to compact records with
+    :meth:`to_record` or :meth:`record_from_xml`. A record is a named tuple of the
+    attributes of ``attribute_mapping`` and does not reference the XML data, so the
+    tree can be freed. The values of ``categorical_attributes``, which repeat
+    across results, are interned and shared by all records.
+
+    All attributes are strings, unless the object is created with ``typed=True``.
+    Then the attributes listed in ``attribute_types`` are converted once when they
+    are extracted, to ``int``, ``float``, ``decimal.Decimal`` or
+    ``datetime.date``. Values that cannot be converted are None.
     """
 
-    def __init__(self):
-        self.attribute_mapping = {}
+    data_path = "response"
+    extra_paths = ()
+    categorical_attributes = ()
+    attribute_types = {}
+    _typed = False
+
+    def __init__(
+        self, data, *args, lazy: bool = False, typed: bool = False, hooks=None, **kwargs
+    ):
+        """Constructor method
+
+        :param data: Result from the API endpoint of the subclass
+        :type data: xml.etree.ElementTree.Element
+        :param lazy: Extract attributes on first access, defaults to False
+        :type lazy: bool, optional
+        :param typed: Convert attributes to the types of ``attribute_types``,
+            defaults to False
+        :type typed: bool, optional
+        :param hooks: Report the extraction time to these hooks, defaults to None
+        :type hooks: pyzillow.pyzillowhooks.Hooks or list, optional
+        """
+        self.data = data.findall(self.data_path)[0]
+        if typed:
+            self._typed = True
+        if lazy:
+            return
+        start = time.perf_counter()
+        values = self._extractor(self.data)
+        if typed:
+            self._convert(values)
+        for attr, value in values.items():
+            try:
+                self.__setattr__(attr, value)
+            except AttributeError:
+                logger.debug("AttributeError with %s", attr)
+        if hooks is not None:
+            emit(
+                as_hook_list(hooks),
+                "after_extract",
+                endpoint=type(self).__name__,
+                seconds=time.perf_counter() - start,
+            )
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._extractor = PathExtractor(cls.attribute_mapping)
+        cls._record_type = namedtuple(
+            cls.__name__ + "Record", list(cls.attribute_mapping), module=cls.__module__
+        )
+        # lets pickle find the record type
+        cls._record_type.__qualname__ = cls.__qualname__ + "._record_type"
+        cls._record_type.__doc__ = "Compact record of :class:`{}.{}`".format(
+            cls.__module__, cls.__qualname__
+        )
+        paths = list(cls.attribute_mapping.values()) + list(cls.extra_paths)
+        cls._stream_trie = _build_trie(
+            ["message/code"] + ["/".join([cls.data_path, path]) for path in paths]
+        )
+        for attr in cls.attribute_mapping:
+            if attr not in cls.__dict__:
+                setattr(cls, attr, _LazyAttribute(attr))
+
+    @classmethod
+    def record_type(cls):
+        """Returns the named tuple type of the records of this class, with one field
+        per attribute of ``attribute_mapping``.
+
+        :rtype: type
+        """
+        return cls._record_type
+
+    @classmethod
+    def record_from_xml(cls, data, typed: bool = False):
+        """Extracts a compact record from an API response without creating a
+        result object.
+
+        :param data: Result from the API endpoint of this class
+        :type data: xml.etree.ElementTree.Element
+        :param typed: Convert values to the types of ``attribute_types``,
+            defaults to False
+        :type typed: bool, optional
+        :rtype: tuple
+        """
+        values = cls._extractor(data.findall(cls.data_path)[0])
+        if typed:
+            cls._convert(values)
+        return cls._make_record(values)
+
+    def to_record(self):
+        """Returns the attributes of this object as a compact record.
+
+        :rtype: tuple
+        """
+        return self._make_record(
+            {attr: getattr(self, attr) for attr in self.attribute_mapping}
+        )
+
+    @classmethod
+    def _make_record(cls, values):
+        for attr in cls.categorical_attributes:
+            if isinstance(values[attr], str):
+                values[attr] = sys.intern(values[attr])
+        return cls._record_type(**values)
+
+    @classmethod
+    def _convert_value(cls, attr, value):
+        attr_type = cls.attribute_types.get(attr)
+        if attr_type is None or value is None:
+            return value
+        try:
+            return TYPE_CONVERTERS.get(attr_type, attr_type)(value)
+        except (ValueError, ArithmeticError):
+            return None
+
+    @classmethod
+    def _convert(cls, values):
+        """Converts the values of a dictionary of attributes in place"""
+        for attr in cls.attribute_types:
+            if attr in values:
+                values[attr] = cls._convert_value(attr, values[attr])
+        return values
 
     def get_attr(self, attr):
         """
@@ -253,15 +1329,59 @@ class GetDeepSearchResults(ZillowResults):
         "zipcode": "result/address/zipcode",
     }
 
-    def __init__(self, data, *args, **kwargs):
+    data_path = "response/results"
+    extra_paths = ("result/localRealEstate/region",)
+    categorical_attributes = (
+        "city",
+        "home_type",
+        "rentzestimate_last_updated",
+        "state",
+        "use_code",
+        "zestimate_last_updated",
+        "zipcode",
+    )
+    attribute_types = {
+        "bathrooms": float,
+        "bedrooms": int,
+        "home_size": int,
+        "last_sold_date": date,
+        "last_sold_price": int,
+        "latitude": float,
+        "longitude": float,
+        "property_size": int,
+        "rentzestimate_amount": int,
+        "rentzestimate_last_updated": date,
+        "rentzestimate_valuation_range_high": int,
+        "rentzestimate_valuation_range_low": int,
+        "rentzestimate_value_change": int,
+        "tax_value": Decimal,
+        "tax_year": int,
+        "total_rooms": int,
+        "year_built": int,
+        "zestimate_amount": int,
+        "zestimate_last_updated": date,
+        "zestimate_percentile": int,
+        "zestimate_valuation_range_high": int,
+        "zestimate_valuation_range_low": int,
+        "zestimate_value_change": int,
+    }
+
+    def __init__(
+        self, data, *args, lazy: bool = False, typed: bool = False, hooks=None, **kwargs
+    ):
         """Constructor method
+
+        :param data: Result from the GetDeepSearchResults API endpoint
+        :type data: xml.etree.ElementTree.Element
+        :param lazy: Extract attributes on first access, defaults to False
+        :type lazy: bool, optional
+        :param typed: Convert attributes to the types of ``attribute_types``,
+            defaults to False
+        :type typed: bool, optional
+        :param hooks: Report the extraction time to these hooks, defaults to None
+        :type hooks: pyzillow.pyzillowhooks.Hooks or list, optional
         """
-        self.data = data.findall("response/results")[0]
-        for attr in self.attribute_mapping.__iter__():
-            try:
-                self.__setattr__(attr, self.get_attr(attr))
-            except AttributeError:
-                print("AttributeError with {}".format(attr))
+        super().__init__(data, lazy=lazy, typed=typed, hooks=hooks)
 
     @property
     def region_name(self):
@@ -294,6 +1414,95 @@ class GetDeepSearchResults(ZillowResults):
             return None
 
 
+DeepSearchRecord = GetDeepSearchResults.record_type()
+
+
+class DeepSearchResultSet(object):
+    """Collects all ``result`` entries of a GetDeepSearchResults response.
+
+    For condos and multi-unit buildings, Zillow can return several matching
+    properties, while :class:`pyzillow.pyzillow.GetDeepSearchResults` only reads
+    the first one. A ``DeepSearchResultSet`` holds a
+    :class:`pyzillow.pyzillow.DeepSearchRecord` for every entry, so the right unit
+    can be picked without further queries:
+
+    >>> results = DeepSearchResultSet(deep_search_response)
+    >>> results.zillow_ids
+    ['82468139', '82468140', '82468141']
+    >>> results.find(street="1521 2nd Ave APT 1102").zillow_id
+    '82468140'
+
+    The records are independent of the XML data, which can be released.
+    """
+
+    # paths of GetDeepSearchResults relative to a single result element
+    _extractor = PathExtractor(
+        {
+            attr: path.split("/", 1)[1]
+            for attr, path in GetDeepSearchResults.attribute_mapping.items()
+        }
+    )
+
+    def __init__(self, data, typed: bool = False):
+        """Constructor method
+
+        :param data: Result from the GetDeepSearchResults API endpoint
+        :type data: xml.etree.ElementTree.Element
+        :param typed: Convert values to the types of
+            ``GetDeepSearchResults.attribute_types``, defaults to False
+        :type typed: bool, optional
+        """
+        results = data.findall(GetDeepSearchResults.data_path)[0]
+        self.records = []
+        for result in results.findall("result"):
+            values = self._extractor(result)
+            if typed:
+                GetDeepSearchResults._convert(values)
+            self.records.append(GetDeepSearchResults._make_record(values))
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
+
+    def column(self, attr: str):
+        """Returns an attribute of all records, in the order of the response.
+
+        :param attr: Name of the attribute, e.g. ``"zestimate_amount"``
+        :type attr: str
+        :rtype: list
+        """
+        if attr not in DeepSearchRecord._fields:
+            raise AttributeError(attr)
+        index = DeepSearchRecord._fields.index(attr)
+        return [record[index] for record in self.records]
+
+    def find(self, **values):
+        """Returns the first record whose attributes equal the given values, e.g.
+        ``find(street="1521 2nd Ave APT 1102")``, or None.
+
+        :rtype: pyzillow.pyzillow.DeepSearchRecord
+        """
+        for record in self.records:
+            if all(getattr(record, attr) == value for attr, value in values.items()):
+                return record
+        return None
+
+    @property
+    def zillow_ids(self):
+        """ZPIDs of all records"""
+        return self.column("zillow_id")
+
+    @property
+    def zestimate_amounts(self):
+        """Zestimates of all records"""
+        return self.column("zestimate_amount")
+
+
 class GetUpdatedPropertyDetails(ZillowResults):
     """Maps results from the XML data array into attributes of an instance of GetUpdatedPropertyDetails.
 
@@ -400,12 +1609,73 @@ class GetUpdatedPropertyDetails(ZillowResults):
         "year_updated": "editedFacts/yearUpdated",
     }
 
-    def __init__(self, data, *args, **kwargs):
+    categorical_attributes = ("city", "home_type", "state", "zipcode")
+    attribute_types = {
+        "bathrooms": float,
+        "bedrooms": int,
+        "home_size": int,
+        "latitude": float,
+        "longitude": float,
+        "num_floors": int,
+        "num_rooms": int,
+        "page_view_count_this_month": int,
+        "page_view_count_total": int,
+        "price": int,
+        "property_size": int,
+        "year_built": int,
+        "year_updated": int,
+    }
+
+    def __init__(
+        self, data, *args, lazy: bool = False, typed: bool = False, hooks=None, **kwargs
+    ):
         """Constructor method
+
+        :param data: Result from the GetUpdatedPropertyDetails API endpoint
+        :type data: xml.etree.ElementTree.Element
+        :param lazy: Extract attributes on first access, defaults to False
+        :type lazy: bool, optional
+        :param typed: Convert attributes to the types of ``attribute_types``,
+            defaults to False
+        :type typed: bool, optional
+        :param hooks: Report the extraction time to these hooks, defaults to None
+        :type hooks: pyzillow.pyzillowhooks.Hooks or list, optional
         """
-        self.data = data.findall("response")[0]
-        for attr in self.attribute_mapping.__iter__():
-            try:
-                self.__setattr__(attr, self.get_attr(attr))
-            except AttributeError:
-                print("AttributeError with {}".format(attr))
+        super().__init__(data, lazy=lazy, typed=typed, hooks=hooks)
+
+
+# attributes of both result classes, the details ones after those of the deep search
+PropertyRecord = namedtuple(
+    "PropertyRecord",
+    list(GetDeepSearchResults.attribute_mapping)
+    + [
+        attr
+        for attr in GetUpdatedPropertyDetails.attribute_mapping
+        if attr not in GetDeepSearchResults.attribute_mapping
+    ],
+)
+PropertyRecord.__doc__ = """Merged record of the attributes of
+:class:`pyzillow.pyzillow.GetDeepSearchResults` and
+:class:`pyzillow.pyzillow.GetUpdatedPropertyDetails` of a property, as returned by
+:meth:`pyzillow.pyzillow.ZillowWrapper.get_property_record`.
+"""
+
+
+def merge_records(deep_search_record, details_record=None):
+    """Merges the records of the deep search and of the details of a property. For
+    attributes of both classes, e.g. ``bedrooms``, the value of the details is
+    used unless it is None.
+
+    :param deep_search_record: Record of :class:`GetDeepSearchResults`
+    :type deep_search_record: pyzillow.pyzillow.DeepSearchRecord
+    :param details_record: Record of :class:`GetUpdatedPropertyDetails`, defaults
+        to None (details attributes are None)
+    :type details_record: tuple, optional
+    :rtype: pyzillow.pyzillow.PropertyRecord
+    """
+    values = dict(zip(deep_search_record._fields, deep_search_record))
+    if details_record is not None:
+        for attr, value in zip(details_record._fields, details_record):
+            if value is not None or attr not in values:
+                values[attr] = value
+    return PropertyRecord(*[values.get(attr) for attr in PropertyRecord._fields])
@@ -0,0 +1,219 @@
+"""Normalization of street addresses and ZIP codes to a canonical form, so that
+different spellings of an address build the same cache key:
+
+>>> from pyzillow.pyzillowaddress import normalize_address
+>>> normalize_address("2114 Bigelow Avenue North, Apt. #5")
+'2114 BIGELOW AVE N APT 5'
+
+Addresses are upper-cased, periods and commas are removed and street suffixes,
+directions and unit designators are abbreviated following USPS Publication 28
+(appendices C1 and C2; the common spellings are included). Every word is looked
+up on its own, so a street named "North" becomes "N" as well; the result is
+meant as a key, not as a mailing address.
+"""
+
+import re
+
+DIRECTIONS = {
+    "NORTH": "N",
+    "SOUTH": "S",
+    "EAST": "E",
+    "WEST": "W",
+    "NORTHEAST": "NE",
+    "NORTHWEST": "NW",
+    "SOUTHEAST": "SE",
+    "SOUTHWEST": "SW",
+}
+
+STREET_SUFFIXES = {
+    "ALLEY": "ALY",
+    "ALLEE": "ALY",
+    "ANNEX": "ANX",
+    "ARCADE": "ARC",
+    "AVENUE": "AVE",
+    "AV": "AVE",
+    "AVEN": "AVE",
+    "AVENU": "AVE",
+    "AVN": "AVE",
+    "AVNUE": "AVE",
+    "BAYOU": "BYU",
+    "BEACH": "BCH",
+    "BEND": "BND",
+    "BLUFF": "BLF",
+    "BOTTOM": "BTM",
+    "BOULEVARD": "BLVD",
+    "BOUL": "BLVD",
+    "BOULV": "BLVD",
+    "BRANCH": "BR",
+    "BRIDGE": "BRG",
+    "BROOK": "BRK",
+    "BYPASS": "BYP",
+    "CANYON": "CYN",
+    "CAPE": "CPE",
+    "CAUSEWAY": "CSWY",
+    "CENTER": "CTR",
+    "CENTRE": "CTR",
+    "CENTR": "CTR",
+    "CNTR": "CTR",
+    "CIRCLE": "CIR",
+    "CIRC": "CIR",
+    "CIRCL": "CIR",
+    "CRCL": "CIR",
+    "CLIFF": "CLF",
+    "CLUB": "CLB",
+    "COMMON": "CMN",
+    "CORNER": "COR",
+    "COURSE": "CRSE",
+    "COURT": "CT",
+    "COVE": "CV",
+    "CREEK": "CRK",
+    "CRESCENT": "CRES",
+    "CROSSING": "XING",
+    "DRIVE": "DR",
+    "DRIV": "DR",
+    "DRV": "DR",
+    "ESTATE": "EST",
+    "ESTATES": "ESTS",
+    "EXPRESSWAY": "EXPY",
+    "EXTENSION": "EXT",
+    "FALLS": "FLS",
+    "FERRY": "FRY",
+    "FIELD": "FLD",
+    "FIELDS": "FLDS",
+    "FOREST": "FRST",
+    "FORGE": "FRG",
+    "FORK": "FRK",
+    "FORT": "FT",
+    "FREEWAY": "FWY",
+    "GARDEN": "GDN",
+    "GARDENS": "GDNS",
+    "GATEWAY": "GTWY",
+    "GLEN": "GLN",
+    "GREEN": "GRN",
+    "GROVE": "GRV",
+    "HARBOR": "HBR",
+    "HAVEN": "HVN",
+    "HEIGHTS": "HTS",
+    "HIGHWAY": "HWY",
+    "HIWAY": "HWY",
+    "HIWY": "HWY",
+    "HWAY": "HWY",
+    "HILL": "HL",
+    "HILLS": "HLS",
+    "HOLLOW": "HOLW",
+    "ISLAND": "IS",
+    "JUNCTION": "JCT",
+    "KNOLL": "KNL",
+    "LAKE": "LK",
+    "LAKES": "LKS",
+    "LANDING": "LNDG",
+    "LANE": "LN",
+    "MANOR": "MNR",
+    "MEADOW": "MDW",
+    "MEADOWS": "MDWS",
+    "MILL": "ML",
+    "MOUNT": "MT",
+    "MOUNTAIN": "MTN",
+    "ORCHARD": "ORCH",
+    "PARKWAY": "PKWY",
+    "PARKWY": "PKWY",
+    "PKWAY": "PKWY",
+    "PKY": "PKWY",
+    "PASSAGE": "PSGE",
+    "PINES": "PNES",
+    "PLACE": "PL",
+    "PLAIN": "PLN",
+    "PLAZA": "PLZ",
+    "POINT": "PT",
+    "PORT": "PRT",
+    "PRAIRIE": "PR",
+    "RANCH": "RNCH",
+    "RIDGE": "RDG",
+    "RIVER": "RIV",
+    "ROAD": "RD",
+    "ROUTE": "RTE",
+    "SHORE": "SHR",
+    "SPRING": "SPG",
+    "SPRINGS": "SPGS",
+    "SQUARE": "SQ",
+    "STATION": "STA",
+    "STREET": "ST",
+    "STR": "ST",
+    "STRT": "ST",
+    "SUMMIT": "SMT",
+    "TERRACE": "TER",
+    "TRACE": "TRCE",
+    "TRAIL": "TRL",
+    "TURNPIKE": "TPKE",
+    "VALLEY": "VLY",
+    "VIEW": "VW",
+    "VILLAGE": "VLG",
+    "VISTA": "VIS",
+    "WELLS": "WLS",
+}
+
+UNIT_DESIGNATORS = {
+    "APARTMENT": "APT",
+    "BASEMENT": "BSMT",
+    "BUILDING": "BLDG",
+    "DEPARTMENT": "DEPT",
+    "FLOOR": "FL",
+    "FRONT": "FRNT",
+    "HANGAR": "HNGR",
+    "LOBBY": "LBBY",
+    "LOWER": "LOWR",
+    "OFFICE": "OFC",
+    "PENTHOUSE": "PH",
+    "ROOM": "RM",
+    "SPACE": "SPC",
+    "SUITE": "STE",
+    "TRAILER": "TRLR",
+    "UPPER": "UPPR",
+}
+
+# abbreviations of all words, looked up once per word
+ABBREVIATIONS = dict(STREET_SUFFIXES, **DIRECTIONS, **UNIT_DESIGNATORS)
+
+# abbreviated unit designators, after which "#" is redundant
+_UNIT_WORDS = frozenset(UNIT_DESIGNATORS.values()) | frozenset(["LOT", "UNIT"])
+
+_ZIPCODE = re.compile(r"(\d{5})(?:-?\d{4})?")
+
+
+def normalize_address(address: str):
+    """Returns the canonical form of a street address.
+
+    :param address: Street address, e.g. ``"2114 Bigelow Avenue"``
+    :type address: str
+    :rtype: str
+    """
+    words = [ABBREVIATIONS.get(word, word) for word in _split_words(address)]
+    if "#" in words:
+        words = [
+            word
+            for index, word in enumerate(words)
+            if word != "#" or index == 0 or words[index - 1] not in _UNIT_WORDS
+        ]
+    return " ".join(words)
+
+
+def normalize_zipcode(zipcode: str):
+    """Returns the canonical form of a ZIP code, the first five digits of a
+    ZIP+4 code, or of a city and state, e.g. ``"SEATTLE WA"``.
+
+    :param zipcode: ZIP code or city and state
+    :type zipcode: str
+    :rtype: str
+    """
+    match = _ZIPCODE.fullmatch(zipcode.strip())
+    if match is not None:
+        return match.group(1)
+    return " ".join(_split_words(zipcode))
+
+
+def _split_words(text):
+    """Splits upper-cased text into words, dropping periods and commas and
+    splitting "#5" into "# 5" (chained replaces are several times faster than
+    ``str.translate``)"""
+    text = text.upper().replace(".", "").replace(",", " ").replace(";", " ")
+    return text.replace("#", " # ").split()
@@ -0,0 +1,288 @@
+import asyncio
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+from .pyzillow import (
+    _REQUEST,
+    _SLEEP,
+    _SLOT,
+    BaseZillowWrapper,
+    GetDeepSearchResults,
+    GetUpdatedPropertyDetails,
+)
+from .pyzillowcache import make_cache_key
+from .pyzillowcoalesce import AsyncSingleFlight
+from .pyzillowerrors import ZillowError, ZillowFail, ZillowNoResults, ZillowTimeout
+from .pyzillowjournal import is_transient
+
+
+class AsyncZillowWrapper(BaseZillowWrapper):
+    """This class provides a non-blocking interface into the Zillow API for use
+    with :mod:`asyncio`. It requires `httpx <https://www.python-httpx.org/>`_,
+    which is installed with ``pip install pyzillow[async]``.
+
+    The endpoint methods mirror :class:`pyzillow.pyzillow.ZillowWrapper`, but
+    have to be awaited. They return the same XML objects, which are parsed with
+    :class:`pyzillow.pyzillow.GetDeepSearchResults` and
+    :class:`pyzillow.pyzillow.GetUpdatedPropertyDetails`, and raise the same
+    exceptions from :mod:`pyzillow.pyzillowerrors`. Rate limiting, retries,
+    caching, coalescing, hooks and the ZPID index work as with
+    :class:`pyzillow.pyzillow.ZillowWrapper`, as both share
+    :class:`pyzillow.pyzillow.BaseZillowWrapper`:
+
+    >>> from pyzillow.pyzillowasync import AsyncZillowWrapper
+    >>> async with AsyncZillowWrapper(YOUR_ZILLOW_API_KEY) as zillow_data:
+    ...     deep_search_response = await zillow_data.get_deep_search_results(
+    ...         address, zipcode
+    ...     )
+    >>> result = GetDeepSearchResults(deep_search_response)
+
+    All requests share one connection pool. At most ``max_concurrency``
+    requests are in flight at the same time; further requests wait for a free
+    slot, so thousands of lookups can be scheduled with :func:`asyncio.gather`
+    without exhausting sockets. There are no thread pool based bulk methods;
+    schedule the lookups with :func:`asyncio.gather` instead.
+    """
+
+    _single_flight_class = AsyncSingleFlight
+
+    def __init__(
+        self,
+        api_key: str = None,
+        max_concurrency: int = 20,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        client=None,
+        **kwargs
+    ):
+        """Constructor method
+
+        :param api_key: Zillow Web Service Identifier (ZWSID)
+        :type api_key: str
+        :param max_concurrency: Maximum number of requests in flight, defaults to 20
+        :type max_concurrency: int, optional
+        :param max_connections: Maximum number of open connections, defaults to 20
+        :type max_connections: int, optional
+        :param max_keepalive_connections: Maximum number of idle connections kept
+            open, defaults to 10
+        :type max_keepalive_connections: int, optional
+        :param client: Use an existing client instead of creating one. A client
+            passed in is not closed by :meth:`aclose`.
+        :type client: httpx.AsyncClient, optional
+        :param kwargs: Further options of :class:`pyzillow.pyzillow.ZillowWrapper`,
+            except those of its connection pool
+        """
+        if httpx is None:
+            raise ImportError(
+                "AsyncZillowWrapper requires httpx, install it with "
+                "'pip install pyzillow[async]'"
+            )
+        super().__init__(api_key, **kwargs)
+        self._owns_client = client is None
+        if client is None:
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections,
+                ),
+                timeout=None,  # set per request
+            )
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self._semaphore = None
+
+    def __enter__(self):
+        raise TypeError("use 'async with AsyncZillowWrapper(...)' instead of 'with'")
+
+    def __exit__(self, *args):
+        pass  # pragma: no cover, __enter__ always raises
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+    async def aclose(self):
+        """Closes the connection pool of this instance. Clients passed in by
+        the caller are left open.
+        """
+        if self._owns_client:
+            await self.client.aclose()
+
+    async def get_deep_search_results(
+        self,
+        address: str,
+        zipcode: str,
+        rentzestimate: bool = False,
+        timeout=None,
+        deadline: float = None,
+    ):
+        """Awaitable version of
+        :meth:`pyzillow.pyzillow.ZillowWrapper.get_deep_search_results`
+        """
+        url, params = self._deep_search_query(address, zipcode, rentzestimate)
+        return await self.get_data(url, params, timeout, deadline, GetDeepSearchResults)
+
+    async def get_updated_property_details(
+        self, zpid: str, timeout=None, deadline: float = None
+    ):
+        """Awaitable version of
+        :meth:`pyzillow.pyzillow.ZillowWrapper.get_updated_property_details`
+        """
+        url, params = self._property_details_query(zpid)
+        return await self.get_data(
+            url, params, timeout, deadline, GetUpdatedPropertyDetails
+        )
+
+    async def get_updated_property_details_by_address(
+        self, address: str, zipcode: str, timeout=None, deadline: float = None
+    ):
+        """Awaitable version of
+        :meth:`pyzillow.pyzillow.ZillowWrapper.get_updated_property_details_by_address`
+        """
+        zpid = self._get_indexed_zpid(address, zipcode)
+        if zpid is None:
+            response = await self.get_deep_search_results(
+                address, zipcode, timeout=timeout, deadline=deadline
+            )
+            zpid = GetDeepSearchResults(response, lazy=True).zillow_id
+        return await self.get_updated_property_details(zpid, timeout, deadline)
+
+    async def get_property_record(
+        self,
+        address: str,
+        zipcode: str,
+        rentzestimate: bool = False,
+        typed: bool = False,
+        timeout=None,
+        deadline: float = None,
+    ):
+        """Awaitable version of
+        :meth:`pyzillow.pyzillow.ZillowWrapper.get_property_record`
+        """
+        response = await self.get_deep_search_results(
+            address, zipcode, rentzestimate, timeout, deadline
+        )
+        deep_search_record = GetDeepSearchResults.record_from_xml(response, typed)
+        try:
+            response = await self.get_updated_property_details(
+                deep_search_record.zillow_id, timeout, deadline
+            )
+        except (ZillowError, ZillowNoResults) as error:
+            if is_transient(error):
+                raise
+            response = None
+        return self._merge_property_record(deep_search_record, response, typed)
+
+    async def get_data(
+        self,
+        url: str,
+        params: dict,
+        timeout=None,
+        deadline: float = None,
+        result_class=None,
+    ):
+        """This method requests data from the API endpoint specified in the url argument.
+        It uses parameters from the params argument.
+
+        :param url: URL of API endpoint
+        :type url: str
+        :param params: Parameters for API query
+        :type params: dict
+        :param timeout: Timeout of this call, defaults to the timeout of the instance
+        :type timeout: float or tuple, optional
+        :param deadline: Deadline of this call, defaults to the deadline of the
+            instance
+        :type deadline: float, optional
+        :param result_class: Result class the response is parsed for. With
+            ``stream_parse``, only the XML elements it reads are kept.
+        :type result_class: type, optional
+        :raises ZillowTimeout: The API endpoint did not respond in time or the
+            deadline was exceeded
+        :raises ZillowFail: The API endpoint could not be reached or the request
+            did not return valid XML
+        :raises ZillowError: The API endpoint responded with an error code
+        :raises ZillowNoResults: The request did not return any results
+        :return: Result from API query
+        :rtype: xml.etree.ElementTree.Element
+        """
+        key, response = self._get_cached(url, params, result_class)
+        if response is None:
+            timeout = self.timeout if timeout is None else timeout
+            deadline = self.deadline if deadline is None else deadline
+            if self.single_flight is None:
+                response = await self._fetch(
+                    url, params, timeout, deadline, result_class, key
+                )
+            else:
+                response = await self.single_flight.do(
+                    (key or make_cache_key(url, params), result_class),
+                    lambda: self._fetch(
+                        url, params, timeout, deadline, result_class, key
+                    ),
+                    deadline,
+                )
+        return response
+
+    async def _fetch(self, url, params, timeout, deadline, result_class, key):
+        steps = self._fetch_steps(url, params, timeout, deadline, result_class, key)
+        semaphore = self._get_semaphore()
+        holds_slot = False
+        value = error = None
+        try:
+            while True:
+                try:
+                    step, arg = (
+                        steps.send(value) if error is None else steps.throw(error)
+                    )
+                except StopIteration as stop:
+                    return stop.value
+                value = error = None
+                if holds_slot and step != _REQUEST:
+                    # the attempt failed before its request was sent
+                    semaphore.release()
+                    holds_slot = False
+                if step == _SLEEP:
+                    await asyncio.sleep(arg)
+                elif step == _SLOT:
+                    # the wait for a free slot is not part of the request latency
+                    await semaphore.acquire()
+                    holds_slot = True
+                else:
+                    try:
+                        value = await self._request(url, params, arg)
+                    except ZillowFail as request_error:
+                        error = request_error
+                    finally:
+                        semaphore.release()
+                        holds_slot = False
+        finally:
+            if holds_slot:
+                semaphore.release()
+
+    def _get_semaphore(self):
+        # the semaphore binds to the running event loop, so create it lazily
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _request(self, url, params, timeout):
+        # requests drops parameters set to None, httpx sends them empty
+        query = {key: value for key, value in params.items() if value is not None}
+        if isinstance(timeout, tuple):
+            timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+        try:
+            request = await self.client.get(
+                url, params=query, headers=self.headers, timeout=timeout
+            )
+            request.raise_for_status()
+        except httpx.TimeoutException:
+            raise ZillowTimeout
+        except (httpx.RequestError, httpx.HTTPStatusError):
+            raise ZillowFail
+
+        return request.content
@@ -0,0 +1,338 @@
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+from .pyzillowaddress import normalize_address, normalize_zipcode
+from .pyzillowstats import Counters
+
+# parameters that do not change the response, e.g. the API key
+IGNORED_PARAMS = frozenset(["zws-id"])
+
+# canonical forms of parameter values, so that spellings of an address share a key
+PARAM_NORMALIZERS = {"address": normalize_address, "citystatezip": normalize_zipcode}
+
+
+def get_endpoint_name(url: str):
+    """Returns the name of the endpoint of an API URL, e.g.
+    ``"GetDeepSearchResults"``
+
+    :rtype: str
+    """
+    return url.rstrip("/").rsplit("/", 1)[-1].split(".", 1)[0]
+
+
+def make_cache_key(url: str, params: dict):
+    """Builds the cache key of an API query from the name of the endpoint and the
+    query parameters, e.g.
+    ``GetUpdatedPropertyDetails?zpid=48749425``. Parameters are sorted and
+    whitespace in their values is collapsed, the API key is left out. Addresses
+    and ZIP codes are normalized with :mod:`pyzillow.pyzillowaddress`, so e.g.
+    ``"2114 Bigelow Avenue"`` and ``"2114 BIGELOW AVE"`` share a key.
+
+    :param url: URL of API endpoint
+    :type url: str
+    :param params: Parameters for API query
+    :type params: dict
+    :rtype: str
+    """
+    endpoint = get_endpoint_name(url)
+    query = sorted(
+        (key, _normalize_param(key, value))
+        for key, value in params.items()
+        if key not in IGNORED_PARAMS
+    )
+    return "{}?{}".format(endpoint, urlencode(query))
+
+
+def _normalize_param(key, value):
+    if value is None:
+        return ""
+    normalize = PARAM_NORMALIZERS.get(key)
+    if normalize is not None:
+        return normalize(str(value))
+    return " ".join(str(value).split())
+
+
+class CacheStats(Counters):
+    """Thread-safe counters of a cache: ``hits``, ``misses``, ``evictions``
+    (entries dropped to make room) and ``expirations`` (entries dropped because
+    their TTL had passed).
+    """
+
+    counters = ("hits", "misses", "evictions", "expirations")
+
+    @property
+    def hit_rate(self):
+        """Share of lookups answered from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class BaseCache(object):
+    """Base class for response caches of :class:`pyzillow.pyzillow.ZillowWrapper`.
+
+    The cache stores the bodies of successful API responses under the key built by
+    :func:`make_cache_key`. Backends implement :meth:`_get`, :meth:`_set`
+    and :meth:`clear`.
+
+    Entries expire after ``ttl`` seconds. ``endpoint_ttl`` sets different TTLs
+    for single endpoints, e.g. to keep property details longer than Zestimates:
+    ``endpoint_ttl={"GetUpdatedPropertyDetails": 7 * 86400}``.
+    """
+
+    def __init__(self, ttl: float = 3600, endpoint_ttl: dict = None):
+        """Constructor method
+
+        :param ttl: Time in seconds an entry stays valid, defaults to 3600
+        :type ttl: float, optional
+        :param endpoint_ttl: TTLs by endpoint name, defaults to None
+        :type endpoint_ttl: dict, optional
+        """
+        self.ttl = ttl
+        self.endpoint_ttl = dict(endpoint_ttl or {})
+        self.stats = CacheStats()
+
+    def get_ttl(self, key: str):
+        """Returns the TTL of a key, depending on its endpoint.
+
+        :param key: Cache key
+        :type key: str
+        :rtype: float
+        """
+        return self.endpoint_ttl.get(key.split("?", 1)[0], self.ttl)
+
+    def get(self, key: str):
+        """Returns the cached body for a key, or None if the key is not cached or
+        expired.
+
+        :param key: Cache key
+        :type key: str
+        """
+        value = self._get(key, time.time())
+        self.stats.incr("misses" if value is None else "hits")
+        return value
+
+    def set(self, key: str, value):
+        """Stores a body in the cache.
+
+        :param key: Cache key
+        :type key: str
+        :param value: Body of the API response
+        :type value: bytes
+        """
+        self._set(key, value, time.time() + self.get_ttl(key))
+
+    def _get(self, key, now):
+        raise NotImplementedError
+
+    def _set(self, key, value, expires):
+        raise NotImplementedError
+
+    def clear(self):
+        """Removes all entries from the cache."""
+        raise NotImplementedError
+
+
+class MemoryCache(BaseCache):
+    """In-memory cache that evicts the least recently used entries once it holds
+    more than ``maxsize`` entries or ``max_bytes`` bytes of response bodies. It is
+    shared by all threads using the same instance:
+
+    >>> from pyzillow.pyzillowcache import MemoryCache
+    >>> zillow_data = ZillowWrapper(
+    ...     YOUR_ZILLOW_API_KEY, cache=MemoryCache(maxsize=10000, ttl=86400)
+    ... )
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 3600,
+        max_bytes: int = None,
+        endpoint_ttl: dict = None,
+    ):
+        """Constructor method
+
+        :param maxsize: Maximum number of entries, defaults to 1024
+        :type maxsize: int, optional
+        :param ttl: Time in seconds an entry stays valid, defaults to 3600
+        :type ttl: float, optional
+        :param max_bytes: Maximum total size of the cached bodies, defaults to None
+        :type max_bytes: int, optional
+        :param endpoint_ttl: TTLs by endpoint name, defaults to None
+        :type endpoint_ttl: dict, optional
+        """
+        super().__init__(ttl, endpoint_ttl)
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get(self, key, now):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires <= now:
+                self._remove(key)
+                self.stats.incr("expirations")
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _set(self, key, value, expires):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires, value)
+            self.size += len(value)
+            while len(self._entries) > self.maxsize or (
+                self.max_bytes is not None
+                and self.size > self.max_bytes
+                and len(self._entries) > 1
+            ):
+                self._remove(next(iter(self._entries)))
+                self.stats.incr("evictions")
+
+    def _remove(self, key):
+        self.size -= len(self._entries.pop(key)[1])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+class SQLiteCache(BaseCache):
+    """Disk cache in a SQLite database, which survives restarts and can be shared by
+    several processes on the same machine. Response bodies are stored compressed
+    with zlib. The database runs in WAL mode, so readers do not block each other
+    or the writer; concurrent writers wait for each other up to ``timeout``
+    seconds:
+
+    >>> from pyzillow.pyzillowcache import SQLiteCache
+    >>> cache = SQLiteCache(
+    ...     "zillow-cache.sqlite",
+    ...     ttl=86400,
+    ...     endpoint_ttl={"GetUpdatedPropertyDetails": 7 * 86400},
+    ... )
+    >>> zillow_data = ZillowWrapper(YOUR_ZILLOW_API_KEY, cache=cache)
+
+    Expired entries are ignored, and removed when they are read or by
+    :meth:`purge_expired`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 3600,
+        endpoint_ttl: dict = None,
+        compress_level: int = 6,
+        timeout: float = 30.0,
+    ):
+        """Constructor method
+
+        :param path: Path of the database file, which is created if it does not
+            exist
+        :type path: str
+        :param ttl: Time in seconds an entry stays valid, defaults to 3600
+        :type ttl: float, optional
+        :param endpoint_ttl: TTLs by endpoint name, defaults to None
+        :type endpoint_ttl: dict, optional
+        :param compress_level: zlib compression level (0-9), defaults to 6
+        :type compress_level: int, optional
+        :param timeout: Time in seconds to wait for a locked database,
+            defaults to 30
+        :type timeout: float, optional
+        """
+        super().__init__(ttl, endpoint_ttl)
+        self.path = path
+        self.compress_level = compress_level
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, expires REAL NOT NULL, body BLOB NOT NULL)"
+            )
+
+    def _connect(self):
+        """Returns the connection of the current thread"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # each thread uses its own connection, but close() closes all of
+            # them from the calling thread
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def _get(self, key, now):
+        connection = self._connect()
+        row = connection.execute(
+            "SELECT expires, body FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        expires, body = row
+        if expires <= now:
+            with connection:
+                connection.execute(
+                    "DELETE FROM responses WHERE key = ? AND expires <= ?", (key, now)
+                )
+            self.stats.incr("expirations")
+            return None
+        return zlib.decompress(body)
+
+    def _set(self, key, value, expires):
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        body = zlib.compress(value, self.compress_level)
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (key, expires, body) VALUES (?, ?, ?)",
+                (key, expires, body),
+            )
+
+    def __len__(self):
+        return self._connect().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def purge_expired(self):
+        """Removes all expired entries from the database.
+
+        :return: Number of entries removed
+        :rtype: int
+        """
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "DELETE FROM responses WHERE expires <= ?", (time.time(),)
+            )
+        self.stats.incr("expirations", cursor.rowcount)
+        return cursor.rowcount
+
+    def clear(self):
+        with self._connect() as connection:
+            connection.execute("DELETE FROM responses")
+
+    def close(self):
+        """Closes the database connections of all threads."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
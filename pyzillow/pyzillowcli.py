@@ -0,0 +1,341 @@
+"""Command line interface that looks up the addresses of a CSV or JSON Lines file
+and writes them with the attributes of their deep search results:
+
+.. code-block:: console
+
+    $ pyzillow addresses.csv results.csv --api-key YOUR_ZILLOW_API_KEY --workers 8
+
+Input rows are streamed through a bounded pipeline, so memory use does not depend
+on the size of the file. The progress of the job is saved in a checkpoint file,
+and ``--resume`` continues an interrupted job where it stopped. With
+``--journal``, rows looked up by earlier jobs with the same journal are skipped.
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+from .pyzillow import GetDeepSearchResults, ZillowWrapper
+from .pyzillowcache import SQLiteCache
+from .pyzillowerrors import ZillowError
+from .pyzillowjournal import Journal, get_error_label
+from .pyzillowratelimit import DAILY_LIMIT_EXCEEDED, RateLimiter
+from .pyzillowretry import RetryPolicy
+
+FORMATS = ("csv", "jsonl")
+
+# exit status of a job that stopped before the end of the input
+EXIT_STOPPED = 1
+
+
+def get_format(path: str, fmt: str = None):
+    """Returns the file format given or, by default, the one of the file
+    extension"""
+    if fmt is not None:
+        return fmt
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    return "jsonl" if extension in ("jsonl", "ndjson", "json") else "csv"
+
+
+def read_rows(path: str, fmt: str):
+    """Yields the rows of a CSV file with header or a JSON Lines file as
+    dictionaries"""
+    with open(path, newline="", encoding="utf-8") as input_file:
+        if fmt == "csv":
+            for row in csv.DictReader(input_file):
+                yield row
+        else:
+            for line in input_file:
+                if line.strip():
+                    yield json.loads(line)
+
+
+class Checkpoint(object):
+    """Number of input rows done and size of the output file at that point,
+    saved atomically in a JSON file"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self):
+        """Returns the saved ``(rows, offset)``, or ``(0, 0)`` without a
+        checkpoint"""
+        try:
+            with open(self.path) as checkpoint_file:
+                state = json.load(checkpoint_file)
+        except FileNotFoundError:
+            return 0, 0
+        return state["rows"], state["offset"]
+
+    def save(self, rows: int, offset: int):
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w") as checkpoint_file:
+            json.dump({"rows": rows, "offset": offset}, checkpoint_file)
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+        os.replace(temp_path, self.path)
+
+
+class RowWriter(object):
+    """Writes rows to a CSV or JSON Lines file. The CSV header is taken from the
+    first row."""
+
+    def __init__(self, path: str, fmt: str, offset: int = None):
+        if offset is None:
+            self.file = open(path, "w", newline="", encoding="utf-8")
+        else:
+            # drop rows written after the checkpoint
+            self.file = open(path, "a", newline="", encoding="utf-8")
+            self.file.truncate(offset)
+            self.file.seek(offset)
+        self.fmt = fmt
+        self.writer = None
+
+    def write(self, row: dict):
+        if self.fmt == "jsonl":
+            self.file.write(json.dumps(row) + "\n")
+            return
+        if self.writer is None:
+            self.writer = csv.DictWriter(
+                self.file, fieldnames=list(row), extrasaction="ignore"
+            )
+            if self.file.tell() == 0:
+                self.writer.writeheader()
+        self.writer.writerow(row)
+
+    def flush(self):
+        """Flushes the file to disk and returns its size"""
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+class Progress(object):
+    """Counts the outcomes of a job and formats them as a progress line"""
+
+    def __init__(self, cache=None, stream=None, interval: float = 1.0):
+        self.cache = cache
+        self.stream = stream
+        self.interval = interval
+        self.rows = 0
+        self.errors = Counter()
+        self.start = time.monotonic()
+        self._last = self.start
+
+    def update(self, error_label: str):
+        self.rows += 1
+        if error_label:
+            self.errors[error_label] += 1
+        now = time.monotonic()
+        if self.stream is not None and now - self._last >= self.interval:
+            self._last = now
+            self.stream.write("\r" + self.format_line())
+            self.stream.flush()
+
+    def format_line(self):
+        elapsed = max(time.monotonic() - self.start, 1e-9)
+        errors = sum(self.errors.values())
+        line = "{} rows, {:.1f} rows/s, errors {:.1%}".format(
+            self.rows, self.rows / elapsed, errors / self.rows if self.rows else 0.0
+        )
+        if errors:
+            line += " ({})".format(
+                ", ".join(
+                    "{}: {}".format(label, count)
+                    for label, count in self.errors.most_common()
+                )
+            )
+        if self.cache is not None:
+            line += ", cache hits {:.1%}".format(self.cache.stats.hit_rate)
+        return line
+
+    def finish(self):
+        if self.stream is not None:
+            self.stream.write("\r" + self.format_line() + "\n")
+            self.stream.flush()
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        prog="pyzillow",
+        description="Look up the addresses of a CSV or JSON Lines file with the "
+        "GetDeepSearchResults API and write them with their results.",
+    )
+    parser.add_argument("input", help="CSV file with header or JSON Lines file")
+    parser.add_argument("output", help="CSV or JSON Lines file to write")
+    parser.add_argument(
+        "--api-key",
+        default=os.environ.get("ZILLOW_API_KEY"),
+        help="Zillow Web Service Identifier, defaults to $ZILLOW_API_KEY",
+    )
+    parser.add_argument("--input-format", choices=FORMATS)
+    parser.add_argument("--output-format", choices=FORMATS)
+    parser.add_argument("--address-column", default="address")
+    parser.add_argument("--zipcode-column", default="zipcode")
+    parser.add_argument(
+        "--attributes",
+        help="comma-separated attributes of GetDeepSearchResults to write, "
+        "defaults to all",
+    )
+    parser.add_argument("--rentzestimate", action="store_true")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rate-limit", type=float, help="requests per second")
+    parser.add_argument("--daily-limit", type=int, help="requests per day")
+    parser.add_argument(
+        "--retries", type=int, default=2, help="retries of transient errors"
+    )
+    parser.add_argument("--cache", help="path of a SQLite response cache")
+    parser.add_argument(
+        "--checkpoint",
+        help="path of the checkpoint file, defaults to OUTPUT.checkpoint",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=1000,
+        help="rows between checkpoints, defaults to 1000",
+    )
+    parser.add_argument(
+        "--resume", action="store_true", help="continue from the checkpoint"
+    )
+    parser.add_argument(
+        "--journal",
+        help="path of a journal of rows done, which are skipped by later jobs",
+    )
+    parser.add_argument("--quiet", action="store_true", help="no progress line")
+    return parser
+
+
+def run(args, zillow_data=None, stream=None):
+    """Runs a job with the parsed command line arguments.
+
+    :return: Exit status
+    :rtype: int
+    """
+    stream = sys.stderr if stream is None else stream
+    attributes = list(GetDeepSearchResults.attribute_mapping)
+    if args.attributes:
+        attributes = [attr.strip() for attr in args.attributes.split(",")]
+        unknown = set(attributes) - set(GetDeepSearchResults.attribute_mapping)
+        if unknown:
+            stream.write("Unknown attributes: {}\n".format(", ".join(sorted(unknown))))
+            return 2
+
+    if zillow_data is None:
+        rate_limiter = None
+        if args.rate_limit or args.daily_limit:
+            rate_limiter = RateLimiter(
+                per_second=args.rate_limit, per_day=args.daily_limit
+            )
+        zillow_data = ZillowWrapper(
+            args.api_key,
+            pool_maxsize=args.workers,
+            rate_limiter=rate_limiter,
+            retry=RetryPolicy(max_attempts=args.retries + 1),
+            cache=SQLiteCache(args.cache) if args.cache else None,
+            # duplicate addresses looked up by several workers share one request
+            coalesce=True,
+        )
+
+    checkpoint = Checkpoint(args.checkpoint or args.output + ".checkpoint")
+    done, offset = checkpoint.load() if args.resume else (0, None)
+    input_format = get_format(args.input, args.input_format)
+    output_format = get_format(args.output, args.output_format)
+    input_rows = read_rows(args.input, input_format)
+    rows = itertools.islice(input_rows, done, None)
+    # the columns are checked before any request is sent or output truncated
+    first_row = next(rows, None)
+    if first_row is not None:
+        columns = (args.address_column, args.zipcode_column)
+        missing = [column for column in columns if column not in first_row]
+        if missing:
+            input_rows.close()
+            stream.write("Missing input columns: {}\n".format(", ".join(missing)))
+            return 2
+        rows = itertools.chain([first_row], rows)
+    writer = RowWriter(args.output, output_format, offset)
+    progress = Progress(zillow_data.cache, None if args.quiet else stream)
+    # committed only after the output, so that no row is done but not written
+    journal = Journal(args.journal, commit_every=None) if args.journal else None
+    start = done
+
+    def get_key(row):
+        return (row.get(args.address_column), row.get(args.zipcode_column))
+
+    def save_checkpoint():
+        checkpoint.save(done, writer.flush())
+        if journal is not None:
+            journal.commit()
+
+    def lookup(row):
+        address, zipcode = get_key(row)
+        # rows without a value get the error Zillow would answer, without a request
+        if not address:
+            raise ZillowError(500)
+        if not zipcode:
+            raise ZillowError(501)
+        response = zillow_data.get_deep_search_results(
+            address, zipcode, args.rentzestimate
+        )
+        return GetDeepSearchResults.record_from_xml(response)
+
+    status = 0
+    with zillow_data:
+        skip = None
+        if journal is not None:
+            skip = lambda row: get_key(row) in journal  # noqa: E731
+        outcomes = zillow_data.map_bulk(lookup, rows, args.workers, skip=skip)
+        try:
+            for outcome in outcomes:
+                if (
+                    isinstance(outcome.error, ZillowError)
+                    and int(outcome.error.status) == DAILY_LIMIT_EXCEEDED
+                ):
+                    # the row is looked up again when the job is resumed
+                    stream.write("\nDaily request limit exceeded, stopping.\n")
+                    status = EXIT_STOPPED
+                    break
+
+                row = dict(outcome.item)
+                row["error"] = get_error_label(outcome.error)
+                record = outcome.response
+                for attr in attributes:
+                    row[attr] = None if record is None else getattr(record, attr)
+                writer.write(row)
+                progress.update(row["error"])
+                if journal is not None:
+                    journal.record(get_key(outcome.item), outcome.error)
+                done = start + outcome.index + 1
+                if progress.rows % args.checkpoint_every == 0:
+                    save_checkpoint()
+        except KeyboardInterrupt:
+            stream.write("\nInterrupted, stopping.\n")
+            status = EXIT_STOPPED
+        finally:
+            outcomes.close()
+            save_checkpoint()
+            writer.close()
+            if journal is not None:
+                journal.close()
+            progress.finish()
+    return status
+
+
+def main(argv=None):
+    """Entry point of the ``pyzillow`` command"""
+    args = get_parser().parse_args(argv)
+    if not args.api_key:
+        get_parser().error("an API key is required (--api-key or $ZILLOW_API_KEY)")
+    return run(args)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
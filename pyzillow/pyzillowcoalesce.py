@@ -0,0 +1,131 @@
+import asyncio
+import copy
+import threading
+
+from .pyzillowerrors import ZillowTimeout
+
+
+class _Call(object):
+    """A call in flight and, once it is done, its result or exception"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """Coalesces concurrent identical calls of
+    :class:`pyzillow.pyzillow.ZillowWrapper` ("single flight"): while a call for
+    a key is in flight, further calls for the same key wait for it and share its
+    result or exception instead of sending their own request.
+
+    The wrapper uses the cache key of the query (see
+    :func:`pyzillow.pyzillowcache.make_cache_key`) and the result class, so calls
+    differing only in whitespace or the API key are coalesced. Calls that start
+    after the first one has finished send a new request; use a cache to answer
+    them.
+
+    ``calls`` counts the calls that were executed, ``coalesced`` the calls that
+    shared the result of a call in flight. Each waiter raises its own copy of
+    the exception of the call, whose ``__cause__`` is the original exception.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.reset()
+
+    def reset(self):
+        """Sets all counters to zero."""
+        with self._lock:
+            self.calls = 0
+            self.coalesced = 0
+
+    def __len__(self):
+        """Number of calls in flight"""
+        return len(self._calls)
+
+    def do(self, key, func, timeout: float = None):
+        """Returns the result of ``func()``, or of the call in flight for the
+        same key.
+
+        :param key: Key of the call, which must be hashable
+        :param func: Function without arguments that executes the call
+        :type func: callable
+        :param timeout: Time in seconds to wait for a call in flight, defaults
+            to None (no limit)
+        :type timeout: float, optional
+        :raises ZillowTimeout: The call in flight did not finish in time
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            if not call.done.wait(timeout):
+                raise ZillowTimeout
+            if call.error is not None:
+                # raising the shared exception from several threads would
+                # append all their frames to its traceback
+                raise copy.copy(call.error) from call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class AsyncSingleFlight(SingleFlight):
+    """:class:`SingleFlight` for coroutines of
+    :class:`pyzillow.pyzillowasync.AsyncZillowWrapper`. All calls must run on
+    the same event loop.
+    """
+
+    async def do(self, key, func, timeout: float = None):
+        """Returns the result of ``await func()``, or of the call in flight for
+        the same key. The call runs as a task of its own, so cancelling any of
+        its callers, the first one included, does not cancel it for the others.
+
+        :param key: Key of the call, which must be hashable
+        :param func: Coroutine function without arguments that executes the call
+        :type func: callable
+        :param timeout: Time in seconds to wait for a call in flight, defaults
+            to None (no limit)
+        :type timeout: float, optional
+        :raises ZillowTimeout: The call in flight did not finish in time
+        """
+        task = self._calls.get(key)
+        if task is None:
+            self.calls += 1
+            task = self._calls[key] = asyncio.ensure_future(func())
+            task.add_done_callback(lambda task: self._forget(key, task))
+            # shielded, so that a cancelled caller does not cancel the call
+            return await asyncio.shield(task)
+
+        self.coalesced += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            raise ZillowTimeout
+        except Exception as error:
+            raise copy.copy(error) from error
+
+    def _forget(self, key, task):
+        del self._calls[key]
+        if not task.cancelled():
+            # retrieved, so that a call all callers gave up on is not logged
+            task.exception()
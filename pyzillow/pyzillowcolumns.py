@@ -0,0 +1,357 @@
+from array import array
+from datetime import date
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+try:
+    import pandas
+except ImportError:  # pragma: no cover
+    pandas = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+from .pyzillow import GetDeepSearchResults
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _require(module, name):
+    if module is None:
+        raise ImportError(
+            "{} is required for this export: pip install pyzillow[columnar]".format(
+                name
+            )
+        )
+
+
+class _IntColumn(object):
+    kind = "int"
+    # buffers that exports can share
+    buffers = ("values", "valid")
+
+    def __init__(self):
+        self.values = array("q")
+        # 1 for valid entries, 0 for missing ones
+        self.valid = bytearray()
+
+    def __len__(self):
+        return len(self.values)
+
+    def append(self, value):
+        self.values.append(0 if value is None else self._encode(value))
+        self.valid.append(value is not None)
+
+    def _encode(self, value):
+        return value
+
+    def _numpy_values(self):
+        return numpy.frombuffer(self.values, dtype=numpy.int64)
+
+    def _numpy_missing(self):
+        return ~numpy.frombuffer(self.valid, dtype=numpy.bool_)
+
+    def to_numpy(self):
+        return numpy.ma.MaskedArray(self._numpy_values(), mask=self._numpy_missing())
+
+    def to_arrow(self):
+        return pyarrow.array(self._numpy_values(), mask=self._numpy_missing())
+
+    def to_pandas(self):
+        return pandas.arrays.IntegerArray(self._numpy_values(), self._numpy_missing())
+
+
+class _DateColumn(_IntColumn):
+    """Dates as days since 1970-01-01"""
+
+    kind = "date"
+
+    def __init__(self):
+        self.values = array("i")
+        self.valid = bytearray()
+
+    def _encode(self, value):
+        return value.toordinal() - EPOCH_ORDINAL
+
+    def _numpy_values(self):
+        return numpy.frombuffer(self.values, dtype=numpy.int32)
+
+    def to_numpy(self):
+        return numpy.ma.MaskedArray(
+            self._numpy_values().astype("datetime64[D]"), mask=self._numpy_missing()
+        )
+
+    def to_arrow(self):
+        return pyarrow.array(
+            self._numpy_values(), type=pyarrow.date32(), mask=self._numpy_missing()
+        )
+
+    def to_pandas(self):
+        values = self._numpy_values().astype("datetime64[D]")
+        values[self._numpy_missing()] = numpy.datetime64("NaT")
+        return values
+
+
+class _FloatColumn(object):
+    """Floats, with NaN for missing entries"""
+
+    kind = "float"
+    buffers = ("values",)
+
+    def __init__(self):
+        self.values = array("d")
+
+    def __len__(self):
+        return len(self.values)
+
+    def append(self, value):
+        self.values.append(float("nan") if value is None else value)
+
+    def to_numpy(self):
+        return numpy.frombuffer(self.values, dtype=numpy.float64)
+
+    def to_arrow(self):
+        return pyarrow.array(self.to_numpy(), from_pandas=True)
+
+    to_pandas = to_numpy
+
+
+class _CategoryColumn(object):
+    """Dictionary-encoded strings, with -1 for missing entries"""
+
+    kind = "category"
+    buffers = ("codes",)
+
+    def __init__(self):
+        self.codes = array("i")
+        self.categories = []
+        self._index = {}
+
+    def __len__(self):
+        return len(self.codes)
+
+    def append(self, value):
+        if value is None:
+            self.codes.append(-1)
+            return
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.categories)
+            self.categories.append(value)
+        self.codes.append(code)
+
+    def _numpy_codes(self):
+        return numpy.frombuffer(self.codes, dtype=numpy.int32)
+
+    def to_numpy(self):
+        values = numpy.array(self.categories + [None], dtype=object)
+        return values[self._numpy_codes()]
+
+    def to_arrow(self):
+        codes = self._numpy_codes()
+        return pyarrow.DictionaryArray.from_arrays(
+            pyarrow.array(codes, mask=codes < 0),
+            pyarrow.array(self.categories, type=pyarrow.string()),
+        )
+
+    def to_pandas(self):
+        return pandas.Categorical.from_codes(self._numpy_codes(), self.categories)
+
+
+class _ObjectColumn(object):
+    kind = "object"
+    buffers = ()
+
+    def __init__(self):
+        self.values = []
+
+    def __len__(self):
+        return len(self.values)
+
+    def append(self, value):
+        self.values.append(value)
+
+    def to_numpy(self):
+        values = numpy.empty(len(self.values), dtype=object)
+        values[:] = self.values
+        return values
+
+    def to_arrow(self):
+        return pyarrow.array(self.values)
+
+    to_pandas = to_numpy
+
+
+_TYPE_COLUMNS = {int: _IntColumn, float: _FloatColumn, date: _DateColumn}
+
+
+class ColumnCollector(object):
+    """Collects the attributes of many results into columns instead of result
+    objects:
+
+    >>> from pyzillow.pyzillowcolumns import ColumnCollector
+    >>> collector = ColumnCollector(GetDeepSearchResults)
+    >>> for item in zillow_data.get_deep_search_results_bulk(addresses):
+    ...     if item.error is None:
+    ...         collector.add(item.response)
+    >>> df = collector.to_pandas()
+
+    There is one column per attribute of ``attribute_mapping``, or of
+    ``attributes`` if given. Values are converted according to the
+    ``attribute_types`` of the result class and appended to compact buffers:
+    ``int`` and ``datetime.date`` attributes to 64 and 32 bit integer arrays with
+    a validity mask, ``float`` attributes to double arrays with NaN for missing
+    values. The ``categorical_attributes`` of the result class, e.g. ``state``
+    and ``home_type``, are dictionary-encoded. Other attributes are kept as
+    Python objects.
+
+    The columns can be exported as NumPy arrays, an Arrow table, a pandas
+    DataFrame or written to Parquet and Arrow IPC files, which requires
+    ``pip install pyzillow[columnar]``. Exports share the numeric buffers with
+    the collector without copying them. Results added after an export are
+    appended to copies of the buffers, so the exported arrays keep their
+    values.
+    """
+
+    def __init__(self, result_class=GetDeepSearchResults, attributes=None):
+        """Constructor method
+
+        :param result_class: Result class of the responses, defaults to
+            :class:`pyzillow.pyzillow.GetDeepSearchResults`
+        :type result_class: type, optional
+        :param attributes: Names of the attributes to collect, defaults to None
+            (all attributes)
+        :type attributes: list, optional
+        """
+        self.result_class = result_class
+        if attributes is None:
+            attributes = list(result_class.attribute_mapping)
+        unknown = set(attributes) - set(result_class.attribute_mapping)
+        if unknown:
+            raise ValueError(
+                "Unknown attributes: {}".format(", ".join(sorted(unknown)))
+            )
+        self.columns = {}
+        for attr in attributes:
+            attr_type = result_class.attribute_types.get(attr)
+            if attr_type in _TYPE_COLUMNS:
+                column = _TYPE_COLUMNS[attr_type]()
+            elif attr_type is None and attr in result_class.categorical_attributes:
+                column = _CategoryColumn()
+            else:
+                column = _ObjectColumn()
+            self.columns[attr] = column
+        self._count = 0
+        self._exported = False
+
+    def __len__(self):
+        return self._count
+
+    def add(self, data):
+        """Adds the result of an API response.
+
+        :param data: Result from the API endpoint of the result class
+        :type data: xml.etree.ElementTree.Element
+        """
+        result_class = self.result_class
+        values = result_class._extractor(data.findall(result_class.data_path)[0])
+        self._append(result_class._convert(values))
+
+    def add_record(self, record):
+        """Adds a record of the result class, see
+        :meth:`pyzillow.pyzillow.ZillowResults.record_from_xml`.
+
+        :param record: Typed or untyped record
+        :type record: tuple
+        """
+        values = {
+            attr: value
+            for attr, value in record._asdict().items()
+            if attr in self.columns
+        }
+        for attr, value in values.items():
+            if isinstance(value, str):
+                values[attr] = self.result_class._convert_value(attr, value)
+        self._append(values)
+
+    def extend(self, responses):
+        """Adds the results of several API responses.
+
+        :param responses: Results from the API endpoint of the result class
+        :type responses: iterable
+        """
+        for data in responses:
+            self.add(data)
+
+    def _append(self, values):
+        if self._exported:
+            # exported buffers cannot be resized while NumPy or Arrow use them
+            for column in self.columns.values():
+                for name in column.buffers:
+                    setattr(column, name, getattr(column, name)[:])
+            self._exported = False
+        for attr, column in self.columns.items():
+            column.append(values[attr])
+        self._count += 1
+
+    def to_numpy(self):
+        """Returns the columns as NumPy arrays. Integer and date columns are masked
+        arrays, dictionary-encoded and object columns are object arrays.
+
+        :rtype: dict
+        """
+        _require(numpy, "numpy")
+        self._exported = True
+        return {attr: column.to_numpy() for attr, column in self.columns.items()}
+
+    def to_arrow(self):
+        """Returns the columns as an Arrow table.
+
+        :rtype: pyarrow.Table
+        """
+        _require(pyarrow, "pyarrow")
+        _require(numpy, "numpy")
+        self._exported = True
+        return pyarrow.table(
+            {attr: column.to_arrow() for attr, column in self.columns.items()}
+        )
+
+    def to_pandas(self):
+        """Returns the columns as a pandas DataFrame, with nullable integer,
+        categorical and datetime columns.
+
+        :rtype: pandas.DataFrame
+        """
+        _require(pandas, "pandas")
+        self._exported = True
+        return pandas.DataFrame(
+            {attr: column.to_pandas() for attr, column in self.columns.items()},
+            copy=False,
+        )
+
+    def write_parquet(self, path: str, **kwargs):
+        """Writes the columns to a Parquet file.
+
+        :param path: Path of the file
+        :type path: str
+        :param kwargs: Options of :func:`pyarrow.parquet.write_table`, e.g.
+            ``compression``
+        """
+        _require(pyarrow, "pyarrow")
+        pyarrow.parquet.write_table(self.to_arrow(), path, **kwargs)
+
+    def write_ipc(self, path: str):
+        """Writes the columns to an Arrow IPC (Feather v2) file.
+
+        :param path: Path of the file
+        :type path: str
+        """
+        table = self.to_arrow()
+        with pyarrow.ipc.new_file(path, table.schema) as writer:
+            writer.write_table(table)
@@ -116,6 +116,15 @@ class ZillowFail(Exception):
         Exception.__init__(self)
 
 
+class ZillowTimeout(ZillowFail):
+    """A ZillowTimeout exception is raised if the API endpoint did not respond in time
+       or the deadline of the request was exceeded.
+    """
+
+    def __init__(self):
+        ZillowFail.__init__(self)
+
+
 class ZillowNoResults(Exception):
     """A ZillowNoResults exception is raised if the request did not return any results.
     """
@@ -0,0 +1,186 @@
+import math
+import random
+import threading
+from collections import Counter, defaultdict
+
+# stages timed by LatencyStats
+STAGES = ("request", "parse", "extract")
+
+
+class Hooks(object):
+    """Base class for instrumentation hooks of
+    :class:`pyzillow.pyzillow.ZillowWrapper` and the result classes. Subclasses
+    override the events they need; all methods are called with keyword
+    arguments:
+
+    >>> from pyzillow.pyzillowhooks import Hooks
+    >>> class SlowRequests(Hooks):
+    ...     def after_response(self, endpoint, params, attempt, seconds, size):
+    ...         if seconds > 1:
+    ...             print(endpoint, params.get("zpid"), seconds)
+    >>> zillow_data = ZillowWrapper(YOUR_ZILLOW_API_KEY, hooks=SlowRequests())
+
+    ``endpoint`` is the name of the API endpoint, e.g. ``"GetDeepSearchResults"``,
+    and ``attempt`` the number of the attempt of a call, starting at 1. Hooks are
+    called in the thread (or event loop) of the request and must be
+    thread-safe if the wrapper is shared by several threads. Exceptions raised by
+    hooks are not caught.
+    """
+
+    def before_request(self, endpoint, params, attempt):
+        """Called before a request is sent."""
+
+    def after_response(self, endpoint, params, attempt, seconds, size):
+        """Called when the response of a request has arrived. ``seconds`` is the
+        time since the request was sent, and ``size`` the length of the body in
+        bytes. Waits for the rate limiter or, with
+        :class:`pyzillow.pyzillowasync.AsyncZillowWrapper`, for a free request
+        slot happen before :meth:`before_request` and are not included. With
+        ``stream_parse``, the body is downloaded while it is parsed; ``seconds``
+        then only covers the response headers and ``size`` is None.
+        """
+
+    def after_parse(self, endpoint, params, attempt, seconds):
+        """Called when a response has been parsed and checked for errors, with
+        the time taken."""
+
+    def on_error(self, endpoint, params, attempt, error, code):
+        """Called when an attempt failed. ``error`` is the exception raised and
+        ``code`` the Zillow error code of a
+        :class:`pyzillow.pyzillowerrors.ZillowError`, or None."""
+
+    def after_extract(self, endpoint, seconds):
+        """Called by a result class when it has extracted its attributes, with
+        the time taken. ``endpoint`` is the name of the result class, which is
+        the name of its endpoint."""
+
+
+def as_hook_list(hooks):
+    """Returns a tuple of hooks from None, one :class:`Hooks` object or an
+    iterable of them"""
+    if hooks is None:
+        return ()
+    if isinstance(hooks, Hooks):
+        return (hooks,)
+    return tuple(hooks)
+
+
+def emit(hooks, event, **values):
+    """Calls the method ``event`` of all hooks"""
+    for hook in hooks:
+        getattr(hook, event)(**values)
+
+
+def get_error_code(error):
+    """Returns the Zillow error code of an exception, or None"""
+    status = getattr(error, "status", None)
+    return None if status is None else int(status)
+
+
+class LatencyStats(Hooks):
+    """Hooks that collect the latencies of requests, parsing and attribute
+    extraction per endpoint and report their percentiles:
+
+    >>> from pyzillow.pyzillowhooks import LatencyStats
+    >>> stats = LatencyStats()
+    >>> zillow_data = ZillowWrapper(YOUR_ZILLOW_API_KEY, hooks=stats)
+    >>> result = GetDeepSearchResults(
+    ...     zillow_data.get_deep_search_results(address, zipcode), hooks=stats
+    ... )
+    >>> stats.report()["GetDeepSearchResults"]["request"]
+    {'count': 1, 'p50': 0.182, 'p95': 0.182, 'p99': 0.182}
+
+    Each stage keeps a uniform random sample of at most ``max_samples``
+    latencies (reservoir sampling), so memory use is bounded in long-running
+    processes while ``count`` counts all of them. ``bytes`` counts the bytes
+    received per endpoint and ``errors`` the failed attempts per endpoint and
+    error code, e.g. ``{("GetDeepSearchResults", 508): 3}``, with ``None`` for
+    errors without a code.
+    """
+
+    def __init__(self, max_samples: int = 10000):
+        """Constructor method
+
+        :param max_samples: Maximum number of latencies kept per endpoint and
+            stage, defaults to 10000
+        :type max_samples: int, optional
+        """
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._random = random.Random()
+        self.reset()
+
+    def reset(self):
+        """Drops all samples and sets all counters to zero."""
+        with self._lock:
+            self._samples = defaultdict(list)
+            self._counts = Counter()
+            self.bytes = Counter()
+            self.errors = Counter()
+
+    def after_response(self, endpoint, params, attempt, seconds, size):
+        self._add(endpoint, "request", seconds)
+        if size is not None:
+            with self._lock:
+                self.bytes[endpoint] += size
+
+    def after_parse(self, endpoint, params, attempt, seconds):
+        self._add(endpoint, "parse", seconds)
+
+    def on_error(self, endpoint, params, attempt, error, code):
+        with self._lock:
+            self.errors[(endpoint, code)] += 1
+
+    def after_extract(self, endpoint, seconds):
+        self._add(endpoint, "extract", seconds)
+
+    def _add(self, endpoint, stage, seconds):
+        key = (endpoint, stage)
+        with self._lock:
+            self._counts[key] += 1
+            samples = self._samples[key]
+            if len(samples) < self.max_samples:
+                samples.append(seconds)
+            else:
+                index = self._random.randrange(self._counts[key])
+                if index < self.max_samples:
+                    samples[index] = seconds
+
+    def percentiles(self, endpoint: str, stage: str, percents=(50, 95, 99)):
+        """Returns percentiles of the latencies of a stage in seconds, e.g.
+        ``{"p50": 0.18, "p95": 0.41, "p99": 0.93}``, or None without samples.
+
+        :param endpoint: Name of the endpoint, e.g. ``"GetDeepSearchResults"``
+        :type endpoint: str
+        :param stage: ``"request"``, ``"parse"`` or ``"extract"``
+        :type stage: str
+        :param percents: Percentiles to return, defaults to (50, 95, 99)
+        :type percents: tuple, optional
+        :rtype: dict
+        """
+        with self._lock:
+            samples = sorted(self._samples.get((endpoint, stage), ()))
+        if not samples:
+            return None
+        return {
+            "p{}".format(percent): samples[
+                max(0, math.ceil(percent / 100 * len(samples)) - 1)
+            ]
+            for percent in percents
+        }
+
+    def report(self):
+        """Returns the number of latencies and their p50, p95 and p99 per
+        endpoint and stage.
+
+        :rtype: dict
+        """
+        with self._lock:
+            keys = sorted(self._samples)
+            counts = dict(self._counts)
+        report = {}
+        for endpoint, stage in keys:
+            summary = {"count": counts[(endpoint, stage)]}
+            summary.update(self.percentiles(endpoint, stage))
+            report.setdefault(endpoint, {})[stage] = summary
+        return report
@@ -0,0 +1,155 @@
+import sqlite3
+import threading
+
+from .pyzillowaddress import normalize_address, normalize_zipcode
+
+
+def make_index_key(address: str, zipcode: str):
+    """Returns the key of an address in a :class:`ZpidIndex`, built from the
+    canonical forms of the address and the ZIP code (or city and state), e.g.
+    ``"2114 BIGELOW AVE N|98109"``.
+
+    :rtype: str
+    """
+    return "{}|{}".format(normalize_address(address), normalize_zipcode(zipcode or ""))
+
+
+class ZpidIndex(object):
+    """Persistent index of the Zillow Property IDs (ZPIDs) of addresses, stored in a
+    SQLite database.
+
+    Pass the index to :class:`pyzillow.pyzillow.ZillowWrapper` to fill it from
+    every GetDeepSearchResults response received from the API; responses from
+    its cache are not added again. Then
+    :meth:`pyzillow.pyzillow.ZillowWrapper.get_updated_property_details_by_address`
+    requests the details of a known address directly, without a deep search
+    first:
+
+    >>> from pyzillow.pyzillowindex import ZpidIndex
+    >>> zillow_data = ZillowWrapper(
+    ...     YOUR_ZILLOW_API_KEY, zpid_index=ZpidIndex("zpids.sqlite")
+    ... )
+    >>> details_response = zillow_data.get_updated_property_details_by_address(
+    ...     address, zipcode
+    ... )
+
+    Addresses are looked up by their canonical form (see
+    :func:`make_index_key`), so different spellings of an address share an entry.
+    A response adds the address of the query, if it matched a single property,
+    and the address Zillow returned for each property. Use ``":memory:"`` as path
+    for an index that is not kept.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        """Constructor method
+
+        :param path: Path of the database file, which is created if it does not
+            exist
+        :type path: str
+        :param timeout: Time in seconds to wait for a locked database,
+            defaults to 30
+        :type timeout: float, optional
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=timeout, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS zpids "
+                "(key TEXT PRIMARY KEY, zpid TEXT NOT NULL) WITHOUT ROWID"
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM zpids").fetchone()[0]
+
+    def get(self, address: str, zipcode: str):
+        """Returns the ZPID of an address, or None if it is not known.
+
+        :param address: Street address
+        :type address: str
+        :param zipcode: ZIP code or city and state
+        :type zipcode: str
+        :rtype: str
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT zpid FROM zpids WHERE key = ?",
+                (make_index_key(address, zipcode),),
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def set(self, address: str, zipcode: str, zpid: str):
+        """Stores the ZPID of an address.
+
+        :param address: Street address
+        :type address: str
+        :param zipcode: ZIP code or city and state
+        :type zipcode: str
+        :param zpid: Zillow Property ID
+        :type zpid: str
+        """
+        self.update([(address, zipcode, zpid)])
+
+    def update(self, entries):
+        """Stores the ZPIDs of several addresses in one transaction.
+
+        :param entries: ``(address, zipcode, zpid)`` tuples
+        :type entries: iterable
+        """
+        rows = [
+            (make_index_key(address, zipcode), str(zpid))
+            for address, zipcode, zpid in entries
+        ]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO zpids (key, zpid) VALUES (?, ?)", rows
+            )
+
+    def discard(self, address: str, zipcode: str):
+        """Removes an address, e.g. after its ZPID was rejected by the API."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM zpids WHERE key = ?", (make_index_key(address, zipcode),)
+            )
+
+    def add_response(self, address: str, zipcode: str, response):
+        """Adds the ZPIDs of a GetDeepSearchResults response.
+
+        :param address: Street address of the query
+        :type address: str
+        :param zipcode: ZIP code or city and state of the query
+        :type zipcode: str
+        :param response: Result from the GetDeepSearchResults API endpoint
+        :type response: xml.etree.ElementTree.Element
+        :return: Number of entries stored
+        :rtype: int
+        """
+        entries = []
+        results = response.findall("response/results/result")
+        for result in results:
+            zpid = result.findtext("zpid")
+            street = result.findtext("address/street")
+            if not zpid:
+                continue
+            if street:
+                entries.append((street, result.findtext("address/zipcode"), zpid))
+            if len(results) == 1:
+                entries.append((address, zipcode, zpid))
+        self.update(entries)
+        return len(entries)
+
+    def close(self):
+        """Closes the database."""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,174 @@
+import sqlite3
+import threading
+from collections import Counter
+from hashlib import blake2b
+
+from .pyzillowerrors import ZillowError, ZillowFail, ZillowNoResults, ZillowTimeout
+from .pyzillowratelimit import DAILY_LIMIT_EXCEEDED
+
+# Zillow error codes that may succeed when the lookup is repeated
+TRANSIENT_CODES = frozenset([1, 3, 4, DAILY_LIMIT_EXCEEDED])
+
+
+def make_journal_key(item):
+    """Returns the journal key of an input item, e.g. an ``(address, zipcode)``
+    tuple: a 64 bit hash of its parts with whitespace collapsed.
+
+    :rtype: int
+    """
+    parts = item if isinstance(item, (tuple, list)) else (item,)
+    text = "\x1f".join(" ".join(str(part).split()) for part in parts)
+    digest = blake2b(text.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def get_error_label(error):
+    """Returns a short label of the error of a lookup, e.g. ``"508"``, or an
+    empty string for a successful lookup.
+
+    :rtype: str
+    """
+    if error is None:
+        return ""
+    if isinstance(error, ZillowError):
+        return str(error.status)
+    if isinstance(error, ZillowNoResults):
+        return "no_results"
+    if isinstance(error, ZillowTimeout):
+        return "timeout"
+    return "fail"
+
+
+def is_transient(error):
+    """Checks whether a lookup failed for a reason that may go away, e.g. a
+    network error or an exceeded daily limit.
+
+    :rtype: bool
+    """
+    if isinstance(error, ZillowError):
+        return int(error.status) in TRANSIENT_CODES
+    return isinstance(error, ZillowFail)
+
+
+class Journal(object):
+    """Append-only journal of the items of a batch job that are done, stored in a
+    SQLite database, so that a rerun of an interrupted job skips them:
+
+    >>> from pyzillow.pyzillowjournal import Journal
+    >>> with Journal("lookups.journal") as journal:
+    ...     for outcome in zillow_data.get_deep_search_results_bulk(
+    ...         addresses, journal=journal
+    ...     ):
+    ...         ...
+
+    An item is done when its lookup succeeded or failed permanently, e.g. with
+    Zillow error 508 or no results. Lookups that failed for a transient reason
+    (see :func:`is_transient`) are not recorded and are repeated by the next run.
+
+    Each item is stored as a 64 bit hash of its parts and a short outcome label,
+    about 20 bytes on disk, and looked up by its primary key, so membership checks
+    stay fast with millions of items. Records are committed every
+    ``commit_every`` items, by :meth:`commit` and when the journal is closed.
+    """
+
+    def __init__(self, path: str, commit_every: int = 100, timeout: float = 30.0):
+        """Constructor method
+
+        :param path: Path of the database file, which is created if it does not
+            exist
+        :type path: str
+        :param commit_every: Number of records per transaction, defaults to 100.
+            With None, records are only committed by :meth:`commit`.
+        :type commit_every: int, optional
+        :param timeout: Time in seconds to wait for a locked database,
+            defaults to 30
+        :type timeout: float, optional
+        """
+        self.path = path
+        self.commit_every = commit_every
+        self._lock = threading.Lock()
+        self._uncommitted = 0
+        self._connection = sqlite3.connect(
+            path, timeout=timeout, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS done "
+                "(key INTEGER PRIMARY KEY, outcome TEXT NOT NULL)"
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __contains__(self, item):
+        return self.get(item) is not None
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM done").fetchone()[0]
+
+    def get(self, item):
+        """Returns the outcome label of a done item, or None.
+
+        :param item: Input item, e.g. an ``(address, zipcode)`` tuple
+        :rtype: str
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT outcome FROM done WHERE key = ?", (make_journal_key(item),)
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def record(self, item, error=None):
+        """Records the outcome of a lookup, unless it failed for a transient
+        reason.
+
+        :param item: Input item, e.g. an ``(address, zipcode)`` tuple
+        :param error: Exception raised by the lookup, defaults to None (success)
+        :type error: Exception, optional
+        :return: Whether the item was recorded as done
+        :rtype: bool
+        """
+        if is_transient(error):
+            return False
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO done (key, outcome) VALUES (?, ?)",
+                (make_journal_key(item), get_error_label(error)),
+            )
+            self._uncommitted += 1
+            if self.commit_every is not None and self._uncommitted >= self.commit_every:
+                self._commit()
+        return True
+
+    def counts(self):
+        """Returns the number of done items by outcome label, with ``""`` for
+        successful lookups.
+
+        :rtype: collections.Counter
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT outcome, COUNT(*) FROM done GROUP BY outcome"
+            ).fetchall()
+        return Counter(dict(rows))
+
+    def _commit(self):
+        self._connection.commit()
+        self._uncommitted = 0
+
+    def commit(self):
+        """Commits all records to disk."""
+        with self._lock:
+            self._commit()
+
+    def close(self):
+        """Commits all records and closes the database."""
+        with self._lock:
+            self._commit()
+            self._connection.close()
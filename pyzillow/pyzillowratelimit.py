@@ -0,0 +1,172 @@
+import os
+import struct
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+from .pyzillowerrors import ZillowError, ZillowTimeout
+
+SECONDS_PER_DAY = 86400
+
+# Zillow error code for "Too many requests. Daily requests exceeded."
+DAILY_LIMIT_EXCEEDED = 7
+
+
+class BaseRateLimiter(object):
+    """Base class for rate limiters of :class:`pyzillow.pyzillow.ZillowWrapper`.
+
+    A rate limiter combines a token bucket, which allows ``per_second`` requests
+    on average with bursts of up to ``burst`` requests, with a budget of
+    ``per_day`` requests per UTC day. Either limit can be disabled by setting it
+    to ``None``.
+
+    Subclasses store the state of the limiter and implement :meth:`_update`.
+    """
+
+    def __init__(self, per_second: float = None, per_day: int = None, burst=None):
+        """Constructor method
+
+        :param per_second: Average number of requests per second, defaults to None
+        :type per_second: float, optional
+        :param per_day: Number of requests per UTC day, defaults to None
+        :type per_day: int, optional
+        :param burst: Number of requests that can be sent at once after an idle
+            period, defaults to ``per_second`` (at least 1)
+        :type burst: float, optional
+        """
+        self.per_second = per_second
+        self.per_day = per_day
+        if burst is None and per_second is not None:
+            burst = max(1.0, float(per_second))
+        self.burst = burst
+
+    def _update(self, func):
+        """Applies ``func`` to the state of the limiter atomically and returns its
+        result. The state is a tuple ``(tokens, last, day, count)``, or ``None``
+        before the first request.
+        """
+        raise NotImplementedError
+
+    def _take(self, state, now):
+        day = int(now // SECONDS_PER_DAY)
+        if state is None:
+            state = (self.burst or 0.0, now, day, 0)
+        tokens, last, state_day, count = state
+        if state_day != day:
+            count = 0
+        # exhaust() sets the count to infinity, which also stops unlimited budgets
+        per_day = float("inf") if self.per_day is None else self.per_day
+        if count >= per_day:
+            return (tokens, last, day, count), None
+
+        if self.per_second is not None:
+            tokens = min(self.burst, tokens + (now - last) * self.per_second)
+            if tokens < 1.0:
+                return (tokens, now, day, count), (1.0 - tokens) / self.per_second
+            tokens -= 1.0
+        return (tokens, now, day, count + 1), 0.0
+
+    def try_acquire(self):
+        """Takes a request from the budget without blocking.
+
+        :raises ZillowError: The daily budget is used up (status 7)
+        :return: 0 if the request may be sent, otherwise the number of seconds
+            to wait before trying again
+        :rtype: float
+        """
+        wait = self._update(lambda state: self._take(state, time.time()))
+        if wait is None:
+            raise ZillowError(DAILY_LIMIT_EXCEEDED)
+        return wait
+
+    def acquire(self, timeout: float = None):
+        """Blocks until a request may be sent.
+
+        :param timeout: Maximum time in seconds to wait, defaults to None (no
+            limit)
+        :type timeout: float, optional
+        :raises ZillowError: The daily budget is used up (status 7)
+        :raises ZillowTimeout: The request could not be sent within ``timeout``
+        """
+        end = None if timeout is None else time.monotonic() + timeout
+        wait = self.try_acquire()
+        while wait > 0:
+            # fail at once instead of sleeping past the end of the timeout
+            if end is not None and time.monotonic() + wait > end:
+                raise ZillowTimeout
+            time.sleep(wait)
+            wait = self.try_acquire()
+
+    def exhaust(self):
+        """Marks the daily budget as used up, e.g. after Zillow responded with
+        error code 7. Until the next UTC day, :meth:`acquire` raises
+        :class:`pyzillow.pyzillowerrors.ZillowError` without a request being sent.
+        """
+
+        def exhaust(state):
+            now = time.time()
+            tokens, last = (0.0, now) if state is None else state[:2]
+            return (tokens, last, int(now // SECONDS_PER_DAY), float("inf")), None
+
+        self._update(exhaust)
+
+
+class RateLimiter(BaseRateLimiter):
+    """Rate limiter shared by all threads using the same instance:
+
+    >>> from pyzillow.pyzillowratelimit import RateLimiter
+    >>> zillow_data = ZillowWrapper(
+    ...     YOUR_ZILLOW_API_KEY, rate_limiter=RateLimiter(per_second=5, per_day=1000)
+    ... )
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+        self._state = None
+
+    def _update(self, func):
+        with self._lock:
+            self._state, result = func(self._state)
+        return result
+
+
+class FileRateLimiter(BaseRateLimiter):
+    """Rate limiter shared by all processes using the same state file. Access to
+    the file is serialized with an exclusive ``flock``, so this limiter is only
+    available on POSIX systems:
+
+    >>> from pyzillow.pyzillowratelimit import FileRateLimiter
+    >>> rate_limiter = FileRateLimiter("/tmp/pyzillow.limit", per_second=5, per_day=1000)
+    """
+
+    _format = struct.Struct("<ddqd")
+
+    def __init__(self, path: str, *args, **kwargs):
+        """Constructor method
+
+        :param path: Path of the state file, which is created if it does not exist
+        :type path: str
+        """
+        if fcntl is None:  # pragma: no cover
+            raise ImportError("FileRateLimiter requires fcntl (POSIX only)")
+        super().__init__(*args, **kwargs)
+        self.path = path
+
+    def _update(self, func):
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            data = os.pread(fd, self._format.size, 0)
+            state = (
+                self._format.unpack(data) if len(data) == self._format.size else None
+            )
+            state, result = func(state)
+            os.pwrite(fd, self._format.pack(*state), 0)
+        finally:
+            os.close(fd)  # releases the lock
+        return result
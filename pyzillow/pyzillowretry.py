@@ -0,0 +1,131 @@
+import random
+
+from .pyzillowerrors import ZillowError, ZillowFail
+from .pyzillowstats import Counters
+
+
+class RetryPolicy(object):
+    """Retry policy of :class:`pyzillow.pyzillow.ZillowWrapper` for transient errors.
+
+    A request is retried if it raised :class:`pyzillow.pyzillowerrors.ZillowFail`
+    (the API endpoint could not be reached or returned an HTTP error or invalid
+    XML) or :class:`pyzillow.pyzillowerrors.ZillowError` with one of
+    ``retry_codes``. Before the n-th retry, the wrapper waits for
+    ``backoff * 2 ** (n - 1)`` seconds, capped at ``max_backoff``. With
+    ``jitter``, the wait time is drawn uniformly between 0 and that value
+    ("full jitter"), so that many workers failing at the same time do not retry
+    in lockstep:
+
+    >>> from pyzillow.pyzillowretry import RetryPolicy
+    >>> zillow_data = ZillowWrapper(
+    ...     YOUR_ZILLOW_API_KEY, retry=RetryPolicy(max_attempts=5, deadline=60)
+    ... )
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        jitter: bool = True,
+        retry_codes=(1, 3, 4),
+        retry_on_fail: bool = True,
+        deadline: float = None,
+    ):
+        """Constructor method
+
+        :param max_attempts: Maximum number of attempts per call, including the
+            first one, defaults to 3
+        :type max_attempts: int, optional
+        :param backoff: Wait time in seconds before the first retry, defaults to 0.5
+        :type backoff: float, optional
+        :param max_backoff: Maximum wait time in seconds between attempts,
+            defaults to 30
+        :type max_backoff: float, optional
+        :param jitter: Randomize wait times, defaults to True
+        :type jitter: bool, optional
+        :param retry_codes: Zillow error codes to retry, defaults to (1, 3, 4)
+        :type retry_codes: tuple, optional
+        :param retry_on_fail: Retry requests that raised ZillowFail, defaults to True
+        :type retry_on_fail: bool, optional
+        :param deadline: Time in seconds after the first attempt after which no
+            further attempts are started, defaults to None
+        :type deadline: float, optional
+        """
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_codes = frozenset(retry_codes)
+        self.retry_on_fail = retry_on_fail
+        self.deadline = deadline
+
+    def is_retryable(self, error):
+        """Checks whether an error raised by a request is transient.
+
+        :param error: Exception raised by the request
+        :type error: Exception
+        :rtype: bool
+        """
+        if isinstance(error, ZillowError):
+            return int(error.status) in self.retry_codes
+        return self.retry_on_fail and isinstance(error, ZillowFail)
+
+    def get_backoff(self, retry: int):
+        """Returns the wait time in seconds before a retry.
+
+        :param retry: Number of the retry, starting at 1
+        :type retry: int
+        :rtype: float
+        """
+        delay = min(self.max_backoff, self.backoff * 2 ** (retry - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def get_delay(self, error, attempt: int, elapsed: float):
+        """Decides whether a failed attempt is retried.
+
+        :param error: Exception raised by the attempt
+        :type error: Exception
+        :param attempt: Number of attempts made so far
+        :type attempt: int
+        :param elapsed: Seconds since the first attempt started
+        :type elapsed: float
+        :return: Seconds to wait before the next attempt, or None if the error
+            should be raised
+        :rtype: float
+        """
+        if attempt >= self.max_attempts or not self.is_retryable(error):
+            return None
+        delay = self.get_backoff(attempt)
+        if self.deadline is not None and elapsed + delay >= self.deadline:
+            return None
+        return delay
+
+
+class RetryStats(Counters):
+    """Thread-safe counters of the retries made by a
+    :class:`pyzillow.pyzillow.ZillowWrapper`.
+
+    ``histogram`` maps the number of retries to the number of calls that needed
+    that many retries, e.g. ``{0: 980, 1: 18, 2: 2}``. ``backoff_seconds`` is the
+    total time spent waiting between attempts.
+    """
+
+    counters = ("calls", "retries", "backoff_seconds")
+    keyed_counters = ("histogram",)
+
+    def record(self, retries: int, backoff_seconds: float):
+        """Records a finished call.
+
+        :param retries: Number of retries of the call
+        :type retries: int
+        :param backoff_seconds: Time in seconds the call waited between attempts
+        :type backoff_seconds: float
+        """
+        with self._lock:
+            self.calls += 1
+            self.retries += retries
+            self.backoff_seconds += backoff_seconds
+            self.histogram[retries] += 1
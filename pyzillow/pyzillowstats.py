@@ -0,0 +1,41 @@
+import threading
+from collections import Counter
+
+
+class Counters(object):
+    """Base class for thread-safe counters, which can be read while they are
+    updated. Subclasses name their counters in ``counters``, which start at
+    zero, and in ``keyed_counters``, which are :class:`collections.Counter`
+    objects, e.g. of responses per error code.
+    """
+
+    counters = ()
+    keyed_counters = ()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Sets all counters to zero."""
+        with self._lock:
+            for counter in self.counters:
+                setattr(self, counter, 0)
+            for counter in self.keyed_counters:
+                setattr(self, counter, Counter())
+
+    def incr(self, counter: str, value: int = 1, key=None):
+        """Adds ``value`` to a counter, or to the count of ``key`` of a keyed
+        counter.
+
+        :param counter: Name of the counter
+        :type counter: str
+        :param value: Amount to add, defaults to 1
+        :type value: int, optional
+        :param key: Key of a keyed counter, defaults to None
+        """
+        with self._lock:
+            if key is None:
+                setattr(self, counter, getattr(self, counter) + value)
+            else:
+                getattr(self, counter)[key] += value
@@ -0,0 +1,138 @@
+import threading
+from xml.etree import ElementTree
+
+try:
+    from lxml import etree
+except ImportError:  # pragma: no cover
+    etree = None
+
+
+class PathExtractor(object):
+    """Extracts the text of all paths of an ``attribute_mapping`` in one traversal
+    of the XML data.
+
+    The paths are compiled into a trie of tags, so common prefixes such as
+    ``result/address`` are walked only once. Like ``Element.find``, each attribute
+    takes the first matching element in document order, and attributes without a
+    matching element are None.
+    """
+
+    def __init__(self, attribute_mapping):
+        self.attrs = tuple(attribute_mapping)
+        # tag -> (child trie, attributes of this element, attributes in subtree)
+        self.trie = {}
+        for attr, path in attribute_mapping.items():
+            trie = self.trie
+            for tag in path.split("/"):
+                node = trie.setdefault(tag, ({}, [], set()))
+                node[2].add(attr)
+                trie = node[0]
+            node[1].append(attr)
+
+    def __call__(self, data):
+        values = dict.fromkeys(self.attrs)
+        self._walk(data, self.trie, values, set())
+        return values
+
+    def _walk(self, element, trie, values, found):
+        for child in element:
+            node = trie.get(child.tag)
+            # skip subtrees whose attributes were all found in an earlier match
+            if node is None or node[2] <= found:
+                continue
+            children, attrs, _ = node
+            for attr in attrs:
+                if attr not in found:
+                    values[attr] = child.text
+                    found.add(attr)
+            if children:
+                self._walk(child, children, values, found)
+
+
+class ElementTreeEngine(object):
+    """XML engine based on :mod:`xml.etree.ElementTree` from the standard library"""
+
+    name = "etree"
+    ParseError = ElementTree.ParseError
+
+    def fromstring(self, body):
+        """Parses an XML document.
+
+        :param body: XML document
+        :type body: bytes or str
+        :rtype: xml.etree.ElementTree.Element
+        """
+        return ElementTree.fromstring(body)
+
+    def pull_parser(self):
+        """Returns a parser that is fed chunks of a document and reports
+        ``start`` and ``end`` events"""
+        return ElementTree.XMLPullParser(events=("start", "end"))
+
+
+class LxmlEngine(object):
+    """XML engine based on `lxml <https://lxml.de/>`_, which is installed with
+    ``pip install pyzillow[lxml]``. Entities are not resolved and no network access
+    is allowed while parsing.
+    """
+
+    name = "lxml"
+
+    def __init__(self):
+        if etree is None:
+            raise ImportError("LxmlEngine requires lxml: pip install pyzillow[lxml]")
+        self.ParseError = etree.XMLSyntaxError
+        # lxml parsers must not be used by several threads at the same time
+        self._local = threading.local()
+
+    @staticmethod
+    def _parser_options():
+        return dict(resolve_entities=False, no_network=True, remove_comments=True)
+
+    def fromstring(self, body):
+        """Parses an XML document.
+
+        :param body: XML document
+        :type body: bytes or str
+        :rtype: lxml.etree._Element
+        """
+        parser = getattr(self._local, "parser", None)
+        if parser is None:
+            parser = self._local.parser = etree.XMLParser(**self._parser_options())
+        if isinstance(body, str):
+            # lxml rejects text with an encoding declaration
+            body = body.encode("utf-8")
+        return etree.fromstring(body, parser)
+
+    def pull_parser(self):
+        """Returns a parser that is fed chunks of a document and reports
+        ``start`` and ``end`` events"""
+        return etree.XMLPullParser(events=("start", "end"), **self._parser_options())
+
+
+ENGINES = {"etree": ElementTreeEngine, "lxml": LxmlEngine}
+
+_engines = {}
+
+
+def get_engine(engine=None):
+    """Returns an XML engine.
+
+    :param engine: ``"lxml"``, ``"etree"`` or an engine instance, defaults to
+        None, which selects lxml if it is installed and ElementTree otherwise
+    :type engine: str or object, optional
+    :rtype: ElementTreeEngine or LxmlEngine
+    """
+    if engine is None:
+        engine = "etree" if etree is None else "lxml"
+    if not isinstance(engine, str):
+        return engine
+    if engine not in ENGINES:
+        raise ValueError(
+            "Unknown XML engine {!r}, expected one of {}".format(
+                engine, ", ".join(sorted(ENGINES))
+            )
+        )
+    if engine not in _engines:
+        _engines[engine] = ENGINES[engine]()
+    return _engines[engine]
@@ -40,7 +40,13 @@ setup(
     packages=["pyzillow"],
     package_dir={"pyzillow": "pyzillow"},
     include_package_data=True,
+    entry_points={"console_scripts": ["pyzillow = pyzillow.pyzillowcli:main"]},
     install_requires=["requests"],
+    extras_require={
+        "async": ["httpx"],
+        "columnar": ["numpy", "pandas", "pyarrow"],
+        "lxml": ["lxml"],
+    },
     license="MIT",
     zip_safe=False,
     keywords=["pyzillow", "zillow", "api", "real estate"],
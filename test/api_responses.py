@@ -7,9 +7,11 @@ PROPERTY_DETAIL_URL = "http://www.zillow.com/webservice/GetUpdatedPropertyDetail
 
 XML_RESPONSE = {
     "get_deep_search_200_ok": "get_deep_search_200_ok.xml",
+    "get_deep_search_200_ok_multiple": "get_deep_search_200_ok_multiple.xml",
     "updated_property_details_200_ok": "updated_property_details_200_ok.xml",
     "error_2_zwsid_missing": "error_2_zwsid_missing.xml",
     "error_6_account_not_authorized": "error_6_account_not_authorized.xml",
+    "error_7_too_many_requests": "error_7_too_many_requests.xml",
     "error_500_no_address_provided": "error_500.xml",
     "error_501_no_city_state": "error_501.xml",
     "error_508_invalid_address": "error_508_invalid_address.xml",
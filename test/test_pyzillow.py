@@ -2,20 +2,41 @@
 Tests for `pyzillow` module.
 """
 
+import io
+import logging
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from decimal import Decimal
+from xml.etree import ElementTree
+
 import pytest
+import requests
 import responses
 
 from api_responses import (
+    DEEP_SEARCH_URL,
+    PROPERTY_DETAIL_URL,
     APIReponses,
     set_get_deep_search_response,
     set_updated_property_details_response,
 )
 from pyzillow.pyzillow import (
+    DeepSearchResultSet,
     GetDeepSearchResults,
     GetUpdatedPropertyDetails,
+    PropertyRecord,
     ZillowWrapper,
+    _parse_pruned,
+)
+from pyzillow.pyzillowerrors import (
+    ZillowError,
+    ZillowFail,
+    ZillowNoResults,
+    ZillowTimeout,
 )
-from pyzillow.pyzillowerrors import ZillowError
+from pyzillow.pyzillowhooks import Hooks
 
 
 class TestPyzillow(object):
@@ -301,6 +322,477 @@ class TestPyzillow(object):
         assert result.parking_type == "Off-street"
         # assert result.home_description == """Bright, spacious, """
 
+    @responses.activate
+    def test_session_shared_between_endpoints(self):
+        """
+        Tests that both endpoints are requested through the pooled session
+        """
+
+        set_get_deep_search_response(
+            self.api_response_obj.get("get_deep_search_200_ok")
+        )
+        set_updated_property_details_response(
+            self.api_response_obj.get("updated_property_details_200_ok")
+        )
+
+        zillow_data = ZillowWrapper(self.ZILLOW_API_KEY, pool_maxsize=4)
+        adapter = zillow_data.session.get_adapter(DEEP_SEARCH_URL)
+        assert adapter._pool_maxsize == 4
+
+        zillow_data.get_deep_search_results(self.address, self.zipcode)
+        zillow_data.get_updated_property_details("48749425")
+        assert len(responses.calls) == 2
+        for call in responses.calls:
+            assert call.request.headers["User-Agent"].startswith("pyzillow/")
+
+    def test_session_lifecycle(self, monkeypatch):
+        """
+        Tests that only sessions owned by the wrapper are closed
+        """
+
+        closed = []
+        with ZillowWrapper(self.ZILLOW_API_KEY) as zillow_data:
+            monkeypatch.setattr(zillow_data.session, "close", lambda: closed.append(1))
+        assert closed == [1]
+
+        session = requests.Session()
+        monkeypatch.setattr(session, "close", lambda: closed.append(2))
+        zillow_data = ZillowWrapper(self.ZILLOW_API_KEY, session=session)
+        assert zillow_data.session is session
+        zillow_data.close()
+        assert closed == [1]
+
+    def test_session_created_once(self, monkeypatch):
+        """
+        Tests that threads using a new wrapper at the same time share one session
+        """
+
+        sessions = []
+        session_init = requests.Session.__init__
+
+        def slow_init(session):
+            session_init(session)
+            time.sleep(0.01)
+            sessions.append(session)
+
+        monkeypatch.setattr(requests.Session, "__init__", slow_init)
+        zillow_data = ZillowWrapper(self.ZILLOW_API_KEY)
+        with ThreadPoolExecutor(8) as executor:
+            used = list(executor.map(lambda _: zillow_data.session, range(8)))
+        assert len(sessions) == 1
+        assert all(session is sessions[0] for session in used)
+
+    @responses.activate
+    def test_deep_search_results_bulk(self):
+        """
+        Tests that bulk lookups keep the input order and report errors per item
+        """
+
+        ok = self.api_response_obj.get("get_deep_search_200_ok")
+        not_found = self.api_response_obj.get("error_508_invalid_address")
+
+        def callback(request):
+            time.sleep(0.05 if "slow" in request.url else 0)
+            return (200, {}, not_found if "invalid" in request.url else ok)
+
+        responses.add_callback(responses.GET, DEEP_SEARCH_URL, callback=callback)
+
+        addresses = [
+            ("slow address", self.zipcode),
+            ("invalid address", self.zipcode),
+        ] + [(self.address, self.zipcode)] * 6
+        zillow_data = ZillowWrapper(self.ZILLOW_API_KEY)
+
+        outcomes = list(
+            zillow_data.get_deep_search_results_bulk(addresses, max_workers=3)
+        )
+        assert [outcome.index for outcome in outcomes] == list(range(8))
+        assert [outcome.item for outcome in outcomes] == addresses
+        assert isinstance(outcomes[1].error, ZillowError)
+        assert outcomes[1].response is None
+        assert GetDeepSearchResults(outcomes[0].response).zillow_id == "48749425"
+
+        outcomes = list(
+            zillow_data.get_deep_search_results_bulk(
+                addresses, max_workers=3, ordered=False
+            )
+        )
+        assert sorted(outcome.index for outcome in outcomes) == list(range(8))
+        assert outcomes[0].index != 0
+
+        outcomes = list(
+            zillow_data.map_bulk(
+                lambda item: GetDeepSearchResults.record_from_xml(
+                    zillow_data.get_deep_search_results(*item)
+                ),
+                addresses,
+                max_workers=3,
+                skip=lambda item: item[0] == "slow address",
+            )
+        )
+        assert [outcome.index for outcome in outcomes] == list(range(1, 8))
+        assert outcomes[1].response.zillow_id == "48749425"
+
+    @responses.activate
+    def test_property_records_bulk(self):
+        """
+        Tests that deep search and details are merged into one record per
+        address, and that a property without details keeps its deep search
+        attributes
+        """
+
+        ok = self.api_response_obj.get("get_deep_search_200_ok")
+        not_found = self.api_response_obj.get("error_508_invalid_address")
+        details = self.api_response_obj.get("updated_property_details_200_ok")
+        no_details = self.api_response_obj.get("error_500_no_address_provided")
+
+        def deep_search_callback(request):
+            if "invalid" in request.url:
+                return (200, {}, not_found)
+            if "no+details" in request.url:
+                return (200, {}, ok.replace("48749425", "99999999"))
+            return (200, {}, ok)
+
+        def details_callback(request):
+            return (200, {}, no_details if "99999999" in request.url else details)
+
+        responses.add_callback(
+            responses.GET, DEEP_SEARCH_URL, callback=deep_search_callback
+        )
+        responses.add_callback(
+            responses.GET, PROPERTY_DETAIL_URL, callback=details_callback
+        )
+
+        addresses = [
+            (self.address, self.zipcode),
+            ("no details", self.zipcode),
+            ("invalid", "00000"),
+        ]
+        zillow_data = ZillowWrapper(self.ZILLOW_API_KEY)
+        outcomes = list(
+            zillow_data.get_property_records_bulk(addresses, typed=True, max_workers=3)
+        )
+
+        record = outcomes[0].response
+        assert isinstance(record, PropertyRecord)
+        assert record.zestimate_amount == 2001121
+        assert record.heating_system == "Forced air"
+        # the details have no city, the one of the deep search is kept
+        assert record.city == "Seattle"
+        assert record.bathrooms == 3.0
+
+        record = outcomes[1].response
+        assert (record.zillow_id, record.zestimate_amount) == ("99999999", 2001121)
+        assert record.heating_system is None
+        assert isinstance(outcomes[2].error, ZillowError)
+
+    @responses.activate
+    def test_response_stats_and_logging(self, caplog):
+        """
+        Tests that results, missing results, invalid XML and error codes are
+        counted and logged instead of printed, for both endpoints
+        """
+
+        ok = self.api_response_obj.get("get_deep_search_200_ok")
+        start = ok.index("<response>")
+        end = ok.index("</response>") + len("</response>")
+        no_results = ok[:start] + ok[end:]
+        for body in (
+            ok,
+            no_results,
+            self.api_response_obj.get("error_508_invalid_address"),
+        ):
+            set_get_deep_search_response(body)
+        set_updated_property_details_response("not xml")
+
+        zillow_data = ZillowWrapper(self.ZILLOW_API_KEY)
+        with caplog.at_level(logging.DEBUG, logger="pyzillow.pyzillow"):
+            zillow_data.get_deep_search_results(self.address, self.zipcode)
+            with pytest.raises(ZillowNoResults):
+                zillow_data.get_deep_search_results(self.address, self.zipcode)
+            with pytest.raises(ZillowError):
+                zillow_data.get_deep_search_results(self.address, self.zipcode)
+            with pytest.raises(ZillowFail):
+                zillow_data.get_updated_property_details("48749425")
+
+        stats = zillow_data.response_stats
+        assert (stats.results, stats.no_results, stats.parse_failures) == (1, 1, 1)
+        assert stats.errors == {508: 1}
+        stats.reset()
+        assert (stats.results, stats.errors) == (0, {})
+        assert [record.getMessage() for record in caplog.records] == [
+            "Zillow returned no results for ({})".format(self.address),
+            "Zillow response is not a valid XML (48749425)",
+        ]
+
+    @responses.activate
+    def test_timeout_raises_zillow_timeout(self):
+        """
+        Tests that timeouts raise ZillowTimeout, a subclass of ZillowFail
+        """
+
+        responses.add(
+            responses.GET, DEEP_SEARCH_URL, body=requests.exceptions.ReadTimeout()
+        )
+        zillow_data = ZillowWrapper(self.ZILLOW_API_KEY)
+
+        with pytest.raises(ZillowTimeout):
+            zillow_data.get_deep_search_results(self.address, self.zipcode)
+        assert issubclass(ZillowTimeout, ZillowFail)
+
+    def test_timeouts_and_deadline(self, monkeypatch):
+        """
+        Tests that per-call timeouts override the instance and that attempts
+        are shortened to the time left until the deadline
+        """
+
+        zillow_data = ZillowWrapper(self.ZILLOW_API_KEY, timeout=(5, 20), deadline=8)
+        timeouts = []
+
+        def get(**kwargs):
+            timeouts.append(kwargs["timeout"])
+            raise requests.exceptions.ConnectTimeout()
+
+        monkeypatch.setattr(zillow_data.session, "get", get)
+        with pytest.raises(ZillowTimeout):
+            zillow_data.get_updated_property_details("48749425", timeout=3)
+        assert timeouts == [3]
+
+        start = time.monotonic()
+        timeout = zillow_data._get_attempt_timeout((5, 20), 8, start - 2)
+        assert timeout[0] == 5 and 5.9 < timeout[1] <= 6
+        with pytest.raises(ZillowTimeout):
+            zillow_data._get_attempt_timeout((5, 20), 8, start - 8)
+
+    def test_lazy_results_match_eager_results(self):
+        """
+        Tests that lazy results extract attributes on first access only and
+        return the same values as eager results
+        """
+
+        for result_class, key in (
+            (GetDeepSearchResults, "get_deep_search_200_ok"),
+            (GetUpdatedPropertyDetails, "updated_property_details_200_ok"),
+        ):
+            data = ElementTree.fromstring(self.api_response_obj.get(key))
+            eager = result_class(data)
+            lazy = result_class(data, lazy=True)
+            assert list(lazy.__dict__) == ["data"]
+
+            assert lazy.zillow_id == "48749425"
+            assert "zillow_id" in lazy.__dict__
+            for attr in result_class.attribute_mapping:
+                assert getattr(lazy, attr) == getattr(eager, attr)
+            assert str(lazy) == "48749425"
+
+    @responses.activate
+    def test_stream_parse_failure_closes_response(self, monkeypatch):
+        """
+        Tests that a streamed response is closed as soon as the parser fails on
+        its body, before the error is handled
+        """
+
+        closed = []
+        close = requests.Response.close
+
+        def spy_close(response):
+            closed.append(response)
+            close(response)
+
+        class ErrorHooks(Hooks):
+            def on_error(self, **values):
+                self.closed_on_error = len(closed)
+
+        monkeypatch.setattr(requests.Response, "close", spy_close)
+        # the parser fails on the first of several chunks
+        set_get_deep_search_response("<searchresults><<" + "x" * 20000)
+        hooks = ErrorHooks()
+        # etree fails on the chunk with the error, lxml only at the end
+        zillow_data = ZillowWrapper(
+            self.ZILLOW_API_KEY, stream_parse=True, xml_engine="etree", hooks=hooks
+        )
+        with pytest.raises(ZillowFail):
+            zillow_data.get_deep_search_results(self.address, self.zipcode)
+        assert hooks.closed_on_error == 1
+
+    @responses.activate
+    def test_stream_parse_keeps_only_used_elements(self):
+        """
+        Tests that stream parsing yields the same results from a pruned tree
+        """
+
+        set_get_deep_search_response(
+            self.api_response_obj.get("get_deep_search_200_ok")
+        )
+        set_updated_property_details_response(
+            self.api_response_obj.get("updated_property_details_200_ok")
+        )
+        zillow_data = ZillowWrapper(self.ZILLOW_API_KEY)
+        streaming = ZillowWrapper(self.ZILLOW_API_KEY, stream_parse=True)
+
+        full = zillow_data.get_deep_search_results(self.address, self.zipcode)
+        pruned = streaming.get_deep_search_results(self.address, self.zipcode)
+        assert len(list(pruned.iter())) < len(list(full.iter()))
+        assert (
+            pruned.find("response/results/result/localRealEstate/region/links") is None
+        )
+        expected, result = GetDeepSearchResults(full), GetDeepSearchResults(pruned)
+        assert vars(result).keys() == vars(expected).keys()
+        for attr in GetDeepSearchResults.attribute_mapping:
+            assert getattr(result, attr) == getattr(expected, attr)
+        assert result.region_name == expected.region_name
+        assert result.last_sold_price_currency == "USD"
+
+        full = zillow_data.get_updated_property_details("48749425")
+        pruned = streaming.get_updated_property_details("48749425")
+        assert full.find("response/images") is not None
+        assert pruned.find("response/images") is None
+        expected = GetUpdatedPropertyDetails(full)
+        result = GetUpdatedPropertyDetails(pruned)
+        for attr in GetUpdatedPropertyDetails.attribute_mapping:
+            assert getattr(result, attr) == getattr(expected, attr)
+
+    def test_parse_pruned_from_chunks(self):
+        """
+        Tests that pruned parsing handles bodies split into small chunks
+        """
+
+        body = self.api_response_obj.get("updated_property_details_200_ok").encode()
+        stream = io.BytesIO(body)
+        chunks = iter(lambda: stream.read(64), b"")
+        response = _parse_pruned(
+            chunks, GetUpdatedPropertyDetails._stream_trie, "etree"
+        )
+        assert response.find("message/code").text == "0"
+        assert response.find("response/editedFacts/roof").text == "Composition"
+        assert response.find("response/editedFacts/numFloors").text == "2"
+
+        with pytest.raises(ElementTree.ParseError):
+            _parse_pruned([body[:300]], GetUpdatedPropertyDetails._stream_trie, "etree")
+
+    @responses.activate
+    def test_response_parsed_from_bytes(self):
+        """
+        Tests that the body is parsed from bytes with the encoding declared in
+        the XML, even if the Content-Type header has no charset
+        """
+
+        body = self.api_response_obj.get("get_deep_search_200_ok").replace(
+            "<street>2114 Bigelow Ave N</street>", "<street>2114 Bigelów Ave N</street>"
+        )
+        responses.add(
+            responses.GET,
+            DEEP_SEARCH_URL,
+            body=body.encode("utf-8"),
+            content_type="text/xml",
+        )
+        zillow_data = ZillowWrapper(self.ZILLOW_API_KEY)
+        response = zillow_data.get_deep_search_results(self.address, self.zipcode)
+        assert GetDeepSearchResults(response).street == "2114 Bigelów Ave N"
+
+    @responses.activate
+    @pytest.mark.parametrize("stream_parse", [False, True])
+    def test_deep_search_result_set(self, stream_parse):
+        """
+        Tests that all results of a deep search are collected
+        """
+
+        set_get_deep_search_response(
+            self.api_response_obj.get("get_deep_search_200_ok_multiple")
+        )
+        zillow_data = ZillowWrapper(self.ZILLOW_API_KEY, stream_parse=stream_parse)
+        response = zillow_data.get_deep_search_results(
+            "1521 2nd Ave Seattle, WA", "98101"
+        )
+        results = DeepSearchResultSet(response)
+
+        assert len(results) == 3
+        assert results.zillow_ids == ["82468139", "82468140", "82468141"]
+        assert results.zestimate_amounts == ["1250000", "986400", None]
+        assert results.column("bedrooms") == ["2", "1", "2"]
+        record = results.find(street="1521 2nd Ave APT 1102")
+        assert record is results[1]
+        assert record.zillow_id == "82468140"
+        assert record.home_type == "Condominium"
+        assert results.find(street="1521 2nd Ave APT 1104") is None
+        with pytest.raises(AttributeError):
+            results.column("region_name")
+
+        first = GetDeepSearchResults(response)
+        assert results[0] == tuple(
+            getattr(first, attr) for attr in GetDeepSearchResults.attribute_mapping
+        )
+
+    def test_compact_records(self):
+        """
+        Tests that records hold the attributes of the result objects without the
+        XML data and share repeated values
+        """
+
+        for result_class, key in (
+            (GetDeepSearchResults, "get_deep_search_200_ok"),
+            (GetUpdatedPropertyDetails, "updated_property_details_200_ok"),
+        ):
+            body = self.api_response_obj.get(key)
+            record_type = result_class.record_type()
+            assert record_type._fields == tuple(result_class.attribute_mapping)
+
+            result = result_class(ElementTree.fromstring(body))
+            record = result.to_record()
+            assert isinstance(record, record_type)
+            assert record == result_class.record_from_xml(ElementTree.fromstring(body))
+            assert (
+                record
+                == result_class(ElementTree.fromstring(body), lazy=True).to_record()
+            )
+            assert record.zillow_id == "48749425"
+            assert pickle.loads(pickle.dumps(record)) == record
+
+            other = result_class.record_from_xml(ElementTree.fromstring(body))
+            for attr in result_class.categorical_attributes:
+                assert getattr(other, attr) is getattr(record, attr)
+
+    def test_typed_results(self):
+        """
+        Tests that typed results convert attributes once, in eager and lazy mode
+        """
+
+        data = ElementTree.fromstring(
+            self.api_response_obj.get("get_deep_search_200_ok")
+        )
+        for result in (
+            GetDeepSearchResults(data, typed=True),
+            GetDeepSearchResults(data, lazy=True, typed=True),
+        ):
+            assert result.zestimate_amount == 2001121
+            assert result.zestimate_value_change == -16739
+            assert result.bathrooms == 3.0
+            assert result.latitude == 47.637934
+            assert result.tax_value == Decimal("1534000.0")
+            assert result.last_sold_date == date(2008, 11, 26)
+            assert result.zillow_id == "48749425"
+            assert result.zipcode == "98109"
+            assert result.rentzestimate_amount is None
+            assert str(result) == "48749425"
+
+        assert GetDeepSearchResults(data).zestimate_amount == "2001121"
+        record = GetDeepSearchResults.record_from_xml(data, typed=True)
+        assert record == GetDeepSearchResults(data, typed=True).to_record()
+        assert record.year_built == 1924
+
+        assert GetDeepSearchResults._convert({"bedrooms": "4.5"}) == {"bedrooms": None}
+        assert GetDeepSearchResults._convert({"tax_value": "n/a"}) == {
+            "tax_value": None
+        }
+
+        data = ElementTree.fromstring(
+            self.api_response_obj.get("updated_property_details_200_ok")
+        )
+        result = GetUpdatedPropertyDetails(data, typed=True)
+        assert result.page_view_count_total == 16125
+        assert result.year_updated == 2003
+        assert result.roof == "Composition"
+
     @classmethod
     def teardown_class(cls):
         pass
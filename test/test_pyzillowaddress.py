@@ -0,0 +1,39 @@
+"""
+Tests for `pyzillow.pyzillowaddress` module.
+"""
+
+from pyzillow.pyzillowaddress import normalize_address, normalize_zipcode
+
+
+class TestPyzillowAddress(object):
+    def test_normalize_address(self):
+        """
+        Tests that spellings of an address have the same canonical form
+        """
+
+        spellings = [
+            "2114 Bigelow Avenue North, Apartment 5",
+            "  2114  BIGELOW AVE.  N  APT 5 ",
+            "2114 bigelow ave n apt. #5",
+            "2114 Bigelow Av North Apt#5",
+        ]
+        assert {normalize_address(address) for address in spellings} == {
+            "2114 BIGELOW AVE N APT 5"
+        }
+        assert normalize_address("1521 2nd Avenue Suite 1101") == (
+            "1521 2ND AVE STE 1101"
+        )
+        # "#" is kept as the designator of a unit without another designator
+        assert normalize_address("1 Main Street #3") == "1 MAIN ST # 3"
+        assert normalize_address("") == ""
+
+    def test_normalize_zipcode(self):
+        """
+        Tests that ZIP+4 codes are trimmed and city and state are cleaned up
+        """
+
+        assert normalize_zipcode("98109") == "98109"
+        assert normalize_zipcode(" 98109-1234") == "98109"
+        assert normalize_zipcode("981091234") == "98109"
+        assert normalize_zipcode("Seattle,  WA") == "SEATTLE WA"
+        assert normalize_zipcode("9810") == "9810"
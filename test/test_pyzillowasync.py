@@ -0,0 +1,258 @@
+"""
+Tests for `pyzillow.pyzillowasync` module.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from api_responses import APIReponses
+from pyzillow.pyzillow import (
+    BaseZillowWrapper,
+    GetDeepSearchResults,
+    GetUpdatedPropertyDetails,
+    ZillowWrapper,
+)
+from pyzillow.pyzillowerrors import ZillowError, ZillowFail, ZillowTimeout
+from pyzillow.pyzillowhooks import LatencyStats
+from pyzillow.pyzillowratelimit import RateLimiter
+from pyzillow.pyzillowretry import RetryPolicy
+
+httpx = pytest.importorskip("httpx")
+
+from pyzillow.pyzillowasync import AsyncZillowWrapper  # noqa: E402
+
+
+def mock_client(responses_by_endpoint, status_code=200, tracker=None):
+    """Builds an AsyncClient that answers each endpoint with a fixed body"""
+
+    async def handler(request):
+        if tracker is not None:
+            tracker["requests"] = tracker.get("requests", 0) + 1
+            tracker["active"] += 1
+            tracker["max"] = max(tracker["max"], tracker["active"])
+            await asyncio.sleep(0.01)
+            tracker["active"] -= 1
+        endpoint = request.url.path.rsplit("/", 1)[-1]
+        return httpx.Response(status_code, text=responses_by_endpoint[endpoint])
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class TestPyzillowAsync(object):
+    @classmethod
+    def setup_class(cls):
+        cls.ZILLOW_API_KEY = "NO_KEY_NEEDED_DUE_TO_MOCKING_API"
+        cls.address = "2114 Bigelow Ave Seattle, WA"
+        cls.zipcode = "98109"
+        cls.api_response_obj = APIReponses()
+
+    def test_async_results_match_sync_parsing(self):
+        """
+        Tests that both endpoints return objects the result classes can parse
+        """
+
+        client = mock_client(
+            {
+                "GetDeepSearchResults.htm": self.api_response_obj.get(
+                    "get_deep_search_200_ok"
+                ),
+                "GetUpdatedPropertyDetails.htm": self.api_response_obj.get(
+                    "updated_property_details_200_ok"
+                ),
+            }
+        )
+
+        async def lookup():
+            async with AsyncZillowWrapper(self.ZILLOW_API_KEY, client=client) as z:
+                deep_search_response = await z.get_deep_search_results(
+                    self.address, self.zipcode
+                )
+                details_response = await z.get_updated_property_details("48749425")
+            return deep_search_response, details_response
+
+        deep_search_response, details_response = asyncio.run(lookup())
+        assert GetDeepSearchResults(deep_search_response).zillow_id == "48749425"
+        result = GetUpdatedPropertyDetails(details_response)
+        assert result.parking_type == "Off-street"
+
+    def test_async_errors(self):
+        """
+        Tests that Zillow error codes and HTTP errors raise the sync exceptions
+        """
+
+        body = {
+            "GetDeepSearchResults.htm": self.api_response_obj.get(
+                "error_2_zwsid_missing"
+            )
+        }
+        zillow_data = AsyncZillowWrapper(None, client=mock_client(body))
+        with pytest.raises(ZillowError) as excinfo:
+            asyncio.run(zillow_data.get_deep_search_results(self.address, None))
+        assert "Status 2: The specified ZWSID parameter was invalid" in str(
+            excinfo.value
+        )
+
+        zillow_data = AsyncZillowWrapper(
+            None, client=mock_client(body, status_code=503)
+        )
+        with pytest.raises(ZillowFail):
+            asyncio.run(zillow_data.get_deep_search_results(self.address, None))
+
+    def test_async_concurrency_limit(self):
+        """
+        Tests that no more than max_concurrency requests are in flight
+        """
+
+        tracker = {"active": 0, "max": 0}
+        client = mock_client(
+            {
+                "GetUpdatedPropertyDetails.htm": self.api_response_obj.get(
+                    "updated_property_details_200_ok"
+                )
+            },
+            tracker=tracker,
+        )
+        zillow_data = AsyncZillowWrapper(
+            self.ZILLOW_API_KEY, max_concurrency=3, client=client
+        )
+
+        async def lookup_all():
+            return await asyncio.gather(
+                *[zillow_data.get_updated_property_details(str(i)) for i in range(12)]
+            )
+
+        assert len(asyncio.run(lookup_all())) == 12
+        assert tracker["max"] == 3
+
+    def test_async_coalescing(self):
+        """
+        Tests that concurrent identical lookups share one request
+        """
+
+        tracker = {"active": 0, "max": 0}
+        client = mock_client(
+            {
+                "GetUpdatedPropertyDetails.htm": self.api_response_obj.get(
+                    "updated_property_details_200_ok"
+                )
+            },
+            tracker=tracker,
+        )
+        zillow_data = AsyncZillowWrapper(
+            self.ZILLOW_API_KEY, client=client, coalesce=True
+        )
+
+        async def lookup_all():
+            return await asyncio.gather(
+                *[
+                    zillow_data.get_updated_property_details(str(i % 2))
+                    for i in range(6)
+                ]
+            )
+
+        results = asyncio.run(lookup_all())
+        assert tracker["requests"] == 2
+        assert zillow_data.single_flight.coalesced == 4
+        assert results[0] is results[2]
+
+    def test_async_wrapper_is_not_sync(self):
+        """
+        Tests that the async wrapper does not offer the blocking interface of
+        ZillowWrapper, neither its bulk methods nor a sync context manager
+        """
+
+        zillow_data = AsyncZillowWrapper(self.ZILLOW_API_KEY, client=mock_client({}))
+        assert not isinstance(zillow_data, ZillowWrapper)
+        assert isinstance(zillow_data, BaseZillowWrapper)
+        for name in ("get_deep_search_results_bulk", "map_bulk", "close"):
+            assert not hasattr(zillow_data, name)
+        with pytest.raises(TypeError, match="async with"):
+            with zillow_data:
+                pass  # pragma: no cover
+
+    def test_async_retries_release_slot(self):
+        """
+        Tests that failed attempts give back their request slot, so retries and
+        other calls are not blocked with max_concurrency=1
+        """
+
+        body = self.api_response_obj.get("updated_property_details_200_ok")
+        attempts = []
+
+        async def handler(request):
+            attempts.append(request.url)
+            # every other request fails
+            status_code = 503 if len(attempts) % 2 else 200
+            return httpx.Response(status_code, text=body)
+
+        zillow_data = AsyncZillowWrapper(
+            self.ZILLOW_API_KEY,
+            max_concurrency=1,
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            retry=RetryPolicy(backoff=0),
+        )
+
+        async def lookup_all():
+            return await asyncio.wait_for(
+                asyncio.gather(
+                    *[
+                        zillow_data.get_updated_property_details(str(i))
+                        for i in range(3)
+                    ]
+                ),
+                timeout=5,
+            )
+
+        assert len(asyncio.run(lookup_all())) == 3
+        assert zillow_data.retry_stats.retries == 3
+
+    def test_async_rate_limiter_wait_respects_deadline(self):
+        """
+        Tests that a call fails instead of waiting for the rate limiter past its
+        deadline
+        """
+
+        zillow_data = AsyncZillowWrapper(
+            self.ZILLOW_API_KEY,
+            client=mock_client({}),
+            rate_limiter=RateLimiter(per_second=0.5),
+        )
+        zillow_data.rate_limiter.acquire()
+        with pytest.raises(ZillowTimeout):
+            asyncio.run(zillow_data.get_updated_property_details("1", deadline=0.3))
+
+    def test_async_slot_wait_not_in_latency(self):
+        """
+        Tests that the wait for a free request slot is not counted as request
+        latency
+        """
+
+        tracker = {"active": 0, "max": 0}
+        client = mock_client(
+            {
+                "GetUpdatedPropertyDetails.htm": self.api_response_obj.get(
+                    "updated_property_details_200_ok"
+                )
+            },
+            tracker=tracker,
+        )
+        stats = LatencyStats()
+        zillow_data = AsyncZillowWrapper(
+            self.ZILLOW_API_KEY, max_concurrency=1, client=client, hooks=stats
+        )
+
+        async def lookup_all():
+            return await asyncio.gather(
+                *[zillow_data.get_updated_property_details(str(i)) for i in range(8)]
+            )
+
+        start = time.perf_counter()
+        asyncio.run(lookup_all())
+        elapsed = time.perf_counter() - start
+        latencies = stats._samples[("GetUpdatedPropertyDetails", "request")]
+        assert len(latencies) == 8
+        # one request at a time, so the latencies do not overlap; with the
+        # waits for a slot they would add up to about 4.5 times the total
+        assert sum(latencies) <= elapsed
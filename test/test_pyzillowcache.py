@@ -0,0 +1,156 @@
+"""
+Tests for `pyzillow.pyzillowcache` module.
+"""
+
+import threading
+
+import pytest
+import responses
+
+from api_responses import (
+    DEEP_SEARCH_URL,
+    PROPERTY_DETAIL_URL,
+    APIReponses,
+    set_get_deep_search_response,
+)
+from pyzillow import pyzillowcache
+from pyzillow.pyzillow import GetDeepSearchResults, ZillowWrapper
+from pyzillow.pyzillowcache import MemoryCache, SQLiteCache, make_cache_key
+from pyzillow.pyzillowerrors import ZillowError
+
+
+class TestPyzillowCache(object):
+    @classmethod
+    def setup_class(cls):
+        cls.ZILLOW_API_KEY = "NO_KEY_NEEDED_DUE_TO_MOCKING_API"
+        cls.address = "2114 Bigelow Ave Seattle, WA"
+        cls.zipcode = "98109"
+        cls.api_response_obj = APIReponses()
+
+    def test_cache_key(self):
+        """
+        Tests that cache keys ignore the API key, parameter order and whitespace
+        """
+
+        key = make_cache_key(PROPERTY_DETAIL_URL, {"zpid": "48749425", "zws-id": "A"})
+        assert key == "GetUpdatedPropertyDetails?zpid=48749425"
+
+        first = make_cache_key(
+            DEEP_SEARCH_URL,
+            {"address": "2114  Bigelow Ave ", "citystatezip": "98109", "zws-id": "A"},
+        )
+        second = make_cache_key(
+            DEEP_SEARCH_URL,
+            {"zws-id": "B", "citystatezip": "98109", "address": "2114 Bigelow Ave"},
+        )
+        assert first == second
+
+        third = make_cache_key(
+            DEEP_SEARCH_URL,
+            {"address": "2114 BIGELOW AVENUE.", "citystatezip": "98109-1234"},
+        )
+        assert third == first
+
+    def test_memory_cache_eviction_and_ttl(self, monkeypatch):
+        """
+        Tests LRU eviction by count and size and expiry after the TTL
+        """
+
+        now = [1000.0]
+        monkeypatch.setattr(pyzillowcache.time, "time", lambda: now[0])
+        cache = MemoryCache(maxsize=2, ttl=10)
+
+        cache.set("a", "1")
+        cache.set("b", "2")
+        assert cache.get("a") == "1"
+        cache.set("c", "3")
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert cache.stats.evictions == 1
+
+        now[0] += 10
+        assert cache.get("a") is None
+        assert cache.stats.expirations == 1
+        assert (cache.stats.hits, cache.stats.misses) == (2, 2)
+
+        cache = MemoryCache(maxsize=10, max_bytes=5)
+        cache.set("a", "123")
+        cache.set("b", "456")
+        assert len(cache) == 1
+        assert cache.size == 3
+
+    def test_sqlite_cache_shared_and_compressed(self, tmp_path, monkeypatch):
+        """
+        Tests that entries are shared between instances using the same file,
+        stored compressed and expire by endpoint
+        """
+
+        now = [1000.0]
+        monkeypatch.setattr(pyzillowcache.time, "time", lambda: now[0])
+        path = str(tmp_path / "cache.sqlite")
+        body = self.api_response_obj.get("updated_property_details_200_ok").encode()
+        endpoint_ttl = {"GetUpdatedPropertyDetails": 100}
+
+        writer = SQLiteCache(path, ttl=10, endpoint_ttl=endpoint_ttl)
+        writer.set("GetUpdatedPropertyDetails?zpid=1", body)
+        writer.set("GetDeepSearchResults?address=a", b"<xml/>")
+        stored = writer._connect().execute("SELECT body FROM responses").fetchall()
+        assert len(stored[0][0]) < len(body) / 2
+        writer.close()
+
+        reader = SQLiteCache(path, ttl=10, endpoint_ttl=endpoint_ttl)
+        assert reader._connect().execute("PRAGMA journal_mode").fetchone() == ("wal",)
+        assert reader.get("GetUpdatedPropertyDetails?zpid=1") == body
+        now[0] += 50
+        assert reader.get("GetDeepSearchResults?address=a") is None
+        assert reader.get("GetUpdatedPropertyDetails?zpid=1") == body
+        assert reader.stats.expirations == 1
+        now[0] += 50
+        assert reader.purge_expired() == 1
+        assert len(reader) == 0
+
+    def test_sqlite_cache_close_from_other_thread(self, tmp_path):
+        """
+        Tests that close() closes the connections opened by other threads
+        """
+
+        cache = SQLiteCache(str(tmp_path / "cache.sqlite"))
+        thread = threading.Thread(
+            target=cache.set, args=("GetDeepSearchResults?address=a", b"<xml/>")
+        )
+        thread.start()
+        thread.join()
+        assert len(cache._connections) == 2
+        cache.close()
+        assert cache._connections == []
+
+    @responses.activate
+    def test_wrapper_uses_cache(self):
+        """
+        Tests that repeated queries are answered from the cache and that
+        errors are not cached
+        """
+
+        set_get_deep_search_response(
+            self.api_response_obj.get("get_deep_search_200_ok")
+        )
+        cache = MemoryCache()
+        zillow_data = ZillowWrapper(self.ZILLOW_API_KEY, cache=cache)
+
+        for _ in range(3):
+            response = zillow_data.get_deep_search_results(self.address, self.zipcode)
+            assert GetDeepSearchResults(response).zillow_id == "48749425"
+        assert len(responses.calls) == 1
+        assert (cache.stats.hits, cache.stats.misses) == (2, 1)
+        stats = zillow_data.response_stats
+        assert (stats.results, stats.cache_hits) == (1, 2)
+
+        responses.replace(
+            responses.GET,
+            DEEP_SEARCH_URL,
+            body=self.api_response_obj.get("error_508_invalid_address"),
+        )
+        for _ in range(2):
+            with pytest.raises(ZillowError):
+                zillow_data.get_deep_search_results("not a valid address", "20001")
+        assert len(responses.calls) == 3
@@ -0,0 +1,197 @@
+"""
+Tests for `pyzillow.pyzillowcli` module.
+"""
+
+import csv
+import io
+import json
+from urllib.parse import parse_qs, urlparse
+
+import responses
+
+from api_responses import DEEP_SEARCH_URL, APIReponses
+from pyzillow.pyzillowcli import Checkpoint, get_parser, main, run
+
+
+class TestPyzillowCli(object):
+    @classmethod
+    def setup_class(cls):
+        cls.ZILLOW_API_KEY = "NO_KEY_NEEDED_DUE_TO_MOCKING_API"
+        cls.api_response_obj = APIReponses()
+
+    def set_responses(self, quota_after=None):
+        """Answers addresses starting with "bad" with error 508 and, after
+        ``quota_after`` requests, all requests with error 7"""
+
+        calls = []
+
+        def callback(request):
+            calls.append(request)
+            address = parse_qs(urlparse(request.url).query)["address"][0]
+            if quota_after is not None and len(calls) > quota_after:
+                key = "error_7_too_many_requests"
+            elif address.startswith("bad"):
+                key = "error_508_invalid_address"
+            else:
+                key = "get_deep_search_200_ok"
+            return 200, {}, self.api_response_obj.get(key)
+
+        responses.add_callback(
+            responses.GET, DEEP_SEARCH_URL, callback=callback, content_type="text/xml"
+        )
+        return calls
+
+    def write_input(self, path, addresses):
+        with open(path, "w", newline="") as input_file:
+            writer = csv.writer(input_file)
+            writer.writerow(["id", "address", "zipcode"])
+            for index, address in enumerate(addresses):
+                writer.writerow([index, address, "98109"])
+
+    @responses.activate
+    def test_csv_job(self, tmp_path):
+        """
+        Tests that all rows are written in input order with their results and
+        errors, and that the progress line counts errors by code
+        """
+
+        self.set_responses()
+        input_path, output_path = str(tmp_path / "in.csv"), str(tmp_path / "out.csv")
+        self.write_input(input_path, ["2114 Bigelow Ave", "bad address", "1 Main St"])
+
+        stream = io.StringIO()
+        args = get_parser().parse_args(
+            [
+                input_path,
+                output_path,
+                "--api-key",
+                self.ZILLOW_API_KEY,
+                "--attributes",
+                "zillow_id,zestimate_amount",
+                "--workers",
+                "2",
+            ]
+        )
+        assert run(args, stream=stream) == 0
+
+        with open(output_path, newline="") as output_file:
+            rows = list(csv.DictReader(output_file))
+        assert [row["id"] for row in rows] == ["0", "1", "2"]
+        assert rows[0]["zillow_id"] == "48749425"
+        assert rows[0]["zestimate_amount"] == "2001121"
+        assert (rows[1]["error"], rows[1]["zillow_id"]) == ("508", "")
+        assert "3 rows" in stream.getvalue()
+        assert "errors 33.3% (508: 1)" in stream.getvalue()
+        assert Checkpoint(output_path + ".checkpoint").load()[0] == 3
+
+    @responses.activate
+    def test_resume_after_daily_limit(self, tmp_path):
+        """
+        Tests that a job stops at error 7 and continues from the checkpoint
+        """
+
+        self.set_responses(quota_after=2)
+        input_path = str(tmp_path / "in.csv")
+        output_path = str(tmp_path / "out.jsonl")
+        self.write_input(input_path, ["{} Main St".format(n) for n in range(5)])
+        argv = [
+            input_path,
+            output_path,
+            "--api-key",
+            self.ZILLOW_API_KEY,
+            "--workers",
+            "1",
+            "--checkpoint-every",
+            "1",
+            "--attributes",
+            "zillow_id",
+            "--quiet",
+        ]
+
+        assert main(argv) == 1
+        assert Checkpoint(output_path + ".checkpoint").load()[0] == 2
+        # a row written after the last checkpoint is dropped on resume
+        with open(output_path, "a") as output_file:
+            output_file.write('{"partial": true}\n')
+
+        responses.reset()
+        calls = self.set_responses()
+        assert main(argv + ["--resume"]) == 0
+        assert len(calls) == 3
+        with open(output_path) as output_file:
+            rows = [json.loads(line) for line in output_file]
+        assert [row["id"] for row in rows] == ["0", "1", "2", "3", "4"]
+        assert all(row["zillow_id"] == "48749425" for row in rows)
+
+    @responses.activate
+    def test_journal_skips_done_rows(self, tmp_path):
+        """
+        Tests that a job with a journal skips the rows done by an earlier job
+        """
+
+        calls = self.set_responses()
+        input_path = str(tmp_path / "in.csv")
+        self.write_input(input_path, ["{} Main St".format(n) for n in range(3)])
+        argv = [
+            input_path,
+            str(tmp_path / "out.csv"),
+            "--api-key",
+            self.ZILLOW_API_KEY,
+            "--journal",
+            str(tmp_path / "lookups.journal"),
+            "--quiet",
+        ]
+        assert main(argv) == 0
+        assert len(calls) == 3
+
+        self.write_input(input_path, ["{} Main St".format(n) for n in range(5)])
+        argv[1] = str(tmp_path / "out2.csv")
+        assert main(argv) == 0
+        assert len(calls) == 5
+        with open(str(tmp_path / "out2.csv"), newline="") as output_file:
+            assert [row["id"] for row in csv.DictReader(output_file)] == ["3", "4"]
+
+    @responses.activate
+    def test_missing_column(self, tmp_path):
+        """
+        Tests that a job with a column missing in the input stops before any
+        request is sent or output is written
+        """
+
+        calls = self.set_responses()
+        input_path, output_path = str(tmp_path / "in.csv"), str(tmp_path / "out.csv")
+        self.write_input(input_path, ["2114 Bigelow Ave"])
+        stream = io.StringIO()
+        args = get_parser().parse_args(
+            [input_path, output_path, "--zipcode-column", "zip", "--quiet"]
+        )
+        assert run(args, stream=stream) == 2
+        assert "Missing input columns: zip" in stream.getvalue()
+        assert calls == []
+        assert not (tmp_path / "out.csv").exists()
+
+    @responses.activate
+    def test_missing_values(self, tmp_path):
+        """
+        Tests that rows without an address or zipcode are written with an error
+        instead of stopping the job
+        """
+
+        calls = self.set_responses()
+        input_path = str(tmp_path / "in.jsonl")
+        output_path = str(tmp_path / "out.jsonl")
+        rows = [
+            {"address": "2114 Bigelow Ave", "zipcode": "98109"},
+            {"address": "", "zipcode": "98109"},
+            {"address": "2114 Bigelow Ave"},
+        ]
+        with open(input_path, "w") as input_file:
+            for row in rows:
+                input_file.write(json.dumps(row) + "\n")
+        argv = [input_path, output_path, "--api-key", self.ZILLOW_API_KEY, "--quiet"]
+        assert main(argv) == 0
+
+        with open(output_path) as output_file:
+            errors = [json.loads(line)["error"] for line in output_file]
+        assert errors == ["", "500", "501"]
+        assert len(calls) == 1
@@ -0,0 +1,171 @@
+"""
+Tests for `pyzillow.pyzillowcoalesce` module.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import responses
+
+from api_responses import DEEP_SEARCH_URL, APIReponses
+from pyzillow.pyzillow import GetDeepSearchResults, ZillowWrapper
+from pyzillow.pyzillowcoalesce import AsyncSingleFlight, SingleFlight
+from pyzillow.pyzillowerrors import ZillowError, ZillowTimeout
+
+
+class TestPyzillowCoalesce(object):
+    @classmethod
+    def setup_class(cls):
+        cls.ZILLOW_API_KEY = "NO_KEY_NEEDED_DUE_TO_MOCKING_API"
+        cls.address = "2114 Bigelow Ave Seattle, WA"
+        cls.zipcode = "98109"
+        cls.api_response_obj = APIReponses()
+
+    def test_single_flight(self):
+        """
+        Tests that calls for a key in flight wait for it and share its result
+        or exception, and that a waiter can time out
+        """
+
+        single_flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+
+        def slow(value):
+            started.set()
+            release.wait(5)
+            if isinstance(value, Exception):
+                raise value
+            return value
+
+        with ThreadPoolExecutor(4) as executor:
+            leader = executor.submit(single_flight.do, "a", lambda: slow(1))
+            started.wait(5)
+            followers = [
+                executor.submit(single_flight.do, "a", lambda: slow(2))
+                for _ in range(2)
+            ]
+            with pytest.raises(ZillowTimeout):
+                single_flight.do("a", lambda: slow(3), timeout=0.01)
+            assert len(single_flight) == 1
+            release.set()
+            assert [f.result() for f in [leader] + followers] == [1, 1, 1]
+        assert (single_flight.calls, single_flight.coalesced) == (1, 3)
+        assert len(single_flight) == 0
+
+        # a finished call is not reused
+        error = ZillowError(508)
+        with pytest.raises(ZillowError):
+            single_flight.do("a", lambda: slow(error))
+        assert single_flight.calls == 2
+
+    @pytest.mark.parametrize("give_up", ["cancel", "timeout"])
+    def test_async_leader_gives_up(self, give_up):
+        """
+        Tests that a waiter gets the result of an async call in flight when the
+        caller that started it is cancelled or times out
+        """
+
+        single_flight = AsyncSingleFlight()
+
+        async def slow():
+            await asyncio.sleep(0.05)
+            return 1
+
+        async def lookup():
+            if give_up == "cancel":
+                leader = asyncio.ensure_future(single_flight.do("a", slow))
+            else:
+                leader = asyncio.ensure_future(
+                    asyncio.wait_for(single_flight.do("a", slow), 0.01)
+                )
+            await asyncio.sleep(0)
+            waiter = asyncio.ensure_future(single_flight.do("a", slow))
+            await asyncio.sleep(0)
+            if give_up == "cancel":
+                leader.cancel()
+            with pytest.raises((asyncio.CancelledError, asyncio.TimeoutError)):
+                await leader
+            return await waiter
+
+        assert asyncio.run(lookup()) == 1
+        assert (single_flight.calls, single_flight.coalesced) == (1, 1)
+        assert len(single_flight) == 0
+
+    def test_waiters_raise_copies(self):
+        """
+        Tests that each waiter raises its own copy of the exception of the call
+        in flight, chained to the original
+        """
+
+        single_flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        error = ZillowError(508)
+        error.retries = 2
+
+        def fail():
+            started.set()
+            release.wait(5)
+            raise error
+
+        def call():
+            try:
+                single_flight.do("a", fail)
+            except ZillowError as raised:
+                return raised
+
+        with ThreadPoolExecutor(4) as executor:
+            leader = executor.submit(call)
+            started.wait(5)
+            waiters = [executor.submit(call) for _ in range(3)]
+            while single_flight.coalesced < 3:
+                time.sleep(0.01)
+            release.set()
+            raised = [future.result() for future in [leader] + waiters]
+
+        assert raised[0] is error
+        assert len(set(map(id, raised))) == 4
+        for waiter_error in raised[1:]:
+            assert waiter_error.__cause__ is error
+            assert (waiter_error.status, waiter_error.retries) == (508, 2)
+        # the frames of the threads are not appended to a shared traceback
+        depths = []
+        for tb in [raised_error.__traceback__ for raised_error in raised]:
+            depth = 0
+            while tb is not None:
+                depth, tb = depth + 1, tb.tb_next
+            depths.append(depth)
+        assert max(depths) <= 4
+
+    @responses.activate
+    def test_concurrent_identical_lookups(self):
+        """
+        Tests that concurrent lookups of the same address send one request,
+        and lookups of other addresses are not coalesced
+        """
+
+        ok = self.api_response_obj.get("get_deep_search_200_ok")
+        calls = []
+
+        def callback(request):
+            calls.append(request)
+            time.sleep(0.2)
+            return (200, {}, ok)
+
+        responses.add_callback(responses.GET, DEEP_SEARCH_URL, callback=callback)
+
+        addresses = [
+            (self.address, self.zipcode),
+            ("  2114  Bigelow Ave Seattle, WA", self.zipcode),
+        ] * 3 + [("1 Main St", self.zipcode)]
+        with ZillowWrapper(self.ZILLOW_API_KEY, coalesce=True) as zillow_data:
+            outcomes = list(
+                zillow_data.get_deep_search_results_bulk(addresses, max_workers=7)
+            )
+        assert len(calls) == 2
+        assert zillow_data.single_flight.coalesced == 5
+        assert all(outcome.error is None for outcome in outcomes)
+        assert outcomes[0].response is outcomes[1].response
+        assert GetDeepSearchResults(outcomes[5].response).zillow_id == "48749425"
@@ -0,0 +1,125 @@
+"""
+Tests for `pyzillow.pyzillowcolumns` module.
+"""
+
+from datetime import date
+from decimal import Decimal
+from xml.etree import ElementTree
+
+import pytest
+
+from api_responses import APIReponses
+from pyzillow.pyzillow import GetDeepSearchResults, GetUpdatedPropertyDetails
+from pyzillow.pyzillowcolumns import ColumnCollector
+
+numpy = pytest.importorskip("numpy")
+
+
+class TestPyzillowColumns(object):
+    @classmethod
+    def setup_class(cls):
+        cls.api_response_obj = APIReponses()
+
+    def get_collector(self, attributes=None):
+        collector = ColumnCollector(GetDeepSearchResults, attributes)
+        body = self.api_response_obj.get("get_deep_search_200_ok")
+        collector.add(ElementTree.fromstring(body))
+        collector.add_record(
+            GetDeepSearchResults.record_from_xml(
+                ElementTree.fromstring(body.replace("<state>WA", "<state>OR"))
+            )
+        )
+        return collector
+
+    def test_columns(self):
+        """
+        Tests that values are converted and stored in typed buffers
+        """
+
+        collector = self.get_collector()
+        assert len(collector) == 2
+        assert list(collector.columns) == list(GetDeepSearchResults.attribute_mapping)
+        kinds = {attr: column.kind for attr, column in collector.columns.items()}
+        assert kinds["zestimate_amount"] == "int"
+        assert kinds["latitude"] == "float"
+        assert kinds["last_sold_date"] == "date"
+        assert kinds["state"] == "category"
+        assert kinds["tax_value"] == kinds["street"] == "object"
+
+        assert collector.columns["state"].categories == ["WA", "OR"]
+        assert list(collector.columns["state"].codes) == [0, 1]
+
+        with pytest.raises(ValueError):
+            ColumnCollector(GetUpdatedPropertyDetails, ["zestimate_amount"])
+
+    def test_to_numpy(self):
+        """
+        Tests the export to NumPy arrays
+        """
+
+        columns = self.get_collector().to_numpy()
+        assert columns["zestimate_amount"].tolist() == [2001121, 2001121]
+        assert columns["rentzestimate_amount"].mask.all()
+        assert columns["latitude"].dtype == numpy.float64
+        assert columns["last_sold_date"][0] == numpy.datetime64("2008-11-26")
+        assert columns["state"].tolist() == ["WA", "OR"]
+
+    def test_add_after_export(self):
+        """
+        Tests that results can be added after an export, which keeps its values
+        """
+
+        collector = self.get_collector(["zillow_id", "state", "zestimate_amount"])
+        columns = collector.to_numpy()
+        collector.add_record(
+            collector.result_class.record_from_xml(
+                ElementTree.fromstring(
+                    self.api_response_obj.get("get_deep_search_200_ok")
+                )
+            )
+        )
+        assert {attr: len(column) for attr, column in collector.columns.items()} == {
+            "zillow_id": 3,
+            "state": 3,
+            "zestimate_amount": 3,
+        }
+        assert columns["zestimate_amount"].tolist() == [2001121, 2001121]
+        assert collector.to_numpy()["state"].tolist() == ["WA", "OR", "WA"]
+
+    def test_to_pandas(self):
+        """
+        Tests the export to a DataFrame with nullable, categorical and datetime
+        columns
+        """
+
+        pytest.importorskip("pandas")
+        df = self.get_collector().to_pandas()
+        assert list(df["zestimate_amount"]) == [2001121, 2001121]
+        assert str(df["zestimate_amount"].dtype) == "Int64"
+        assert df["rentzestimate_amount"].isna().all()
+        assert str(df["state"].dtype) == "category"
+        assert list(df["state"]) == ["WA", "OR"]
+        assert df["last_sold_date"][0].date() == date(2008, 11, 26)
+        assert df["tax_value"][0] == Decimal("1534000.0")
+
+    def test_arrow_files(self, tmp_path):
+        """
+        Tests the export to an Arrow table and Parquet and IPC files
+        """
+
+        pyarrow = pytest.importorskip("pyarrow")
+        import pyarrow.parquet
+
+        collector = self.get_collector(["zillow_id", "state", "last_sold_date"])
+        table = collector.to_arrow()
+        assert table.column_names == ["zillow_id", "state", "last_sold_date"]
+        assert pyarrow.types.is_dictionary(table.schema.field("state").type)
+        assert table.column("last_sold_date").to_pylist() == [date(2008, 11, 26)] * 2
+
+        collector.write_parquet(str(tmp_path / "results.parquet"))
+        assert pyarrow.parquet.read_table(str(tmp_path / "results.parquet")).equals(
+            table
+        )
+        collector.write_ipc(str(tmp_path / "results.arrow"))
+        with pyarrow.ipc.open_file(str(tmp_path / "results.arrow")) as reader:
+            assert reader.read_all().equals(table)
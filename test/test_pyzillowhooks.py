@@ -0,0 +1,178 @@
+"""
+Tests for `pyzillow.pyzillowhooks` module.
+"""
+
+import pytest
+import responses
+
+from api_responses import (
+    DEEP_SEARCH_URL,
+    APIReponses,
+    set_get_deep_search_response,
+)
+from pyzillow import pyzillowratelimit
+from pyzillow.pyzillow import GetDeepSearchResults, ZillowWrapper
+from pyzillow.pyzillowerrors import ZillowError, ZillowFail
+from pyzillow.pyzillowhooks import Hooks, LatencyStats
+from pyzillow.pyzillowratelimit import RateLimiter
+
+
+class FakeTime(object):
+    """Clock for the time module functions used by the wrapper, which only
+    advances when sleeping"""
+
+    start = 100.0
+
+    def __init__(self):
+        self.now = self.start
+
+    def time(self):
+        return self.now
+
+    monotonic = perf_counter = time
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class RecordingHooks(Hooks):
+    def __init__(self):
+        self.events = []
+
+    def before_request(self, **values):
+        self.events.append(("before_request", values))
+
+    def after_response(self, **values):
+        self.events.append(("after_response", values))
+
+    def after_parse(self, **values):
+        self.events.append(("after_parse", values))
+
+    def on_error(self, **values):
+        self.events.append(("on_error", values))
+
+    def after_extract(self, **values):
+        self.events.append(("after_extract", values))
+
+
+class TestPyzillowHooks(object):
+    @classmethod
+    def setup_class(cls):
+        cls.ZILLOW_API_KEY = "NO_KEY_NEEDED_DUE_TO_MOCKING_API"
+        cls.address = "2114 Bigelow Ave Seattle, WA"
+        cls.zipcode = "98109"
+        cls.api_response_obj = APIReponses()
+
+    @responses.activate
+    def test_request_events(self):
+        """
+        Tests the events of a successful lookup, a Zillow error and an HTTP
+        error, and of the extraction of a result
+        """
+
+        body = self.api_response_obj.get("get_deep_search_200_ok")
+        set_get_deep_search_response(body)
+        hooks = RecordingHooks()
+        zillow_data = ZillowWrapper(self.ZILLOW_API_KEY, hooks=hooks)
+
+        response = zillow_data.get_deep_search_results(self.address, self.zipcode)
+        GetDeepSearchResults(response, hooks=[hooks])
+        assert [name for name, _ in hooks.events] == [
+            "before_request",
+            "after_response",
+            "after_parse",
+            "after_extract",
+        ]
+        values = hooks.events[1][1]
+        assert values["endpoint"] == "GetDeepSearchResults"
+        assert values["params"]["address"] == self.address
+        assert values["attempt"] == 1
+        assert values["size"] == len(body.encode("utf-8"))
+        assert values["seconds"] >= 0
+        assert hooks.events[3][1]["endpoint"] == "GetDeepSearchResults"
+
+        responses.reset()
+        set_get_deep_search_response(
+            self.api_response_obj.get("error_508_invalid_address")
+        )
+        responses.add(responses.GET, DEEP_SEARCH_URL, status=503)
+        hooks.events = []
+        for error_class in (ZillowError, ZillowFail):
+            with pytest.raises(error_class):
+                zillow_data.get_deep_search_results(self.address, self.zipcode)
+        errors = [values for name, values in hooks.events if name == "on_error"]
+        assert [values["code"] for values in errors] == [508, None]
+        assert isinstance(errors[1]["error"], ZillowFail)
+
+    @responses.activate
+    def test_rate_limiter_wait_not_in_latency(self, monkeypatch):
+        """
+        Tests that the wait for the rate limiter is not counted as request
+        latency
+        """
+
+        set_get_deep_search_response(
+            self.api_response_obj.get("get_deep_search_200_ok")
+        )
+        # only waits move the clock, so the requests take no time at all
+        clock = FakeTime()
+        monkeypatch.setattr("pyzillow.pyzillow.time", clock)
+        monkeypatch.setattr(pyzillowratelimit, "time", clock)
+        stats = LatencyStats()
+        zillow_data = ZillowWrapper(
+            self.ZILLOW_API_KEY,
+            # waits of 0.25 seconds, which the float clock adds up exactly
+            rate_limiter=RateLimiter(per_second=4, burst=1),
+            hooks=stats,
+        )
+
+        for _ in range(3):
+            zillow_data.get_deep_search_results(self.address, self.zipcode)
+        assert clock.now - FakeTime.start == 0.5
+        assert stats.percentiles("GetDeepSearchResults", "request")["p99"] == 0
+
+    def test_latency_stats(self):
+        """
+        Tests percentiles, the bounded sample and the counters
+        """
+
+        stats = LatencyStats()
+        for value in range(1, 101):
+            stats.after_response(
+                endpoint="GetDeepSearchResults",
+                params={},
+                attempt=1,
+                seconds=value / 1000,
+                size=10,
+            )
+        stats.after_extract(endpoint="GetDeepSearchResults", seconds=0.001)
+        stats.on_error(
+            endpoint="GetDeepSearchResults",
+            params={},
+            attempt=1,
+            error=ZillowError(508),
+            code=508,
+        )
+
+        assert stats.percentiles("GetDeepSearchResults", "request") == {
+            "p50": 0.05,
+            "p95": 0.095,
+            "p99": 0.099,
+        }
+        assert stats.percentiles("GetDeepSearchResults", "parse") is None
+        report = stats.report()["GetDeepSearchResults"]
+        assert report["request"]["count"] == 100
+        assert report["extract"] == {
+            "count": 1,
+            "p50": 0.001,
+            "p95": 0.001,
+            "p99": 0.001,
+        }
+        assert stats.bytes["GetDeepSearchResults"] == 1000
+        assert stats.errors[("GetDeepSearchResults", 508)] == 1
+
+        stats = LatencyStats(max_samples=10)
+        for value in range(1000):
+            stats.after_parse(endpoint="E", params={}, attempt=1, seconds=value)
+        assert len(stats._samples[("E", "parse")]) == 10
+        assert stats.report()["E"]["parse"]["count"] == 1000
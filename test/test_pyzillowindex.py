@@ -0,0 +1,118 @@
+"""
+Tests for `pyzillow.pyzillowindex` module.
+"""
+
+from xml.etree import ElementTree
+
+import responses
+
+from api_responses import (
+    APIReponses,
+    set_get_deep_search_response,
+    set_updated_property_details_response,
+)
+from pyzillow.pyzillow import GetUpdatedPropertyDetails, ZillowWrapper
+from pyzillow.pyzillowcache import MemoryCache
+from pyzillow.pyzillowindex import ZpidIndex, make_index_key
+
+
+class TestPyzillowIndex(object):
+    @classmethod
+    def setup_class(cls):
+        cls.ZILLOW_API_KEY = "NO_KEY_NEEDED_DUE_TO_MOCKING_API"
+        cls.address = "2114 Bigelow Ave Seattle, WA"
+        cls.zipcode = "98109"
+        cls.api_response_obj = APIReponses()
+
+    def test_index(self, tmp_path):
+        """
+        Tests that ZPIDs are stored by canonical address and kept across
+        reopening
+        """
+
+        path = str(tmp_path / "zpids.sqlite")
+        with ZpidIndex(path) as index:
+            index.set("2114 Bigelow Avenue North", "98109-1234", "48749425")
+            assert index.get("2114 BIGELOW AVE N", "98109") == "48749425"
+            assert index.get("2114 Bigelow Ave", "98109") is None
+            index.set("1 Main St", "98109", 1)
+            index.discard("1 Main Street", "98109")
+            assert len(index) == 1
+
+        with ZpidIndex(path) as index:
+            assert index.get("2114 Bigelow Ave N", "98109") == "48749425"
+        assert make_index_key("2114 Bigelow Ave N", "98109") == (
+            "2114 BIGELOW AVE N|98109"
+        )
+
+    def test_add_response(self):
+        """
+        Tests that the query address is only added for a single result, and the
+        address of every result is added
+        """
+
+        index = ZpidIndex(":memory:")
+        response = ElementTree.fromstring(
+            self.api_response_obj.get("get_deep_search_200_ok")
+        )
+        assert index.add_response(self.address, self.zipcode, response) == 2
+        assert index.get(self.address, self.zipcode) == "48749425"
+        assert index.get("2114 Bigelow Ave N", "98109") == "48749425"
+
+        response = ElementTree.fromstring(
+            self.api_response_obj.get("get_deep_search_200_ok_multiple")
+        )
+        assert index.add_response("1521 2nd Ave", "98101", response) == 3
+        assert index.get("1521 2nd Ave", "98101") is None
+        assert index.get("1521 2nd Avenue Apartment 1102", "98101") == "82468140"
+
+    @responses.activate
+    def test_details_by_address(self):
+        """
+        Tests that details of an address are requested directly once its ZPID
+        is in the index
+        """
+
+        set_get_deep_search_response(
+            self.api_response_obj.get("get_deep_search_200_ok")
+        )
+        set_updated_property_details_response(
+            self.api_response_obj.get("updated_property_details_200_ok")
+        )
+        zillow_data = ZillowWrapper(
+            self.ZILLOW_API_KEY, zpid_index=ZpidIndex(":memory:")
+        )
+
+        response = zillow_data.get_updated_property_details_by_address(
+            self.address, self.zipcode
+        )
+        assert GetUpdatedPropertyDetails(response).zillow_id == "48749425"
+        assert len(responses.calls) == 2
+
+        response = zillow_data.get_updated_property_details_by_address(
+            "2114  Bigelow Ave Seattle,  WA", self.zipcode
+        )
+        assert GetUpdatedPropertyDetails(response).zillow_id == "48749425"
+        assert len(responses.calls) == 3
+        assert "zpid=48749425" in responses.calls[2].request.url
+
+    @responses.activate
+    def test_cache_hits_do_not_write(self, monkeypatch):
+        """
+        Tests that only responses fetched from the API are added to the index
+        """
+
+        set_get_deep_search_response(
+            self.api_response_obj.get("get_deep_search_200_ok")
+        )
+        index = ZpidIndex(":memory:")
+        updates = []
+        monkeypatch.setattr(index, "update", updates.append)
+        zillow_data = ZillowWrapper(
+            self.ZILLOW_API_KEY, cache=MemoryCache(), zpid_index=index
+        )
+
+        for _ in range(3):
+            zillow_data.get_deep_search_results(self.address, self.zipcode)
+        assert len(responses.calls) == 1
+        assert len(updates) == 1
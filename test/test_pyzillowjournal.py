@@ -0,0 +1,97 @@
+"""
+Tests for `pyzillow.pyzillowjournal` module.
+"""
+
+import responses
+
+from api_responses import DEEP_SEARCH_URL, APIReponses
+from pyzillow.pyzillow import ZillowWrapper
+from pyzillow.pyzillowerrors import ZillowError, ZillowFail, ZillowNoResults
+from pyzillow.pyzillowjournal import Journal, is_transient, make_journal_key
+
+
+class TestPyzillowJournal(object):
+    @classmethod
+    def setup_class(cls):
+        cls.ZILLOW_API_KEY = "NO_KEY_NEEDED_DUE_TO_MOCKING_API"
+        cls.address = "2114 Bigelow Ave Seattle, WA"
+        cls.zipcode = "98109"
+        cls.api_response_obj = APIReponses()
+
+    def test_journal_key(self):
+        """
+        Tests that keys ignore extra whitespace but not the split into parts
+        """
+
+        key = make_journal_key((self.address, self.zipcode))
+        assert key == make_journal_key(("  2114 Bigelow  Ave Seattle, WA", "98109 "))
+        assert key != make_journal_key((self.address + " 98109",))
+        assert -(2**63) <= key < 2**63
+
+    def test_record_outcomes(self, tmp_path):
+        """
+        Tests that permanent outcomes are recorded and kept across reopening,
+        and transient ones are not recorded
+        """
+
+        path = str(tmp_path / "lookups.journal")
+        with Journal(path, commit_every=2) as journal:
+            assert journal.record(("1 Main St", "98109"))
+            assert journal.record(("2 Main St", "98109"), ZillowError(508))
+            assert journal.record(("3 Main St", "98109"), ZillowNoResults())
+            assert not journal.record(("4 Main St", "98109"), ZillowError(7))
+            assert not journal.record(("5 Main St", "98109"), ZillowFail())
+            assert ("1 Main St", "98109") in journal
+            assert ("4 Main St", "98109") not in journal
+
+        with Journal(path) as journal:
+            assert len(journal) == 3
+            assert journal.get(("2 Main St", "98109")) == "508"
+            assert journal.counts() == {"": 1, "508": 1, "no_results": 1}
+
+        assert is_transient(ZillowError(3))
+        assert not is_transient(ZillowError(500))
+        assert not is_transient(None)
+
+    @responses.activate
+    def test_bulk_rerun_skips_done_items(self, tmp_path):
+        """
+        Tests that a bulk lookup with a journal skips the items done by an
+        earlier run and keeps their input positions
+        """
+
+        ok = self.api_response_obj.get("get_deep_search_200_ok")
+        limit = self.api_response_obj.get("error_7_too_many_requests")
+        calls = []
+
+        def callback(request):
+            calls.append(request)
+            return (200, {}, limit if "quota" in request.url else ok)
+
+        responses.add_callback(responses.GET, DEEP_SEARCH_URL, callback=callback)
+
+        addresses = [("{} Main St".format(n), self.zipcode) for n in range(4)]
+        addresses.insert(2, ("quota address", self.zipcode))
+        zillow_data = ZillowWrapper(self.ZILLOW_API_KEY)
+        path = str(tmp_path / "lookups.journal")
+
+        with Journal(path) as journal:
+            outcomes = list(
+                zillow_data.get_deep_search_results_bulk(
+                    addresses[:3], max_workers=2, journal=journal
+                )
+            )
+        assert [outcome.index for outcome in outcomes] == [0, 1, 2]
+        assert len(calls) == 3
+
+        with Journal(path) as journal:
+            outcomes = list(
+                zillow_data.get_deep_search_results_bulk(
+                    addresses, max_workers=2, journal=journal
+                )
+            )
+            assert len(journal) == 4
+        # the item that hit the daily limit is looked up again
+        assert [outcome.index for outcome in outcomes] == [2, 3, 4]
+        assert [outcome.item for outcome in outcomes] == addresses[2:]
+        assert len(calls) == 6
@@ -0,0 +1,147 @@
+"""
+Tests for `pyzillow.pyzillowratelimit` module.
+"""
+
+import time
+
+import pytest
+import responses
+
+from api_responses import APIReponses, set_get_deep_search_response
+from pyzillow import pyzillowratelimit
+from pyzillow.pyzillow import ZillowWrapper
+from pyzillow.pyzillowerrors import ZillowError, ZillowTimeout
+from pyzillow.pyzillowratelimit import FileRateLimiter, RateLimiter
+
+
+class FakeClock(object):
+    def __init__(self, now=1590000000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestPyzillowRateLimit(object):
+    @classmethod
+    def setup_class(cls):
+        cls.ZILLOW_API_KEY = "NO_KEY_NEEDED_DUE_TO_MOCKING_API"
+        cls.address = "2114 Bigelow Ave Seattle, WA"
+        cls.zipcode = "98109"
+        cls.api_response_obj = APIReponses()
+
+    def test_token_bucket(self, monkeypatch):
+        """
+        Tests that bursts are allowed up to the bucket size and refilled over time
+        """
+
+        clock = FakeClock()
+        monkeypatch.setattr(pyzillowratelimit.time, "time", clock)
+        rate_limiter = RateLimiter(per_second=2, burst=3)
+
+        assert [rate_limiter.try_acquire() for _ in range(3)] == [0, 0, 0]
+        assert rate_limiter.try_acquire() == pytest.approx(0.5)
+        clock.now += 0.5
+        assert rate_limiter.try_acquire() == 0
+        clock.now += 10
+        assert [rate_limiter.try_acquire() for _ in range(3)] == [0, 0, 0]
+
+    def test_daily_budget(self, monkeypatch):
+        """
+        Tests that the daily budget raises error 7 and resets on the next day
+        """
+
+        clock = FakeClock()
+        monkeypatch.setattr(pyzillowratelimit.time, "time", clock)
+        rate_limiter = RateLimiter(per_day=2)
+
+        rate_limiter.acquire()
+        rate_limiter.acquire()
+        with pytest.raises(ZillowError) as excinfo:
+            rate_limiter.acquire()
+        assert excinfo.value.status == 7
+
+        clock.now += pyzillowratelimit.SECONDS_PER_DAY
+        rate_limiter.acquire()
+
+    def test_file_rate_limiter_shared_state(self, tmp_path, monkeypatch):
+        """
+        Tests that limiters using the same file share one budget
+        """
+
+        monkeypatch.setattr(pyzillowratelimit.time, "time", FakeClock())
+        path = str(tmp_path / "pyzillow.limit")
+        first = FileRateLimiter(path, per_second=1, burst=2, per_day=3)
+        second = FileRateLimiter(path, per_second=1, burst=2, per_day=3)
+
+        assert first.try_acquire() == 0
+        assert second.try_acquire() == 0
+        assert first.try_acquire() > 0
+
+        second.exhaust()
+        with pytest.raises(ZillowError):
+            first.try_acquire()
+
+    @responses.activate
+    def test_quota_error_exhausts_limiter(self):
+        """
+        Tests that no further requests are sent after Zillow returned error 7
+        """
+
+        set_get_deep_search_response(
+            self.api_response_obj.get("error_7_too_many_requests")
+        )
+        zillow_data = ZillowWrapper(
+            self.ZILLOW_API_KEY, rate_limiter=RateLimiter(per_second=100)
+        )
+
+        for _ in range(2):
+            with pytest.raises(ZillowError) as excinfo:
+                zillow_data.get_deep_search_results(self.address, self.zipcode)
+            assert excinfo.value.status == 7
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_rate_limiter_wait_respects_deadline(self):
+        """
+        Tests that a call fails at once instead of waiting for the rate limiter
+        past its deadline
+        """
+
+        set_get_deep_search_response(
+            self.api_response_obj.get("get_deep_search_200_ok")
+        )
+        zillow_data = ZillowWrapper(
+            self.ZILLOW_API_KEY, rate_limiter=RateLimiter(per_second=0.5)
+        )
+
+        zillow_data.get_deep_search_results(self.address, self.zipcode)
+        start = time.monotonic()
+        with pytest.raises(ZillowTimeout):
+            zillow_data.get_deep_search_results(
+                self.address, self.zipcode, deadline=0.3
+            )
+        assert time.monotonic() - start < 0.3
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_expired_call_takes_no_token(self):
+        """
+        Tests that a call past its deadline fails without spending a request of
+        the daily budget
+        """
+
+        set_get_deep_search_response(
+            self.api_response_obj.get("get_deep_search_200_ok")
+        )
+        rate_limiter = RateLimiter(per_day=10)
+        zillow_data = ZillowWrapper(self.ZILLOW_API_KEY, rate_limiter=rate_limiter)
+
+        zillow_data.get_deep_search_results(self.address, self.zipcode)
+        assert rate_limiter._state[3] == 1
+        with pytest.raises(ZillowTimeout):
+            zillow_data.get_deep_search_results(
+                self.address, self.zipcode, deadline=0
+            )
+        assert rate_limiter._state[3] == 1
+        assert len(responses.calls) == 1
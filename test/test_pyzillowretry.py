@@ -0,0 +1,87 @@
+"""
+Tests for `pyzillow.pyzillowretry` module.
+"""
+
+import pytest
+import responses
+
+from api_responses import (
+    DEEP_SEARCH_URL,
+    APIReponses,
+    set_get_deep_search_response,
+)
+from pyzillow.pyzillow import ZillowWrapper
+from pyzillow.pyzillowerrors import ZillowError, ZillowFail, ZillowNoResults
+from pyzillow.pyzillowretry import RetryPolicy
+
+
+class TestPyzillowRetry(object):
+    @classmethod
+    def setup_class(cls):
+        cls.ZILLOW_API_KEY = "NO_KEY_NEEDED_DUE_TO_MOCKING_API"
+        cls.address = "2114 Bigelow Ave Seattle, WA"
+        cls.zipcode = "98109"
+        cls.api_response_obj = APIReponses()
+
+    def test_retry_policy(self):
+        """
+        Tests which errors are retried and how long the policy waits
+        """
+
+        retry = RetryPolicy(max_attempts=4, backoff=1, max_backoff=3, jitter=False)
+        assert retry.is_retryable(ZillowError(3))
+        assert not retry.is_retryable(ZillowError(508))
+        assert retry.is_retryable(ZillowFail())
+        assert not retry.is_retryable(ZillowNoResults())
+        assert [retry.get_backoff(n) for n in (1, 2, 3, 4)] == [1, 2, 3, 3]
+
+        assert retry.get_delay(ZillowFail(), 3, 0) == 3
+        assert retry.get_delay(ZillowFail(), 4, 0) is None
+
+        retry = RetryPolicy(backoff=1, deadline=1.5)
+        assert 0 <= retry.get_delay(ZillowFail(), 1, 0) <= 1
+        assert retry.get_delay(ZillowFail(), 1, 1.5) is None
+
+    @responses.activate
+    def test_transient_failure_is_retried(self):
+        """
+        Tests that a server error is retried and counted
+        """
+
+        responses.add(responses.GET, DEEP_SEARCH_URL, status=503)
+        set_get_deep_search_response(
+            self.api_response_obj.get("get_deep_search_200_ok")
+        )
+        zillow_data = ZillowWrapper(self.ZILLOW_API_KEY, retry=RetryPolicy(backoff=0))
+
+        response = zillow_data.get_deep_search_results(self.address, self.zipcode)
+        assert response.find("message/code").text == "0"
+        assert len(responses.calls) == 2
+        assert zillow_data.retry_stats.calls == 1
+        assert zillow_data.retry_stats.retries == 1
+        assert zillow_data.retry_stats.histogram == {1: 1}
+
+    @responses.activate
+    def test_retries_give_up(self):
+        """
+        Tests that permanent errors are raised at once and transient errors
+        after max_attempts
+        """
+
+        set_get_deep_search_response(
+            self.api_response_obj.get("error_508_invalid_address")
+        )
+        zillow_data = ZillowWrapper(
+            self.ZILLOW_API_KEY, retry=RetryPolicy(max_attempts=3, backoff=0)
+        )
+        with pytest.raises(ZillowError) as excinfo:
+            zillow_data.get_deep_search_results(self.address, self.zipcode)
+        assert excinfo.value.retries == 0
+        assert len(responses.calls) == 1
+
+        responses.replace(responses.GET, DEEP_SEARCH_URL, status=500)
+        with pytest.raises(ZillowFail) as excinfo:
+            zillow_data.get_deep_search_results(self.address, self.zipcode)
+        assert excinfo.value.retries == 2
+        assert len(responses.calls) == 4
+        assert zillow_data.retry_stats.histogram == {0: 1, 2: 1}
@@ -0,0 +1,36 @@
+"""
+Tests for `pyzillow.pyzillowstats` module.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from pyzillow.pyzillowstats import Counters
+
+
+class RequestCounters(Counters):
+    counters = ("requests",)
+    keyed_counters = ("codes",)
+
+
+class TestPyzillowStats(object):
+    def test_counters(self):
+        """
+        Tests that counters and keyed counters are incremented from several
+        threads without losing updates, and reset to zero
+        """
+
+        stats = RequestCounters()
+
+        def count(index):
+            stats.incr("requests")
+            stats.incr("codes", key=index % 2)
+
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(count, range(1000)))
+        assert stats.requests == 1000
+        assert stats.codes == {0: 500, 1: 500}
+
+        stats.incr("requests", 5)
+        assert stats.requests == 1005
+        stats.reset()
+        assert (stats.requests, stats.codes) == (0, {})
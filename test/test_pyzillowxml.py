@@ -0,0 +1,132 @@
+"""
+Tests for `pyzillow.pyzillowxml` module.
+"""
+
+from xml.etree import ElementTree
+
+import pytest
+import responses
+
+from api_responses import (
+    DEEP_SEARCH_URL,
+    APIReponses,
+    set_get_deep_search_response,
+    set_updated_property_details_response,
+)
+from pyzillow.pyzillow import (
+    GetDeepSearchResults,
+    GetUpdatedPropertyDetails,
+    ZillowWrapper,
+)
+from pyzillow.pyzillowerrors import ZillowFail
+from pyzillow.pyzillowxml import ElementTreeEngine, PathExtractor, get_engine
+
+MAPPING = {
+    "zillow_id": "result/zpid",
+    "city": "result/address/city",
+    "state": "result/address/state",
+    "street": "result/address/street",
+    "address": "result/address",
+}
+
+RESULTS = (
+    "<results>"
+    "<result><zpid>1</zpid><address><city/></address></result>"
+    "<result><zpid>2</zpid><address><city>Seattle</city>"
+    "<state>WA</state></address></result>"
+    "</results>"
+)
+
+
+class TestPyzillowXml(object):
+    @classmethod
+    def setup_class(cls):
+        cls.ZILLOW_API_KEY = "NO_KEY_NEEDED_DUE_TO_MOCKING_API"
+        cls.address = "2114 Bigelow Ave Seattle, WA"
+        cls.zipcode = "98109"
+        cls.api_response_obj = APIReponses()
+
+    def test_path_extractor_matches_find(self):
+        """
+        Tests that the single-pass extractor returns the first match in
+        document order, like Element.find
+        """
+
+        data = ElementTree.fromstring(RESULTS)
+        values = PathExtractor(MAPPING)(data)
+        assert values == {
+            attr: getattr(data.find(path), "text", None)
+            for attr, path in MAPPING.items()
+        }
+        assert values["zillow_id"] == "1"
+        assert values["city"] is None
+        assert values["state"] == "WA"
+
+    def test_get_engine(self):
+        """
+        Tests engine selection by name and by element type
+        """
+
+        engine = get_engine("etree")
+        assert isinstance(engine, ElementTreeEngine)
+        assert get_engine(engine) is engine
+        with pytest.raises(ValueError):
+            get_engine("minidom")
+
+    def test_lxml_engine(self):
+        """
+        Tests that lxml is selected by default and that the extractor returns
+        the same values from lxml elements
+        """
+
+        pytest.importorskip("lxml")
+        engine = get_engine()
+        assert engine.name == "lxml"
+        data = engine.fromstring(RESULTS.encode())
+        values = PathExtractor(MAPPING)(data)
+        assert values == PathExtractor(MAPPING)(ElementTree.fromstring(RESULTS))
+
+        with pytest.raises(engine.ParseError):
+            engine.fromstring(b"<results><result>")
+
+    @responses.activate
+    @pytest.mark.parametrize("xml_engine", ["etree", "lxml"])
+    @pytest.mark.parametrize("stream_parse", [False, True])
+    def test_wrapper_engines(self, xml_engine, stream_parse):
+        """
+        Tests that the result classes return the same values for both engines
+        """
+
+        if xml_engine == "lxml":
+            pytest.importorskip("lxml")
+        set_get_deep_search_response(
+            self.api_response_obj.get("get_deep_search_200_ok")
+        )
+        set_updated_property_details_response(
+            self.api_response_obj.get("updated_property_details_200_ok")
+        )
+        zillow_data = ZillowWrapper(
+            self.ZILLOW_API_KEY, xml_engine=xml_engine, stream_parse=stream_parse
+        )
+        assert zillow_data.xml_engine.name == xml_engine
+
+        response = zillow_data.get_deep_search_results(self.address, self.zipcode)
+        result = GetDeepSearchResults(response)
+        expected = GetDeepSearchResults(
+            ElementTree.fromstring(self.api_response_obj.get("get_deep_search_200_ok"))
+        )
+        assert vars(result).keys() == vars(expected).keys()
+        for attr in GetDeepSearchResults.attribute_mapping:
+            assert getattr(result, attr) == getattr(expected, attr)
+        assert result.region_name == "East Queen Anne"
+        assert result.last_sold_price_currency == "USD"
+
+        response = zillow_data.get_updated_property_details("48749425")
+        result = GetUpdatedPropertyDetails(response)
+        assert result.roof == "Composition"
+
+        responses.replace(
+            responses.GET, DEEP_SEARCH_URL, body="<SearchResults:searchresults"
+        )
+        with pytest.raises(ZillowFail):
+            zillow_data.get_deep_search_results(self.address, self.zipcode)